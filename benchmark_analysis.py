@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark Analysis
+Timing checks for discovery analysis hot paths.
+
+Compares the sentence-indexed resolution search against the backtracking
+regex it replaced (`[^.]*keyword[^.]*topic[^.]*\\.`) on adversarial input:
+long transcripts without periods that mention resolution keywords but
+never complete a resolution statement.
+
+Usage:
+    python benchmark_analysis.py
+    python benchmark_analysis.py --sizes 1000 10000 1000000
+    python benchmark_analysis.py --regex-max-size 0
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core.analyzer import DiscoveryAnalyzer
+from core.sentence_index import PreparedText
+
+
+TOPIC = "inventory system of record"
+
+# A transcript line that mentions decisions but never the topic, and no period
+ADVERSARIAL_LINE = "Sarah: we decided we agreed it is confirmed and ultimately settled on that and then "
+
+
+def regex_resolution(content: str, keyword: str, topic_word: str) -> Optional[str]:
+    """Reference implementation: the original backtracking search."""
+    pattern = rf'([^.]*{keyword}[^.]*{topic_word}[^.]*\.)'
+    for match in re.finditer(pattern, content, re.IGNORECASE | re.DOTALL):
+        if len(match.group(1).strip()) > 30:
+            return match.group(1)
+    return None
+
+
+def build_adversarial(size: int) -> str:
+    """Build a period-free transcript of roughly `size` characters."""
+    repeats = size // len(ADVERSARIAL_LINE) + 1
+    return (ADVERSARIAL_LINE * repeats)[:size]
+
+
+def time_call(func, *args) -> float:
+    """Time a single call in milliseconds."""
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark discovery analysis hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1000, 2000, 4000, 100000, 1000000],
+                        help="Adversarial document sizes in characters")
+    parser.add_argument("--regex-max-size", type=int, default=4000,
+                        help="Largest size to time the backtracking regex on (it grows super-linearly)")
+    args = parser.parse_args()
+
+    analyzer = DiscoveryAnalyzer()
+    topic_word = TOPIC.split()[0]
+
+    print("Resolution search on period-free input (all resolution keywords)")
+    print(f"{'chars':>10} {'indexed ms':>12} {'regex ms':>12}")
+
+    for size in args.sizes:
+        content = build_adversarial(size)
+        indexed_ms = time_call(analyzer._extract_resolutions, TOPIC, PreparedText(content))
+
+        regex_ms = None
+        if size <= args.regex_max_size:
+            regex_ms = 0.0
+            for keyword in analyzer.RESOLUTION_KEYWORDS:
+                regex_ms += time_call(regex_resolution, content, keyword, topic_word)
+
+        regex_col = f"{regex_ms:12.1f}" if regex_ms is not None else f"{'-':>12}"
+        print(f"{size:>10} {indexed_ms:12.2f} {regex_col}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+End-to-end timings over generated discovery corpora.
+
+Synthesizes projects by mutating and scaling the test-data scenarios (from
+a handful to thousands of documents, kilobytes to megabytes each, including
+period-free transcripts that stress sentence handling), then times the hot
+paths an agent drives: `_ingest_documents`, `DiscoveryAnalyzer.analyze`
+(first run and cached re-run), `query` and `_generate_deliverable`. Each
+scenario runs in its own process so its peak RSS is measured in isolation.
+
+Results can be saved as a baseline and later runs compared against it;
+the exit status is 1 if any metric regressed beyond the tolerance.
+
+Usage:
+    python benchmark_suite.py
+    python benchmark_suite.py --profile full
+    python benchmark_suite.py --scenario many:2000:1000 --scenario huge:5:5000000:nopunct
+    python benchmark_suite.py --write-baseline
+    python benchmark_suite.py --baseline benchmark_baseline.json --tolerance 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then not reported
+    resource = None
+
+REPO_ROOT = Path(__file__).parent
+TEST_DATA_PATH = REPO_ROOT / "test-data"
+DEFAULT_BASELINE = REPO_ROOT / "benchmark_baseline.json"
+
+# name: (documents, bytes per document, period-free transcripts)
+PROFILES = {
+    "quick": {
+        "small": (10, 1_000, False),
+        "medium": (100, 20_000, False),
+        "many": (1_000, 2_000, False),
+        "large": (10, 1_000_000, False),
+        "nopunct": (5, 1_000_000, True),
+    },
+    "full": {
+        "small": (10, 1_000, False),
+        "medium": (100, 20_000, False),
+        "many": (1_000, 2_000, False),
+        "huge-count": (10_000, 1_000, False),
+        "large": (10, 1_000_000, False),
+        "huge-size": (10, 5_000_000, False),
+        "nopunct": (5, 5_000_000, True),
+    },
+}
+
+QUESTIONS = [
+    "What did the client say about refunds?",
+    "Which documents mention QuickBooks?",
+    "Who are the stakeholders?",
+    '"source of truth" inventory',
+    "What are the main pain points?",
+]
+
+# Metrics where lower is better; compared against the baseline
+METRICS = ["ingest_ms", "analyze_ms", "analyze_warm_ms", "query_ms", "generate_ms", "peak_rss_mb"]
+
+# Differences below these are noise, whatever the ratio
+ABSOLUTE_FLOOR = {"peak_rss_mb": 10.0}
+ABSOLUTE_FLOOR_MS = 5.0
+
+
+def load_seeds() -> Dict[str, List[str]]:
+    """Load the test-data discovery documents, grouped by folder (emails, transcripts, client-docs)."""
+    seeds: Dict[str, List[str]] = {"emails": [], "transcripts": [], "client-docs": []}
+    for folder in seeds:
+        for path in sorted(TEST_DATA_PATH.glob(f"*/{folder}/**/*.txt")):
+            seeds[folder].append(path.read_text(encoding="utf-8"))
+    return {folder: texts for folder, texts in seeds.items() if texts}
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """Vary a seed document: shuffle paragraphs and perturb numbers, so documents differ."""
+    paragraphs = text.split("\n\n")
+    head, body = paragraphs[:1], paragraphs[1:]
+    rng.shuffle(body)
+    text = "\n\n".join(head + body)
+    return re.sub(r"\d+", lambda m: str(int(m.group()) + rng.randint(0, 9)), text)
+
+
+def synthesize_document(seeds: List[str], size: int, no_periods: bool, rng: random.Random) -> str:
+    """Build one document of about `size` characters from mutated seed documents."""
+    parts = []
+    total = 0
+    while total < size:
+        part = mutate(rng.choice(seeds), rng)
+        parts.append(part)
+        total += len(part) + 2
+    text = "\n\n".join(parts)[:size]
+    if no_periods:
+        # One endless run-on transcript: every sentence boundary is gone
+        text = text.replace(".", ",")
+    return text
+
+
+def write_corpus(base_path: Path, project_id: str, count: int, size: int,
+                 no_periods: bool, seed: int = 0):
+    """Write a generated project in the local storage layout."""
+    rng = random.Random(seed)
+    seeds = load_seeds()
+    folders = list(seeds)
+    if no_periods:
+        folders = ["transcripts"] if "transcripts" in seeds else folders
+    for index in range(count):
+        folder = folders[index % len(folders)]
+        path = base_path / project_id / folder / f"{index:05d}-generated.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(synthesize_document(seeds[folder], size, no_periods, rng), encoding="utf-8")
+
+
+def timed(func, *args, **kwargs):
+    """Call a function and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Get this process's peak resident set size in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scenario(name: str, count: int, size: int, no_periods: bool) -> Dict:
+    """Generate one scenario and time it (runs in a child process)."""
+    # Keep benchmarks off the real state store and any configured Convex deployment
+    os.environ["PERSIST_PROJECT_STATE"] = "false"
+    os.environ["CONVEX_DEPLOYMENT_URL"] = ""
+    os.environ["USE_INTEGRATION_STORAGE"] = "false"
+    sys.path.insert(0, str(REPO_ROOT / "mcp" / "src"))
+
+    import main
+    from core.analyzer import DiscoveryAnalyzer
+    from core.state_manager import ProjectStateManager
+    from storage import get_storage_provider
+
+    with tempfile.TemporaryDirectory(prefix="offbench-bench-") as base_path:
+        project_id = f"bench-{name}"
+        write_corpus(Path(base_path), project_id, count, size, no_periods)
+        main.storage = get_storage_provider("local", base_path=base_path)
+
+        ingest, ingest_ms = timed(main._ingest_documents, project_id, append=False)
+        if "error" in ingest:
+            raise RuntimeError(ingest["error"])
+        project = ProjectStateManager().get_project(project_id)
+
+        analyzer = DiscoveryAnalyzer()
+        analysis, analyze_ms = timed(analyzer.analyze, project.documents, project.additional_context)
+        _, analyze_warm_ms = timed(analyzer.analyze, project.documents, project.additional_context)
+        project.update_analysis(analysis)
+
+        query_times = [timed(main.query, project_id, question)[1] for question in QUESTIONS]
+        _, generate_ms = timed(main._generate_deliverable, project_id, "sow")
+
+        return {
+            "documents": count,
+            "document_bytes": size,
+            "no_periods": no_periods,
+            "ingest_ms": round(ingest_ms, 1),
+            "analyze_ms": round(analyze_ms, 1),
+            "analyze_warm_ms": round(analyze_warm_ms, 1),
+            "query_ms": round(statistics.median(query_times), 2),
+            "generate_ms": round(generate_ms, 1),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def run_isolated(name: str, count: int, size: int, no_periods: bool) -> Dict:
+    """Run a scenario in a fresh interpreter and return its results."""
+    spec = json.dumps([name, count, size, no_periods])
+    completed = subprocess.run(
+        [sys.executable, __file__, "--run-one", spec],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario {name} failed:\n{completed.stderr}")
+    # The server prints startup notices; the result is the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        One message per metric that is worse than the baseline by more than
+        `tolerance` (a fraction) and the metric's noise floor
+    """
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in METRICS:
+            new, old = metrics.get(metric), reference.get(metric)
+            if new is None or old is None:
+                continue
+            floor = ABSOLUTE_FLOOR.get(metric, ABSOLUTE_FLOOR_MS)
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append(f"{name}.{metric}: {old} -> {new} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+    return regressions
+
+
+def parse_scenario(value: str):
+    """Parse `name:documents:bytes[:nopunct]`."""
+    parts = value.split(":")
+    if len(parts) not in (3, 4) or (len(parts) == 4 and parts[3] != "nopunct"):
+        raise argparse.ArgumentTypeError("expected name:documents:bytes[:nopunct]")
+    return parts[0], (int(parts[1]), int(parts[2]), len(parts) == 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis, ingest, query and generate on generated corpora")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick",
+                        help="Predefined set of scenarios")
+    parser.add_argument("--scenario", type=parse_scenario, action="append",
+                        help="Run only these scenarios (name:documents:bytes[:nopunct]); repeatable")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="Baseline results to compare against")
+    parser.add_argument("--write-baseline", action="store_true",
+                        help="Save this run as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown/growth over the baseline, as a fraction")
+    parser.add_argument("--output", type=Path, help="Also write this run's results as JSON")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        name, count, size, no_periods = json.loads(args.run_one)
+        print(json.dumps(run_scenario(name, count, size, no_periods)))
+        return 0
+
+    scenarios = dict(args.scenario) if args.scenario else PROFILES[args.profile]
+
+    print(f"{'scenario':<12} {'docs':>6} {'bytes':>9} {'ingest':>9} {'analyze':>9} "
+          f"{'warm':>8} {'query':>8} {'generate':>9} {'rss MB':>8}")
+    results = {}
+    for name, (count, size, no_periods) in scenarios.items():
+        metrics = run_isolated(name, count, size, no_periods)
+        results[name] = metrics
+        print(f"{name:<12} {count:>6} {size:>9} {metrics['ingest_ms']:>9} {metrics['analyze_ms']:>9} "
+              f"{metrics['analyze_warm_ms']:>8} {metrics['query_ms']:>8} {metrics['generate_ms']:>9} "
+              f"{metrics['peak_rss_mb'] if metrics['peak_rss_mb'] is not None else '-':>8}")
+
+    run = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(run, indent=2) + "\n")
+
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(run, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --write-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline.get("scenarios", {}), args.tolerance)
+    if regressions:
+        print(f"\nRegressions against {args.baseline.name} (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions against {args.baseline.name} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,6 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 
-export const syncAmbiguities = mutation({
-  args: {
-    projectId: v.id("projects"),
-    ambiguities: v.array(
-      v.object({
-        category: v.string(),
-        description: v.string(),
-        impact: v.union(v.literal("high"), v.literal("medium"), v.literal("low")),
-        clarificationNeeded: v.string(),
-        clarification: v.optional(v.string()),
-        status: v.union(
-          v.literal("open"),
-          v.literal("clarified"),
-          v.literal("resolved")
-        ),
-        identifiedDate: v.number(),
-        context: v.string(),
-      })
-    ),
-  },
-  handler: async (ctx, args) => {
-    const ambiguityIds: string[] = [];
-
-    for (const ambiguityData of args.ambiguities) {
-      const ambiguityId = await ctx.db.insert("ambiguities", {
-        projectId: args.projectId,
-        ...ambiguityData,
-      });
-      ambiguityIds.push(ambiguityId);
-    }
-
-    return { ambiguityIds, count: ambiguityIds.length };
-  },
-});
-
 export const updateAmbiguityStatus = mutation({
   args: {
     ambiguityId: v.id("ambiguities"),
@@ -89,3 +54,79 @@ export const create = mutation({
   },
 });
 
+// Bulk insert used by the MCP server's batched sync. Returns the new
+// ambiguity IDs in the same order as `items`.
+export const createMany = mutation({
+  args: {
+    projectId: v.id("projects"),
+    items: v.array(
+      v.object({
+        category: v.string(),
+        description: v.string(),
+        impact: v.union(v.literal("high"), v.literal("medium"), v.literal("low")),
+        clarificationNeeded: v.string(),
+        clarification: v.optional(v.string()),
+        status: v.union(
+          v.literal("open"),
+          v.literal("clarified"),
+          v.literal("resolved")
+        ),
+        identifiedDate: v.number(),
+        context: v.string(),
+      })
+    ),
+    // Tenant context sent by the MCP server; not stored by this schema
+    userId: v.optional(v.string()),
+    orgId: v.optional(v.string()),
+    isDemo: v.optional(v.boolean()),
+  },
+  handler: async (ctx, args) => {
+    const ids: string[] = [];
+
+    for (const item of args.items) {
+      const id = await ctx.db.insert("ambiguities", {
+        projectId: args.projectId,
+        ...item,
+      });
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
+  },
+});
+
+// Bulk patch used by the MCP server's differential sync (changed fields and
+// status transitions). Returns the patched ambiguity IDs in the same order as `items`.
+export const updateMany = mutation({
+  args: {
+    items: v.array(
+      v.object({
+        id: v.id("ambiguities"),
+        category: v.optional(v.string()),
+        description: v.optional(v.string()),
+        impact: v.optional(v.union(v.literal("high"), v.literal("medium"), v.literal("low"))),
+        clarificationNeeded: v.optional(v.string()),
+        clarification: v.optional(v.string()),
+        status: v.optional(
+          v.union(
+            v.literal("open"),
+            v.literal("clarified"),
+            v.literal("resolved")
+          )
+        ),
+        identifiedDate: v.optional(v.number()),
+        context: v.optional(v.string()),
+      })
+    ),
+  },
+  handler: async (ctx, args) => {
+    const ids: string[] = [];
+
+    for (const { id, ...fields } of args.items) {
+      await ctx.db.patch(id, fields);
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
+  },
+});
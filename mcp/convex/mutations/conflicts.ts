@@ -1,42 +1,6 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 
-export const syncConflicts = mutation({
-  args: {
-    projectId: v.id("projects"),
-    conflicts: v.array(
-      v.object({
-        category: v.string(),
-        description: v.string(),
-        impact: v.union(v.literal("high"), v.literal("medium"), v.literal("low")),
-        priority: v.union(v.literal("high"), v.literal("medium"), v.literal("low")),
-        status: v.union(
-          v.literal("open"),
-          v.literal("in-progress"),
-          v.literal("resolved")
-        ),
-        identifiedDate: v.number(),
-        conflictingStatements: v.array(v.string()),
-        sources: v.array(v.string()),
-        resolution: v.optional(v.string()),
-      })
-    ),
-  },
-  handler: async (ctx, args) => {
-    const conflictIds: string[] = [];
-
-    for (const conflictData of args.conflicts) {
-      const conflictId = await ctx.db.insert("conflicts", {
-        projectId: args.projectId,
-        ...conflictData,
-      });
-      conflictIds.push(conflictId);
-    }
-
-    return { conflictIds, count: conflictIds.length };
-  },
-});
-
 export const updateConflictStatus = mutation({
   args: {
     conflictId: v.id("conflicts"),
@@ -91,3 +55,81 @@ export const create = mutation({
   },
 });
 
+// Bulk insert used by the MCP server's batched sync. Returns the new
+// conflict IDs in the same order as `items`.
+export const createMany = mutation({
+  args: {
+    projectId: v.id("projects"),
+    items: v.array(
+      v.object({
+        category: v.string(),
+        description: v.string(),
+        impact: v.union(v.literal("high"), v.literal("medium"), v.literal("low")),
+        priority: v.union(v.literal("high"), v.literal("medium"), v.literal("low")),
+        status: v.union(
+          v.literal("open"),
+          v.literal("in-progress"),
+          v.literal("resolved")
+        ),
+        identifiedDate: v.number(),
+        conflictingStatements: v.array(v.string()),
+        sources: v.array(v.string()),
+        resolution: v.optional(v.string()),
+      })
+    ),
+    // Tenant context sent by the MCP server; not stored by this schema
+    userId: v.optional(v.string()),
+    orgId: v.optional(v.string()),
+    isDemo: v.optional(v.boolean()),
+  },
+  handler: async (ctx, args) => {
+    const ids: string[] = [];
+
+    for (const item of args.items) {
+      const id = await ctx.db.insert("conflicts", {
+        projectId: args.projectId,
+        ...item,
+      });
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
+  },
+});
+
+// Bulk patch used by the MCP server's differential sync (changed fields and
+// status transitions). Returns the patched conflict IDs in the same order as `items`.
+export const updateMany = mutation({
+  args: {
+    items: v.array(
+      v.object({
+        id: v.id("conflicts"),
+        category: v.optional(v.string()),
+        description: v.optional(v.string()),
+        impact: v.optional(v.union(v.literal("high"), v.literal("medium"), v.literal("low"))),
+        priority: v.optional(v.union(v.literal("high"), v.literal("medium"), v.literal("low"))),
+        status: v.optional(
+          v.union(
+            v.literal("open"),
+            v.literal("in-progress"),
+            v.literal("resolved")
+          )
+        ),
+        identifiedDate: v.optional(v.number()),
+        conflictingStatements: v.optional(v.array(v.string())),
+        sources: v.optional(v.array(v.string())),
+        resolution: v.optional(v.string()),
+      })
+    ),
+  },
+  handler: async (ctx, args) => {
+    const ids: string[] = [];
+
+    for (const { id, ...fields } of args.items) {
+      await ctx.db.patch(id, fields);
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
+  },
+});
@@ -43,15 +43,44 @@ export const updateDocumentSummary = mutation({
   },
 });
 
-export const syncDocuments = mutation({
+export const updateDocumentStatus = mutation({
+  args: {
+    documentId: v.id("documents"),
+    status: v.union(
+      v.literal("processed"),
+      v.literal("processing"),
+      v.literal("pending")
+    ),
+  },
+  handler: async (ctx, args) => {
+    await ctx.db.patch(args.documentId, {
+      status: args.status,
+    });
+    return args.documentId;
+  },
+});
+
+export const deleteDocument = mutation({
+  args: {
+    documentId: v.id("documents"),
+  },
+  handler: async (ctx, args) => {
+    await ctx.db.delete(args.documentId);
+    return { success: true };
+  },
+});
+
+// Bulk insert used by the MCP server's batched sync. Returns the new
+// document IDs in the same order as `items`.
+export const createMany = mutation({
   args: {
     projectId: v.id("projects"),
-    documents: v.array(
+    items: v.array(
       v.object({
         name: v.string(),
         type: v.string(),
         uploadDate: v.number(),
-        size: v.string(),
+        size: v.number(),
         status: v.union(
           v.literal("processed"),
           v.literal("processing"),
@@ -59,48 +88,79 @@ export const syncDocuments = mutation({
         ),
         sourceLink: v.optional(v.string()),
         metadata: v.optional(v.any()),
+        externalId: v.optional(v.string()),
+        externalUrl: v.optional(v.string()),
+        integrationId: v.optional(v.string()),
+        summary: v.optional(v.string()),
+        source: v.union(
+          v.literal("upload"),
+          v.literal("integration"),
+          v.literal("local")
+        ),
       })
     ),
+    // Tenant context sent by the MCP server; not stored by this schema
+    userId: v.optional(v.string()),
+    orgId: v.optional(v.string()),
+    isDemo: v.optional(v.boolean()),
   },
   handler: async (ctx, args) => {
-    const documentIds: string[] = [];
+    const ids: string[] = [];
 
-    for (const documentData of args.documents) {
-      const documentId = await ctx.db.insert("documents", {
+    for (const item of args.items) {
+      const id = await ctx.db.insert("documents", {
         projectId: args.projectId,
-        ...documentData,
+        ...item,
       });
-      documentIds.push(documentId);
+      ids.push(id);
     }
 
-    return { documentIds, count: documentIds.length };
+    return { ids, count: ids.length };
   },
 });
 
-export const updateDocumentStatus = mutation({
+// Bulk patch used by the MCP server's differential sync (changed fields and
+// status transitions). Returns the patched document IDs in the same order as `items`.
+export const updateMany = mutation({
   args: {
-    documentId: v.id("documents"),
-    status: v.union(
-      v.literal("processed"),
-      v.literal("processing"),
-      v.literal("pending")
+    items: v.array(
+      v.object({
+        id: v.id("documents"),
+        name: v.optional(v.string()),
+        type: v.optional(v.string()),
+        uploadDate: v.optional(v.number()),
+        size: v.optional(v.number()),
+        status: v.optional(
+          v.union(
+            v.literal("processed"),
+            v.literal("processing"),
+            v.literal("pending")
+          )
+        ),
+        sourceLink: v.optional(v.string()),
+        metadata: v.optional(v.any()),
+        externalId: v.optional(v.string()),
+        externalUrl: v.optional(v.string()),
+        integrationId: v.optional(v.string()),
+        summary: v.optional(v.string()),
+        source: v.optional(
+          v.union(
+            v.literal("upload"),
+            v.literal("integration"),
+            v.literal("local")
+          )
+        ),
+      })
     ),
   },
   handler: async (ctx, args) => {
-    await ctx.db.patch(args.documentId, {
-      status: args.status,
-    });
-    return args.documentId;
-  },
-});
+    const ids: string[] = [];
 
-export const deleteDocument = mutation({
-  args: {
-    documentId: v.id("documents"),
-  },
-  handler: async (ctx, args) => {
-    await ctx.db.delete(args.documentId);
-    return { success: true };
+    for (const { id, ...fields } of args.items) {
+      await ctx.db.patch(id, fields);
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
   },
 });
-
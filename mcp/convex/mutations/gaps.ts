@@ -1,10 +1,29 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 
-export const syncGaps = mutation({
+export const updateGapStatus = mutation({
+  args: {
+    gapId: v.id("gaps"),
+    status: v.union(
+      v.literal("open"),
+      v.literal("in-progress"),
+      v.literal("resolved")
+    ),
+  },
+  handler: async (ctx, args) => {
+    await ctx.db.patch(args.gapId, {
+      status: args.status,
+    });
+    return args.gapId;
+  },
+});
+
+// Bulk insert used by the MCP server's batched sync. Returns the new
+// gap IDs in the same order as `items`.
+export const createMany = mutation({
   args: {
     projectId: v.id("projects"),
-    gaps: v.array(
+    items: v.array(
       v.object({
         category: v.string(),
         description: v.string(),
@@ -19,36 +38,57 @@ export const syncGaps = mutation({
         suggestedQuestion: v.optional(v.string()),
       })
     ),
+    // Tenant context sent by the MCP server; not stored by this schema
+    userId: v.optional(v.string()),
+    orgId: v.optional(v.string()),
+    isDemo: v.optional(v.boolean()),
   },
   handler: async (ctx, args) => {
-    const gapIds: string[] = [];
+    const ids: string[] = [];
 
-    for (const gapData of args.gaps) {
-      const gapId = await ctx.db.insert("gaps", {
+    for (const item of args.items) {
+      const id = await ctx.db.insert("gaps", {
         projectId: args.projectId,
-        ...gapData,
+        ...item,
       });
-      gapIds.push(gapId);
+      ids.push(id);
     }
 
-    return { gapIds, count: gapIds.length };
+    return { ids, count: ids.length };
   },
 });
 
-export const updateGapStatus = mutation({
+// Bulk patch used by the MCP server's differential sync (changed fields and
+// status transitions). Returns the patched gap IDs in the same order as `items`.
+export const updateMany = mutation({
   args: {
-    gapId: v.id("gaps"),
-    status: v.union(
-      v.literal("open"),
-      v.literal("in-progress"),
-      v.literal("resolved")
+    items: v.array(
+      v.object({
+        id: v.id("gaps"),
+        category: v.optional(v.string()),
+        description: v.optional(v.string()),
+        impact: v.optional(v.union(v.literal("high"), v.literal("medium"), v.literal("low"))),
+        priority: v.optional(v.union(v.literal("high"), v.literal("medium"), v.literal("low"))),
+        status: v.optional(
+          v.union(
+            v.literal("open"),
+            v.literal("in-progress"),
+            v.literal("resolved")
+          )
+        ),
+        identifiedDate: v.optional(v.number()),
+        suggestedQuestion: v.optional(v.string()),
+      })
     ),
   },
   handler: async (ctx, args) => {
-    await ctx.db.patch(args.gapId, {
-      status: args.status,
-    });
-    return args.gapId;
+    const ids: string[] = [];
+
+    for (const { id, ...fields } of args.items) {
+      await ctx.db.patch(id, fields);
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
   },
 });
-
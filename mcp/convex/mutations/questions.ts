@@ -1,10 +1,44 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 
-export const syncQuestions = mutation({
+export const answerQuestion = mutation({
+  args: {
+    questionId: v.id("questions"),
+    answer: v.string(),
+  },
+  handler: async (ctx, args) => {
+    await ctx.db.patch(args.questionId, {
+      answer: args.answer,
+      answeredDate: Date.now(),
+      status: "answered",
+    });
+    return args.questionId;
+  },
+});
+
+export const updateQuestionStatus = mutation({
+  args: {
+    questionId: v.id("questions"),
+    status: v.union(
+      v.literal("open"),
+      v.literal("answered"),
+      v.literal("deferred")
+    ),
+  },
+  handler: async (ctx, args) => {
+    await ctx.db.patch(args.questionId, {
+      status: args.status,
+    });
+    return args.questionId;
+  },
+});
+
+// Bulk insert used by the MCP server's batched sync. Returns the new
+// question IDs in the same order as `items`.
+export const createMany = mutation({
   args: {
     projectId: v.id("projects"),
-    questions: v.array(
+    items: v.array(
       v.object({
         question: v.string(),
         category: v.string(),
@@ -20,51 +54,58 @@ export const syncQuestions = mutation({
         whyItMatters: v.optional(v.string()),
       })
     ),
+    // Tenant context sent by the MCP server; not stored by this schema
+    userId: v.optional(v.string()),
+    orgId: v.optional(v.string()),
+    isDemo: v.optional(v.boolean()),
   },
   handler: async (ctx, args) => {
-    const questionIds: string[] = [];
+    const ids: string[] = [];
 
-    for (const questionData of args.questions) {
-      const questionId = await ctx.db.insert("questions", {
+    for (const item of args.items) {
+      const id = await ctx.db.insert("questions", {
         projectId: args.projectId,
-        ...questionData,
+        ...item,
       });
-      questionIds.push(questionId);
+      ids.push(id);
     }
 
-    return { questionIds, count: questionIds.length };
+    return { ids, count: ids.length };
   },
 });
 
-export const answerQuestion = mutation({
+// Bulk patch used by the MCP server's differential sync (changed fields and
+// status transitions). Returns the patched question IDs in the same order as `items`.
+export const updateMany = mutation({
   args: {
-    questionId: v.id("questions"),
-    answer: v.string(),
-  },
-  handler: async (ctx, args) => {
-    await ctx.db.patch(args.questionId, {
-      answer: args.answer,
-      answeredDate: Date.now(),
-      status: "answered",
-    });
-    return args.questionId;
-  },
-});
-
-export const updateQuestionStatus = mutation({
-  args: {
-    questionId: v.id("questions"),
-    status: v.union(
-      v.literal("open"),
-      v.literal("answered"),
-      v.literal("deferred")
+    items: v.array(
+      v.object({
+        id: v.id("questions"),
+        question: v.optional(v.string()),
+        category: v.optional(v.string()),
+        priority: v.optional(v.union(v.literal("high"), v.literal("medium"), v.literal("low"))),
+        status: v.optional(
+          v.union(
+            v.literal("open"),
+            v.literal("answered"),
+            v.literal("deferred")
+          )
+        ),
+        askedDate: v.optional(v.number()),
+        answer: v.optional(v.string()),
+        answeredDate: v.optional(v.number()),
+        whyItMatters: v.optional(v.string()),
+      })
     ),
   },
   handler: async (ctx, args) => {
-    await ctx.db.patch(args.questionId, {
-      status: args.status,
-    });
-    return args.questionId;
+    const ids: string[] = [];
+
+    for (const { id, ...fields } of args.items) {
+      await ctx.db.patch(id, fields);
+      ids.push(id);
+    }
+
+    return { ids, count: ids.length };
   },
 });
-
@@ -17,6 +17,19 @@ class Config:
     # Convex configuration
     CONVEX_DEPLOYMENT_URL: Optional[str] = os.getenv("CONVEX_DEPLOYMENT_URL")
     
+    # Bulk sync: bounds for one batched mutation request
+    CONVEX_BATCH_MAX_BYTES: int = int(os.getenv("CONVEX_BATCH_MAX_BYTES", "1000000"))
+    CONVEX_BATCH_MAX_ITEMS: int = int(os.getenv("CONVEX_BATCH_MAX_ITEMS", "500"))
+    
+    # Async HTTP clients: connection pool and keep-alive (HTTP/2 needs httpx[http2])
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+    
+    # Record of data pushed to Convex (defaults to <storage base path>/.state/convex_sync.db)
+    CONVEX_SYNC_LEDGER_PATH: Optional[str] = os.getenv("CONVEX_SYNC_LEDGER_PATH")
+    
     # Optional multi-tenant context passed on writes
     MCP_USER_ID: Optional[str] = os.getenv("MCP_USER_ID")
     MCP_ORG_ID: Optional[str] = os.getenv("MCP_ORG_ID")
@@ -31,11 +44,64 @@ class Config:
     MERGE_API_BASE_URL: str = os.getenv("MERGE_API_BASE_URL", "https://api.merge.dev/api/filestorage/v1")
     USE_INTEGRATION_STORAGE: bool = os.getenv("USE_INTEGRATION_STORAGE", "false").lower() == "true"
     
+    # Integration sync: concurrent file downloads sharing one Merge request budget
+    INTEGRATION_DOWNLOAD_WORKERS: int = int(os.getenv("INTEGRATION_DOWNLOAD_WORKERS", "8"))
+    MERGE_PAGE_SIZE: int = int(os.getenv("MERGE_PAGE_SIZE", "100"))
+    MERGE_RATE_LIMIT_PER_SECOND: float = float(os.getenv("MERGE_RATE_LIMIT_PER_SECOND", "10"))
+    # Sync manifests and cached file contents (defaults to <storage base path>/.state/integration)
+    INTEGRATION_CACHE_DIR: Optional[str] = os.getenv("INTEGRATION_CACHE_DIR")
+    BLOB_CACHE_MAX_MB: int = int(os.getenv("BLOB_CACHE_MAX_MB", "1024"))
+    BLOB_CACHE_COMPRESSION: str = os.getenv("BLOB_CACHE_COMPRESSION", "none").lower()
+    
     # Sync behavior
     AUTO_SYNC_ON_ANALYZE: bool = os.getenv("AUTO_SYNC_ON_ANALYZE", "false").lower() == "true"
     AUTO_SYNC_ON_UPDATE: bool = os.getenv("AUTO_SYNC_ON_UPDATE", "false").lower() == "true"
     AUTO_SYNC_ON_CREATE: bool = os.getenv("AUTO_SYNC_ON_CREATE", "false").lower() == "true"
     
+    # Batch analysis (analyze with a list of project IDs)
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "0")) or (os.cpu_count() or 1)
+    ANALYSIS_TIMEOUT_SECONDS: float = float(os.getenv("ANALYSIS_TIMEOUT_SECONDS", "300"))
+    
+    # Project state persistence (defaults to <storage base path>/.state/projects.db)
+    PERSIST_PROJECT_STATE: bool = os.getenv("PERSIST_PROJECT_STATE", "true").lower() == "true"
+    STATE_STORE_PATH: Optional[str] = os.getenv("STATE_STORE_PATH")
+    STATE_MAX_PROJECTS: int = int(os.getenv("STATE_MAX_PROJECTS", "32"))
+    
+    # Local ingest: files read and parsed concurrently (I/O bound, so threads)
+    INGEST_WORKERS: int = int(os.getenv("INGEST_WORKERS", "8"))
+    
+    # Local storage directory catalog (defaults to <storage base path>/.state/catalog.json)
+    PERSIST_DIRECTORY_CATALOG: bool = os.getenv("PERSIST_DIRECTORY_CATALOG", "true").lower() == "true"
+    DIRECTORY_CATALOG_PATH: Optional[str] = os.getenv("DIRECTORY_CATALOG_PATH")
+    # Seconds listings are served without checking directory mtimes (0 = check every call)
+    DIRECTORY_CATALOG_REVALIDATE_SECONDS: float = float(os.getenv("DIRECTORY_CATALOG_REVALIDATE_SECONDS", "0"))
+    
+    # Watch loaded projects' discovery/working folders and ingest changed files
+    # (native notifications with the optional watchfiles package, else polling)
+    WATCH_FOLDERS: bool = os.getenv("WATCH_FOLDERS", "false").lower() == "true"
+    WATCH_DEBOUNCE_MS: int = int(os.getenv("WATCH_DEBOUNCE_MS", "1000"))
+    WATCH_POLL_INTERVAL_SECONDS: float = float(os.getenv("WATCH_POLL_INTERVAL_SECONDS", "2"))
+    WATCH_FORCE_POLLING: bool = os.getenv("WATCH_FORCE_POLLING", "false").lower() == "true"
+    
+    # Memory budget for document bodies loaded on demand (0 = unbounded)
+    DOCUMENT_BODY_BUDGET_MB: int = int(os.getenv("DOCUMENT_BODY_BUDGET_MB", "256"))
+    # Local files at least this large are analyzed through a memory map, decoding
+    # only the text around matches instead of loading them (0 = always load)
+    MAPPED_SCAN_MIN_MB: int = int(os.getenv("MAPPED_SCAN_MIN_MB", "16"))
+    
+    # Per-tool latency/resource metrics (served at /metrics) and the slow-call log
+    TOOL_METRICS_ENABLED: bool = os.getenv("TOOL_METRICS_ENABLED", "true").lower() == "true"
+    TOOL_METRICS_ALLOC_SAMPLE_RATE: float = float(os.getenv("TOOL_METRICS_ALLOC_SAMPLE_RATE", "0.01"))
+    SLOW_TOOL_CALL_MS: float = float(os.getenv("SLOW_TOOL_CALL_MS", "0"))
+    SLOW_TOOL_CALL_LOG: Optional[str] = os.getenv("SLOW_TOOL_CALL_LOG")
+    
+    # Tracing spans per tool call: recent traces kept in memory (get_traces tool),
+    # optionally appended to a file as OTLP/JSON lines
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "100"))
+    TRACE_MAX_SPANS: int = int(os.getenv("TRACE_MAX_SPANS", "1000"))
+    TRACE_EXPORT_PATH: Optional[str] = os.getenv("TRACE_EXPORT_PATH")
+    
     @classmethod
     def is_convex_enabled(cls) -> bool:
         """Check if Convex is properly configured."""
@@ -0,0 +1,104 @@
+"""Per-document analysis partials and their memoization cache."""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional
+
+
+@dataclass
+class DocumentFindings:
+    """
+    Analysis partials for a single document.
+
+    Everything here depends only on the document's own text, so it can be
+    memoized by content fingerprint and merged into project-level results.
+    """
+
+    # Lowercased vocabulary keywords that occur in the document
+    keywords: FrozenSet[str] = frozenset()
+
+    # Captures per extraction pattern, in pattern order
+    pain_points: List[List[str]] = field(default_factory=list)
+    objectives: List[List[str]] = field(default_factory=list)
+
+    # Context around the first word-bounded occurrence of each ambiguous term
+    ambiguity_contexts: Dict[str, str] = field(default_factory=dict)
+
+    # First clarification context per clarification pattern, per term
+    clarifications: Dict[str, List[Optional[str]]] = field(default_factory=dict)
+
+    # Sentences stating a source of truth for inventory
+    inventory_statements: List[str] = field(default_factory=list)
+
+    # Sources of the project's custom gap patterns that match the document
+    custom_patterns: FrozenSet[str] = frozenset()
+
+    # Company name mentioned in the document body, if any
+    client_name: Optional[str] = None
+
+    # Resolution candidates per conflict topic and search index, filled in on first use
+    resolutions: Dict[str, Dict[int, Optional[str]]] = field(default_factory=dict)
+
+
+class AnalysisCache:
+    """Bounded LRU cache of DocumentFindings keyed by document fingerprint."""
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of documents to keep findings for
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, DocumentFindings]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[DocumentFindings]:
+        """Get cached findings, marking them as recently used."""
+        with self._lock:
+            findings = self._entries.get(key)
+            if findings is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return findings
+
+    def put(self, key: Hashable, findings: DocumentFindings):
+        """Store findings, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = findings
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def peek(self, keys: Iterable[Hashable]) -> Dict[Hashable, DocumentFindings]:
+        """Get the cached findings among keys, without counting hits or misses."""
+        with self._lock:
+            return {key: self._entries[key] for key in keys if key in self._entries}
+
+    def put_many(self, entries: Dict[Hashable, DocumentFindings]):
+        """Store findings computed elsewhere (e.g. in a worker process)."""
+        for key, findings in entries.items():
+            self.put(key, findings)
+
+    def clear(self):
+        """Drop all cached findings."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -1,12 +1,38 @@
 """Discovery document analyzer."""
 
+import hashlib
 import re
-from typing import List
-from models.document import Document
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple, Union
+from models.document import Document, StaleContentError
 from models.analysis import (
     AnalysisResult, Gap, Ambiguity, Conflict,
     GapCategory, Priority
 )
+from models.project_state import ProjectConfig
+from .analysis_cache import AnalysisCache, DocumentFindings
+from .keyword_matcher import KeywordHits, KeywordMatcher, compile_keywords
+from .mapped_text import MAX_CHAR_BYTES, MappedText, SentenceCursor, map_document
+from .pattern_registry import CompiledPattern, pattern_registry
+from .sentence_index import PreparedText, prepared_texts
+from .tracing import span
+
+
+# Bytes decoded after an anchor to match a pattern in a memory-mapped body;
+# a match that runs to the end of its window is retried with a wider one
+MATCH_WINDOW_BYTES = 4096
+
+
+class _Extraction:
+    """Progress of one anchored extraction pattern through a memory-mapped body."""
+
+    __slots__ = ("anchors", "pattern", "found", "last_end", "last_pos")
+
+    def __init__(self, anchors: List[str], pattern: CompiledPattern):
+        self.anchors = anchors
+        self.pattern = pattern
+        self.found: List[str] = []
+        self.last_end = 0
+        self.last_pos = -1
 
 
 class DiscoveryAnalyzer:
@@ -39,55 +65,597 @@ class DiscoveryAnalyzer:
         "success metric": GapCategory.SUCCESS_CRITERIA,
         "acceptance criteria": GapCategory.SUCCESS_CRITERIA,
     }
+
+    # Critical topics that must be mentioned somewhere in discovery
+    GAP_CHECKS = [
+        {
+            "keywords": ["refund", "return"],
+            "category": GapCategory.BUSINESS_RULES,
+            "description": "Refund and return handling not discussed",
+            "impact": "Returns could fail to sync or create duplicate credits",
+            "question": "How should refunds and returns be handled? Should they create credit notes or adjustment entries?",
+            "priority": Priority.HIGH
+        },
+        {
+            "keywords": ["tax", "vat", "sales tax"],
+            "category": GapCategory.BUSINESS_RULES,
+            "description": "Tax handling not specified",
+            "impact": "Tax calculations could be incorrect or missing in synced data",
+            "question": "How should taxes be calculated and synced? Which system is responsible for tax calculation?",
+            "priority": Priority.HIGH
+        },
+        {
+            "keywords": ["error", "failure", "retry", "error handling"],
+            "category": GapCategory.ERROR_HANDLING,
+            "description": "Error handling and retry logic not defined",
+            "impact": "Failed syncs could go unnoticed or cause data inconsistencies",
+            "question": "What should happen when a sync fails? Should we retry automatically? How should errors be reported?",
+            "priority": Priority.HIGH
+        },
+        {
+            "keywords": ["sync frequency", "real-time", "interval", "schedule"],
+            "category": GapCategory.TECHNICAL_CONSTRAINTS,
+            "description": "Sync frequency not clearly defined",
+            "impact": "Could build wrong sync mechanism (webhook vs polling)",
+            "question": "How often should data sync? Real-time via webhooks, or scheduled intervals (every 15 min, hourly, daily)?",
+            "priority": Priority.MEDIUM
+        },
+        {
+            "keywords": ["success", "acceptance", "criteria", "metric"],
+            "category": GapCategory.SUCCESS_CRITERIA,
+            "description": "Success criteria not explicitly defined",
+            "impact": "Unclear definition of project completion",
+            "question": "What are the specific success criteria? How will we measure if the integration is working correctly?",
+            "priority": Priority.MEDIUM
+        },
+        {
+            "keywords": ["rate limit", "api limit", "throttle"],
+            "category": GapCategory.TECHNICAL_CONSTRAINTS,
+            "description": "API rate limits not discussed",
+            "impact": "Could hit rate limits and cause sync failures",
+            "question": "What are the API rate limits for each system? Do we need to implement throttling?",
+            "priority": Priority.MEDIUM
+        },
+        {
+            "keywords": ["authentication", "credentials", "api key", "oauth"],
+            "category": GapCategory.TECHNICAL_CONSTRAINTS,
+            "description": "Authentication method not specified",
+            "impact": "Could start with wrong authentication approach",
+            "question": "What authentication method should be used? API keys, OAuth, or something else?",
+            "priority": Priority.MEDIUM
+        },
+        {
+            "keywords": ["edge case", "exception", "special case"],
+            "category": GapCategory.EDGE_CASES,
+            "description": "Edge cases not explored",
+            "impact": "Unexpected scenarios could break the integration",
+            "question": "What edge cases should we handle? (e.g., partial refunds, split payments, cancelled orders)",
+            "priority": Priority.LOW
+        },
+    ]
+
+    # Pain point indicators: (anchor keywords the match starts with, pattern)
+    PAIN_POINT_PATTERNS = [
+        (["problem"], r'problem[s]?\s+(?:is|are)\s+([^.]+)'),
+        (["issue"], r'issue[s]?\s+(?:is|are)\s+([^.]+)'),
+        (["spending"], r'spending\s+(\d+[^.]+(?:hours?|minutes?)[^.]+)'),
+        (["frustrated"], r'frustrated\s+(?:with|about)\s+([^.]+)'),
+        (["difficulty"], r'difficulty\s+(?:with|in)\s+([^.]+)'),
+        (["struggle"], r'struggle\s+(?:with|to)\s+([^.]+)'),
+    ]
+
+    # Business objective indicators: (anchor keywords the match starts with, pattern)
+    OBJECTIVE_PATTERNS = [
+        (["want", "need", "would like"], r'(?:want|need|would like)\s+to\s+([^.]+)'),
+        (["goal"], r'goal\s+is\s+to\s+([^.]+)'),
+        (["objective"], r'objective\s+is\s+to\s+([^.]+)'),
+        (["looking"], r'looking\s+to\s+([^.]+)'),
+        (["hoping"], r'hoping\s+to\s+([^.]+)'),
+    ]
+
+    # Patterns that pin down an ambiguous term; each starts with the term itself
+    CLARIFICATION_PATTERNS = {
+        "real-time": [
+            r'real-time.{0,100}(?:within|under|less than)\s+(\d+\s*(?:seconds?|minutes?|milliseconds?))',
+            r'real-time.{0,100}(?:webhook|instant|immediately)',
+        ],
+        "fast": [
+            r'fast.{0,100}(?:within|under|less than)\s+(\d+\s*(?:seconds?|minutes?|milliseconds?))',
+            r'fast.{0,100}(?:response time|load time|performance).{0,50}(\d+\s*(?:ms|seconds?))',
+        ],
+        "scalable": [
+            r'scalable.{0,100}(?:up to|support|handle)\s+([\d,]+)\s*(?:orders?|users?|transactions?|requests?)',
+        ],
+        "soon": [
+            r'soon.{0,100}(?:within|in|by)\s+(\d+\s*(?:days?|weeks?|months?))',
+        ],
+    }
+
+    # Words that mark an explicit decision, in priority order
+    RESOLUTION_KEYWORDS = [
+        "decided", "decision", "agreed", "final decision", "conclusion",
+        "resolved", "settled on", "confirmed", "ultimately", "clarification"
+    ]
+
+    # Explicit decisions naming a system; {topic} is the conflict's topic word
+    DECISION_PATTERNS = [
+        r'(?:we will use|using|use)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)\s+(?:as|for).{{0,50}}{topic}',
+        r'{topic}.{{0,30}}(?:will be|is)\s+([A-Z][a-zA-Z]+)',
+    ]
+
+    # Company name heuristic, e.g. "I'm from Company" or "at Company"
+    CLIENT_NAME_PATTERN = r'(?:from|at)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)'
     
+    # Terms that mark a statement about the inventory system of record
+    INVENTORY_TERMS = ["inventory", "stock"]
+    SOURCE_OF_TRUTH_TERMS = ["source of truth", "master"]
+    SOURCE_TERMS = ["source", "master"]
+
+    # Per-document findings shared by all analyzer instances
+    _cache = AnalysisCache()
+
+    # Local files at least this many bytes are scanned through a memory map
+    # instead of being loaded (0 = always load); set from config by the server
+    mapped_scan_min_bytes = 0
+
+    def __init__(self, config: Optional[ProjectConfig] = None):
+        """
+        Compile the keyword vocabulary and patterns shared by all detection stages.
+        
+        Args:
+            config: Project configuration; its custom_gap_patterns are checked
+                alongside the built-in gap checks
+                
+        Raises:
+            ValueError: If a custom gap pattern is invalid
+        """
+        custom_checks = self.validate_custom_gap_patterns(
+            config.custom_gap_patterns if config else []
+        )
+        self._gap_checks = self.GAP_CHECKS + custom_checks
+        self._custom_patterns = [check["pattern"] for check in custom_checks if check["pattern"]]
+        self._compile_patterns()
+        
+        self._vocabulary_key = self._vocabulary()
+        self._matcher = compile_keywords(self._vocabulary_key)
+        # Cached findings depend on the vocabulary and on the custom patterns
+        self._findings_key = (
+            self._vocabulary_key,
+            tuple(pattern.source for pattern in self._custom_patterns),
+        )
+
+    @classmethod
+    def validate_custom_gap_patterns(cls, patterns: List[Dict]) -> List[Dict]:
+        r"""
+        Validate and compile project custom gap patterns.
+        
+        Each entry describes a topic that must be covered somewhere in
+        discovery, in the same shape as GAP_CHECKS:
+        
+            {
+                "description": "Gift card handling not discussed",  # required
+                "keywords": ["gift card"],        # and/or
+                "pattern": r"gift\s+cards?",      # regex, case-insensitive
+                "category": "business_rules",     # GapCategory value
+                "impact": "...",
+                "question": "...",
+                "priority": "medium"              # Priority value
+            }
+        
+        Args:
+            patterns: custom_gap_patterns entries from the project config
+            
+        Returns:
+            Gap checks with category/priority enums and compiled patterns
+            
+        Raises:
+            ValueError: If an entry is malformed or its pattern does not compile
+        """
+        checks = []
+        for index, entry in enumerate(patterns or []):
+            label = f"custom_gap_patterns[{index}]"
+            if not isinstance(entry, dict):
+                raise ValueError(f"{label} must be a dict")
+            
+            description = entry.get("description")
+            if not description:
+                raise ValueError(f"{label} requires a description")
+            
+            keywords = entry.get("keywords", [])
+            if isinstance(keywords, str):
+                keywords = [keywords]
+            if not all(isinstance(k, str) and k.strip() for k in keywords):
+                raise ValueError(f"{label} keywords must be non-empty strings")
+            
+            source = entry.get("pattern")
+            if not keywords and not source:
+                raise ValueError(f"{label} requires keywords or a pattern")
+            
+            try:
+                category = GapCategory(entry.get("category", GapCategory.BUSINESS_RULES.value))
+                priority = Priority(entry.get("priority", Priority.MEDIUM.value))
+            except ValueError as e:
+                raise ValueError(f"{label}: {e}") from e
+            
+            compiled = None
+            if source:
+                if not isinstance(source, str):
+                    raise ValueError(f"{label} pattern must be a string")
+                # Shared by source, so projects reusing a description do not collide
+                try:
+                    compiled = pattern_registry.register_custom(source, re.IGNORECASE)
+                except ValueError as e:
+                    raise ValueError(f"{label}: {e}") from e
+            
+            checks.append({
+                "keywords": list(keywords),
+                "pattern": compiled,
+                "category": category,
+                "description": description,
+                "impact": entry.get("impact", ""),
+                "question": entry.get("question"),
+                "priority": priority
+            })
+        return checks
+
+    @classmethod
+    def pattern_stats(cls) -> List[Dict]:
+        """Get match counts and cumulative match time per pattern, slowest first."""
+        return pattern_registry.stats()
+
+    def _compile_patterns(self):
+        """Get the built-in patterns from the registry, compiling them on first use."""
+        self._pain_point_patterns = [
+            (anchors, pattern_registry.register(f"pain_point:{anchors[0]}", pattern, re.IGNORECASE))
+            for anchors, pattern in self.PAIN_POINT_PATTERNS
+        ]
+        self._objective_patterns = [
+            (anchors, pattern_registry.register(f"objective:{anchors[0]}", pattern, re.IGNORECASE))
+            for anchors, pattern in self.OBJECTIVE_PATTERNS
+        ]
+        self._clarification_patterns = {
+            term: [
+                pattern_registry.register(f"clarification:{term}:{index}", pattern,
+                                          re.IGNORECASE | re.DOTALL)
+                for index, pattern in enumerate(patterns)
+            ]
+            for term, patterns in self.CLARIFICATION_PATTERNS.items()
+        }
+        self._ambiguity_patterns = {
+            term: pattern_registry.register(f"ambiguity:{term}",
+                                            rf'(.{{0,50}}\b{term}\b.{{0,50}})', re.IGNORECASE)
+            for term in self.AMBIGUOUS_TERMS
+        }
+        self._client_name_pattern = pattern_registry.register("client_name", self.CLIENT_NAME_PATTERN)
+
+    def _decision_pattern(self, index: int, topic_word: str) -> CompiledPattern:
+        """Get a decision pattern for a conflict topic word."""
+        return pattern_registry.register(
+            f"decision:{index}:{topic_word}",
+            self.DECISION_PATTERNS[index].format(topic=topic_word),
+            re.IGNORECASE
+        )
+
+    def _vocabulary(self) -> tuple:
+        """Collect every keyword the detection stages look up."""
+        keywords = list(self.KNOWN_SYSTEMS) + list(self.AMBIGUOUS_TERMS)
+        for check in self._gap_checks:
+            keywords.extend(check["keywords"])
+        for anchors, _ in self.PAIN_POINT_PATTERNS + self.OBJECTIVE_PATTERNS:
+            keywords.extend(anchors)
+        keywords.extend(self.INVENTORY_TERMS + self.SOURCE_OF_TRUTH_TERMS + self.SOURCE_TERMS)
+        return tuple(sorted({k.lower() for k in keywords}))
+
     def analyze(self, documents: List[Document], 
                 additional_context: List[str] = None) -> AnalysisResult:
         """Analyze discovery documents and return analysis result."""
         result = AnalysisResult()
         
-        # Combine all document content, preferring summaries for integration documents
-        content_parts = []
+        with span("DiscoveryAnalyzer.analyze", documents=len(documents)):
+            # Per-document findings are memoized by content fingerprint, so only
+            # new or changed documents are scanned; context is one more segment
+            with span("analyze.findings") as findings_span:
+                misses = self._cache.misses
+                findings = []
+                readable = []
+                for doc in documents:
+                    # A local file that changed or vanished since ingest is left out
+                    try:
+                        findings.append(self._document_findings(doc))
+                    except StaleContentError as e:
+                        print(f"Warning: Skipping {doc.file_path}: {e}")
+                        continue
+                    readable.append(doc)
+                documents = readable
+                if additional_context:
+                    findings.append(self._context_findings("\n".join(additional_context)))
+                findings_span.set_attribute("scanned", self._cache.misses - misses)
+            
+            # Extract information
+            with span("analyze.systems"):
+                result.systems_identified = self._extract_systems(findings)
+                result.client_name = self._extract_client_name(documents, findings)
+                result.pain_points = self._merge_captures([f.pain_points for f in findings], limit=5)
+                result.business_objectives = self._merge_captures([f.objectives for f in findings], limit=5)
+            
+            # Detect gaps
+            with span("analyze.gaps") as gaps_span:
+                result.gaps = self._detect_gaps(findings, additional_context or [])
+                gaps_span.set_attribute("gaps", len(result.gaps))
+            
+            # Detect ambiguities
+            with span("analyze.ambiguities") as ambiguities_span:
+                result.ambiguities = self._detect_ambiguities(findings)
+                ambiguities_span.set_attribute("ambiguities", len(result.ambiguities))
+            
+            # Detect conflicts
+            with span("analyze.conflicts") as conflicts_span:
+                result.conflicts = self._detect_conflicts(documents, findings)
+                conflicts_span.set_attribute("conflicts", len(result.conflicts))
+            
+            # Calculate confidence scores
+            with span("analyze.confidence"):
+                result.calculate_confidence()
+        
+        return result
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """Get hit/miss counters for the per-document findings cache."""
+        return cls._cache.stats()
+    
+    def cached_findings(self, documents: List[Document],
+                        additional_context: List[str] = None) -> Dict[Hashable, DocumentFindings]:
+        """
+        Get the memoized findings of documents and context, without scanning.
+        
+        Used to hand findings to and from worker processes, whose caches
+        do not outlive a batch.
+        
+        Returns:
+            Findings by cache key, for the inputs that are cached
+        """
+        keys = []
         for doc in documents:
+            try:
+                keys.append(self._document_key(doc)[0])
+            except (OSError, ValueError):
+                # Cannot be fingerprinted without reading it; analysis decides
+                continue
+        if additional_context:
+            keys.append(self._context_key("\n".join(additional_context)))
+        return self._cache.peek(keys)
+    
+    @classmethod
+    def add_findings(cls, findings: Dict[Hashable, DocumentFindings]):
+        """Memoize findings computed elsewhere (see `cached_findings`)."""
+        cls._cache.put_many(findings)
+    
+    def _document_key(self, doc: Document) -> Tuple[tuple, str]:
+        """Get the findings cache key and corpus header of a document."""
+        # Integration documents are analyzed through their summary when available
+        if doc.summary and doc.source == "integration":
+            fingerprint = hashlib.sha256(doc.summary.encode("utf-8", "surrogatepass")).hexdigest()
+            key = (self._findings_key, doc.file_path, "summary", fingerprint, doc.fingerprint)
+            return key, f"[SUMMARY: {doc.file_path}]\n"
+        return (self._findings_key, doc.file_path, "content", doc.fingerprint), f"[DOCUMENT: {doc.file_path}]\n"
+    
+    def _context_key(self, context: str) -> tuple:
+        """Get the findings cache key of the user-supplied context."""
+        fingerprint = hashlib.sha256(context.encode("utf-8", "surrogatepass")).hexdigest()
+        return (self._findings_key, "context", fingerprint)
+    
+    def _document_findings(self, doc: Document) -> DocumentFindings:
+        """Get findings for one document, scanning it only if not cached."""
+        key, header = self._document_key(doc)
+        findings = self._cache.get(key)
+        if findings is None:
+            # Large local files are scanned as bytes instead of being loaded
+            mapped = None
+            if not (doc.summary and doc.source == "integration"):
+                mapped = map_document(doc, self.mapped_scan_min_bytes, prefix=header)
+            if mapped is not None:
+                with mapped:
+                    findings = self._mapped_findings(mapped)
+                self._cache.put(key, findings)
+                return findings
+            
+            # Lowercasing and sentence splitting are shared with other consumers
+            prepared = prepared_texts.get(doc)
             if doc.summary and doc.source == "integration":
-                # Use summary for integration documents
-                content_parts.append(f"[SUMMARY: {doc.file_path}]\n{doc.summary}")
+                findings, _ = self._segment_findings(header + doc.summary)
+                content_hits = self._matcher.scan(prepared.text, prepared.lower)
             else:
-                # Use full content for local documents or when no summary available
-                content_parts.append(f"[DOCUMENT: {doc.file_path}]\n{doc.content}")
-        
-        all_content = "\n\n".join(content_parts)
-        if additional_context:
-            all_content += "\n\n" + "\n".join(additional_context)
+                header_lower = header.lower()
+                lowered = None
+                if prepared.lower is not None and len(header_lower) == len(header):
+                    lowered = header_lower + prepared.lower
+                findings, segment_hits = self._segment_findings(header + prepared.text, lowered)
+                content_hits = segment_hits.shifted(len(header))
+            findings.inventory_statements = self._extract_inventory_statements(prepared, content_hits)
+            findings.client_name = self._extract_client_name_from_content(prepared.text)
+            self._cache.put(key, findings)
+        return findings
+    
+    def _context_findings(self, context: str) -> DocumentFindings:
+        """Get findings for the user-supplied context, scanning it only if not cached."""
+        key = self._context_key(context)
+        findings = self._cache.get(key)
+        if findings is None:
+            findings, _ = self._segment_findings(context)
+            self._cache.put(key, findings)
+        return findings
+    
+    def _segment_findings(self, text: str,
+                          lowered: Optional[str] = None) -> Tuple[DocumentFindings, KeywordHits]:
+        """Scan one segment of the corpus (`lowered` is its lowercase, if known) and extract its partial findings."""
+        hits = self._matcher.scan(text, lowered)
+        findings = DocumentFindings(
+            keywords=hits.keywords(),
+            pain_points=self._match_at_hits(self._pain_point_patterns, text, hits, limit=5),
+            objectives=self._match_at_hits(self._objective_patterns, text, hits, limit=5),
+            ambiguity_contexts=self._extract_ambiguity_contexts(text, hits),
+            clarifications=self._extract_clarifications(text, hits),
+            custom_patterns=frozenset(
+                pattern.source for pattern in self._custom_patterns if pattern.search(text)
+            ),
+        )
+        return findings, hits
+    
+    def _mapped_findings(self, mapped: MappedText) -> DocumentFindings:
+        """
+        Extract a document's findings from its memory-mapped header and body.
         
-        # Extract information
-        result.systems_identified = self._extract_systems(all_content)
-        result.client_name = self._extract_client_name(documents)
-        result.pain_points = self._extract_pain_points(all_content)
-        result.business_objectives = self._extract_objectives(all_content)
+        Produces the same findings as `_segment_findings` plus the body-only
+        stages, without holding the text: keywords are found in one pass over
+        the bytes, and each stage decodes only a window around the hits it
+        needs as they are found. Searches that are not anchored at a keyword
+        (custom patterns, client name) decode one chunk at a time.
         
-        # Detect gaps
-        result.gaps = self._detect_gaps(all_content, additional_context or [])
+        Args:
+            mapped: Document body, with its header as prefix
+            
+        Returns:
+            Findings for the document
+        """
+        extractions = [
+            [_Extraction(anchors, compiled) for anchors, compiled in patterns]
+            for patterns in (self._pain_point_patterns, self._objective_patterns)
+        ]
+        by_anchor: Dict[str, List[_Extraction]] = {}
+        for extraction in extractions[0] + extractions[1]:
+            for anchor in extraction.anchors:
+                by_anchor.setdefault(anchor.lower(), []).append(extraction)
         
-        # Detect ambiguities
-        result.ambiguities = self._detect_ambiguities(all_content)
+        keywords, body_keywords = set(), set()
+        ambiguity_contexts: Dict[str, Optional[str]] = {}
+        clarifications: Dict[str, List[Optional[str]]] = {}
+        sentences = SentenceCursor(mapped, mapped.body_start)
+        statements = []
+        sentence, mentions_inventory, mentions_source = None, False, False
         
-        # Detect conflicts
-        result.conflicts = self._detect_conflicts(documents)
+        for pos, keyword in self._scan_mapped(mapped):
+            keywords.add(keyword)
+            for extraction in by_anchor.get(keyword, ()):
+                self._mapped_extract(extraction, mapped, pos, limit=5)
+            # Only the first word-bounded occurrence of an ambiguous term is reported
+            if (keyword in self._ambiguity_patterns and keyword not in ambiguity_contexts
+                    and mapped.is_word_boundary(pos) and mapped.is_word_boundary(pos + len(keyword))):
+                ambiguity_contexts[keyword] = self._mapped_ambiguity_context(keyword, mapped, pos)
+            if keyword in self._clarification_patterns:
+                self._mapped_clarifications(keyword, mapped, pos, clarifications)
+            
+            # Inventory statements come from the body only
+            if pos < mapped.body_start:
+                continue
+            body_keywords.add(keyword)
+            inventory = keyword in self.INVENTORY_TERMS
+            if inventory or keyword in self.SOURCE_TERMS:
+                located = sentences.locate(pos)
+                if located != sentence:
+                    if mentions_inventory and mentions_source:
+                        statements.append(mapped.text(*sentence).strip())
+                    sentence, mentions_inventory, mentions_source = located, False, False
+                mentions_inventory = mentions_inventory or inventory
+                mentions_source = mentions_source or not inventory
+        if mentions_inventory and mentions_source:
+            statements.append(mapped.text(*sentence).strip())
+        if not body_keywords.intersection(self.INVENTORY_TERMS) \
+                or not body_keywords.intersection(self.SOURCE_OF_TRUTH_TERMS):
+            statements = []
         
-        # Calculate confidence scores
-        result.calculate_confidence()
+        client_name = mapped.search(self._client_name_pattern, mapped.body_start)
+        return DocumentFindings(
+            keywords=frozenset(keywords),
+            pain_points=[extraction.found for extraction in extractions[0]],
+            objectives=[extraction.found for extraction in extractions[1]],
+            ambiguity_contexts={
+                term: ambiguity_contexts[term] for term in self.AMBIGUOUS_TERMS
+                if ambiguity_contexts.get(term) is not None
+            },
+            clarifications={
+                term: clarifications[term] for term in self.CLARIFICATION_PATTERNS if term in clarifications
+            },
+            inventory_statements=statements,
+            custom_patterns=frozenset(
+                pattern.source for pattern in self._custom_patterns if mapped.search(pattern) is not None
+            ),
+            client_name=client_name[1].group(1) if client_name else None,
+        )
+    
+    def _scan_mapped(self, mapped: MappedText, matcher: Optional[KeywordMatcher] = None,
+                     start: int = 0) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, keyword) for every keyword occurrence in mapped text, a chunk at a time."""
+        matcher = matcher or self._matcher
+        for offset, data, length in mapped.chunks(start, overlap=matcher.max_bytes):
+            for pos, keyword in matcher.scan_bytes(data, length):
+                yield offset + pos, keyword
+    
+    def _mapped_match(self, compiled: CompiledPattern, mapped: MappedText, pos: int,
+                      before: int = 0, after: int = MATCH_WINDOW_BYTES) -> Tuple[str, int, Optional[re.Match]]:
+        """
+        Match a pattern at an offset of mapped text, decoding a window around it.
         
-        return result
+        Args:
+            compiled: Pattern to match
+            mapped: Text to match in
+            pos: Offset the match must start at
+            before: Bytes of context to decode before `pos`
+            after: Bytes to decode from `pos` on; widened while the match runs
+                to the end of the window
+                
+        Returns:
+            (window text, index of `pos` in it, match or None)
+        """
+        while True:
+            text, index = mapped.window(pos, before, after)
+            match = compiled.match(text, index)
+            if match is None or match.end() < len(text) or pos + after >= len(mapped):
+                return text, index, match
+            after *= 2
+    
+    def _mapped_extract(self, extraction: _Extraction, mapped: MappedText, pos: int, limit: int):
+        """Try an extraction pattern at one of its anchors, like `_match_at_hits`."""
+        if pos == extraction.last_pos or pos < extraction.last_end or len(extraction.found) >= limit:
+            return
+        extraction.last_pos = pos
+        # Extraction patterns never match past a period, so the window ends at the next one
+        period = mapped.find(b".", pos, pos + MATCH_WINDOW_BYTES)
+        after = period + 1 - pos if period != -1 else MATCH_WINDOW_BYTES
+        text, index, match = self._mapped_match(extraction.pattern, mapped, pos, after=after)
+        if not match:
+            return
+        extraction.last_end = max(mapped.advance(pos, text[index:match.end()]), pos + 1)
+        phrase = match.group(1).strip()
+        if len(phrase) > 10:  # Filter out too short matches
+            extraction.found.append(phrase)
     
-    def _extract_systems(self, content: str) -> List[str]:
-        """Extract mentioned systems from content."""
-        systems = []
-        for system in self.KNOWN_SYSTEMS:
-            if system.lower() in content.lower():
-                systems.append(system)
-        return list(set(systems))
+    def _mapped_ambiguity_context(self, term: str, mapped: MappedText, pos: int) -> Optional[str]:
+        """Get the context around an ambiguous term, like `_extract_ambiguity_contexts`."""
+        text, index = mapped.window(pos, 64 * MAX_CHAR_BYTES, (len(term) + 128) * MAX_CHAR_BYTES)
+        match = self._ambiguity_patterns[term].search(text, max(0, index - 50), index + len(term) + 101)
+        return match.group(1).strip() if match else None
+    
+    def _mapped_clarifications(self, term: str, mapped: MappedText, pos: int,
+                               clarifications: Dict[str, List[Optional[str]]]):
+        """Try the clarification patterns of a term not matched yet at one of its occurrences."""
+        patterns = self._clarification_patterns[term]
+        contexts = clarifications.setdefault(term, [None] * len(patterns))
+        for index, compiled in enumerate(patterns):
+            if contexts[index] is not None:
+                continue
+            text, match_pos, match = self._mapped_match(compiled, mapped, pos, before=100 * MAX_CHAR_BYTES)
+            if match:
+                clarification_context = text[max(0, match_pos - 100):match_pos + 200].strip()
+                contexts[index] = " ".join(clarification_context.split())
     
-    def _extract_client_name(self, documents: List[Document]) -> str:
+    def _extract_systems(self, findings: List[DocumentFindings]) -> List[str]:
+        """Extract mentioned systems from per-document keywords."""
+        mentioned = set().union(*(f.keywords for f in findings))
+        return [system for system in self.KNOWN_SYSTEMS if system.lower() in mentioned]
+    
+    def _extract_client_name(self, documents: List[Document],
+                             findings: List[DocumentFindings]) -> str:
         """Extract client name from documents."""
         # Try to get from email metadata first
         for doc in documents:
@@ -98,140 +666,87 @@ class DiscoveryAnalyzer:
                         domain = participant.split("@")[1].split(".")[0]
                         return domain.capitalize()
         
-        # Look for company names in content (basic heuristic)
-        for doc in documents:
-            # Look for patterns like "I'm from Company" or "at Company"
-            match = re.search(r'(?:from|at)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)',
-                            doc.content)
-            if match:
-                return match.group(1)
+        # Fall back to company names found in document content
+        for doc_findings in findings[:len(documents)]:
+            if doc_findings.client_name:
+                return doc_findings.client_name
         
         return "Unknown Client"
     
-    def _extract_pain_points(self, content: str) -> List[str]:
-        """Extract pain points mentioned in discovery."""
-        pain_points = []
-        
-        # Look for problem indicators
-        problem_patterns = [
-            r'problem[s]?\s+(?:is|are)\s+([^.]+)',
-            r'issue[s]?\s+(?:is|are)\s+([^.]+)',
-            r'spending\s+(\d+[^.]+(?:hours?|minutes?)[^.]+)',
-            r'frustrated\s+(?:with|about)\s+([^.]+)',
-            r'difficulty\s+(?:with|in)\s+([^.]+)',
-            r'struggle\s+(?:with|to)\s+([^.]+)',
-        ]
-        
-        for pattern in problem_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                pain_point = match.group(1).strip()
-                if len(pain_point) > 10:  # Filter out too short matches
-                    pain_points.append(pain_point)
-        
-        return pain_points[:5]  # Return top 5
-    
-    def _extract_objectives(self, content: str) -> List[str]:
-        """Extract business objectives from discovery."""
-        objectives = []
-        
-        # Look for objective indicators
-        objective_patterns = [
-            r'(?:want|need|would like)\s+to\s+([^.]+)',
-            r'goal\s+is\s+to\s+([^.]+)',
-            r'objective\s+is\s+to\s+([^.]+)',
-            r'looking\s+to\s+([^.]+)',
-            r'hoping\s+to\s+([^.]+)',
-        ]
+    def _extract_client_name_from_content(self, content: str) -> Optional[str]:
+        """Look for company names in content (basic heuristic)."""
+        # Look for patterns like "I'm from Company" or "at Company"
+        match = self._client_name_pattern.search(content)
+        return match.group(1) if match else None
+    
+    def _match_at_hits(self, patterns: List[tuple], content: str,
+                       hits: KeywordHits, limit: int) -> List[List[str]]:
+        """
+        Run anchored extraction patterns only where their anchor keywords occur.
         
-        for pattern in objective_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                objective = match.group(1).strip()
-                if len(objective) > 10:
-                    objectives.append(objective)
+        Equivalent to `re.finditer` over the whole content for each pattern,
+        keeping captures longer than 10 characters.
         
-        return objectives[:5]  # Return top 5
+        Args:
+            patterns: (anchor keywords, compiled pattern) pairs, in priority order
+            content: Content the hits were found in
+            hits: Keyword hits for the content
+            limit: Maximum number of captures to keep per pattern
+            
+        Returns:
+            Captured phrases per pattern, in document order
+        """
+        captures = []
+        for anchors, compiled in patterns:
+            positions = sorted({pos for anchor in anchors for pos in hits.positions(anchor)})
+            found = []
+            last_end = 0
+            for pos in positions:
+                # finditer never reports a match overlapping the previous one
+                if pos < last_end or len(found) >= limit:
+                    continue
+                match = compiled.match(content, pos)
+                if not match:
+                    continue
+                last_end = max(match.end(), pos + 1)
+                phrase = match.group(1).strip()
+                if len(phrase) > 10:  # Filter out too short matches
+                    found.append(phrase)
+            captures.append(found)
+        return captures
+    
+    def _merge_captures(self, per_document: List[List[List[str]]], limit: int) -> List[str]:
+        """Merge per-document captures in pattern order, then document order."""
+        merged = []
+        pattern_count = max((len(captures) for captures in per_document), default=0)
+        for index in range(pattern_count):
+            for captures in per_document:
+                for phrase in captures[index]:
+                    merged.append(phrase)
+                    if len(merged) >= limit:
+                        return merged
+        return merged
     
-    def _detect_gaps(self, content: str, 
+    def _detect_gaps(self, findings: List[DocumentFindings],
                      additional_context: List[str]) -> List[Gap]:
         """Detect missing critical information."""
         gaps = []
-        content_lower = content.lower()
-        context_lower = " ".join(additional_context).lower()
+        mentioned_keywords = set().union(*(f.keywords for f in findings))
+        mentioned_patterns = set().union(*(f.custom_patterns for f in findings))
+        context = " ".join(additional_context)
+        context_hits = self._matcher.scan(context)
         
-        # Check for critical topics not mentioned
-        gap_checks = [
-            {
-                "keywords": ["refund", "return"],
-                "category": GapCategory.BUSINESS_RULES,
-                "description": "Refund and return handling not discussed",
-                "impact": "Returns could fail to sync or create duplicate credits",
-                "question": "How should refunds and returns be handled? Should they create credit notes or adjustment entries?",
-                "priority": Priority.HIGH
-            },
-            {
-                "keywords": ["tax", "vat", "sales tax"],
-                "category": GapCategory.BUSINESS_RULES,
-                "description": "Tax handling not specified",
-                "impact": "Tax calculations could be incorrect or missing in synced data",
-                "question": "How should taxes be calculated and synced? Which system is responsible for tax calculation?",
-                "priority": Priority.HIGH
-            },
-            {
-                "keywords": ["error", "failure", "retry", "error handling"],
-                "category": GapCategory.ERROR_HANDLING,
-                "description": "Error handling and retry logic not defined",
-                "impact": "Failed syncs could go unnoticed or cause data inconsistencies",
-                "question": "What should happen when a sync fails? Should we retry automatically? How should errors be reported?",
-                "priority": Priority.HIGH
-            },
-            {
-                "keywords": ["sync frequency", "real-time", "interval", "schedule"],
-                "category": GapCategory.TECHNICAL_CONSTRAINTS,
-                "description": "Sync frequency not clearly defined",
-                "impact": "Could build wrong sync mechanism (webhook vs polling)",
-                "question": "How often should data sync? Real-time via webhooks, or scheduled intervals (every 15 min, hourly, daily)?",
-                "priority": Priority.MEDIUM
-            },
-            {
-                "keywords": ["success", "acceptance", "criteria", "metric"],
-                "category": GapCategory.SUCCESS_CRITERIA,
-                "description": "Success criteria not explicitly defined",
-                "impact": "Unclear definition of project completion",
-                "question": "What are the specific success criteria? How will we measure if the integration is working correctly?",
-                "priority": Priority.MEDIUM
-            },
-            {
-                "keywords": ["rate limit", "api limit", "throttle"],
-                "category": GapCategory.TECHNICAL_CONSTRAINTS,
-                "description": "API rate limits not discussed",
-                "impact": "Could hit rate limits and cause sync failures",
-                "question": "What are the API rate limits for each system? Do we need to implement throttling?",
-                "priority": Priority.MEDIUM
-            },
-            {
-                "keywords": ["authentication", "credentials", "api key", "oauth"],
-                "category": GapCategory.TECHNICAL_CONSTRAINTS,
-                "description": "Authentication method not specified",
-                "impact": "Could start with wrong authentication approach",
-                "question": "What authentication method should be used? API keys, OAuth, or something else?",
-                "priority": Priority.MEDIUM
-            },
-            {
-                "keywords": ["edge case", "exception", "special case"],
-                "category": GapCategory.EDGE_CASES,
-                "description": "Edge cases not explored",
-                "impact": "Unexpected scenarios could break the integration",
-                "question": "What edge cases should we handle? (e.g., partial refunds, split payments, cancelled orders)",
-                "priority": Priority.LOW
-            },
-        ]
-        
-        for check in gap_checks:
-            # Check if any keyword is mentioned in content or context
-            mentioned = any(keyword in content_lower for keyword in check["keywords"])
-            addressed_in_context = any(keyword in context_lower for keyword in check["keywords"])
+        for check in self._gap_checks:
+            # Check if any keyword (or the custom pattern) is mentioned in content or context
+            pattern = check.get("pattern")
+            mentioned = (
+                any(keyword.lower() in mentioned_keywords for keyword in check["keywords"])
+                or (pattern is not None and pattern.source in mentioned_patterns)
+            )
+            addressed_in_context = (
+                context_hits.contains_any(check["keywords"])
+                or (pattern is not None and bool(context) and pattern.search(context) is not None)
+            )
             
             if not mentioned and not addressed_in_context:
                 gap = Gap(
@@ -245,119 +760,159 @@ class DiscoveryAnalyzer:
         
         return gaps
     
-    def _detect_ambiguities(self, content: str) -> List[Ambiguity]:
+    def _extract_ambiguity_contexts(self, content: str, hits: KeywordHits) -> Dict[str, str]:
+        """Get the context around the first occurrence of each ambiguous term."""
+        contexts = {}
+        for term in self.AMBIGUOUS_TERMS:
+            positions = hits.bounded_positions(term, content)
+            if not positions:
+                continue
+            
+            # Only the first occurrence is reported; its context window can
+            # start at most 50 characters before it and end 50 after the term
+            first = positions[0]
+            match = self._ambiguity_patterns[term].search(content, max(0, first - 50), first + len(term) + 101)
+            if match:
+                contexts[term] = match.group(1).strip()
+        return contexts
+    
+    def _detect_ambiguities(self, findings: List[DocumentFindings]) -> List[Ambiguity]:
         """Detect ambiguous or vague terms and search for clarifications."""
         ambiguities = []
         
         for term in self.AMBIGUOUS_TERMS:
-            # Find occurrences with context
-            pattern = rf'(.{{0,50}}\b{term}\b.{{0,50}})'
-            matches = re.finditer(pattern, content, re.IGNORECASE)
+            context = next((f.ambiguity_contexts[term] for f in findings
+                            if term in f.ambiguity_contexts), None)
+            if context is None:
+                continue
             
-            for match in matches:
-                context = match.group(1).strip()
-                
-                clarifications_needed = {
-                    "real-time": "Please specify exact sync timing: instant webhooks, sub-second, within 5 minutes?",
-                    "fast": "What is the specific performance requirement? Response time in milliseconds?",
-                    "quick": "What is the specific time requirement?",
-                    "simple": "What does 'simple' mean in this context? What complexity level is acceptable?",
-                    "scalable": "What volume needs to be supported? Current and projected?",
-                    "soon": "What is the specific timeline? Days, weeks, months?",
-                    "approximately": "What is the exact figure or acceptable range?",
-                }
-                
-                clarification_needed = clarifications_needed.get(term.lower(), 
-                                                  f"Please provide specific details instead of '{term}'")
-                
-                # Search for clarification in the content
-                clarification_found = self._search_for_clarification(term, content)
-                
-                ambiguity = Ambiguity(
-                    term=term,
-                    context=context,
-                    clarification_needed=clarification_needed,
-                    priority=Priority.MEDIUM,
-                    clarification=clarification_found
-                )
-                ambiguities.append(ambiguity)
-                break  # Only report each term once
+            clarifications_needed = {
+                "real-time": "Please specify exact sync timing: instant webhooks, sub-second, within 5 minutes?",
+                "fast": "What is the specific performance requirement? Response time in milliseconds?",
+                "quick": "What is the specific time requirement?",
+                "simple": "What does 'simple' mean in this context? What complexity level is acceptable?",
+                "scalable": "What volume needs to be supported? Current and projected?",
+                "soon": "What is the specific timeline? Days, weeks, months?",
+                "approximately": "What is the exact figure or acceptable range?",
+            }
+            
+            clarification_needed = clarifications_needed.get(term.lower(), 
+                                              f"Please provide specific details instead of '{term}'")
+            
+            # Search for clarification in the documents
+            clarification_found = self._search_for_clarification(term, findings)
+            
+            ambiguity = Ambiguity(
+                term=term,
+                context=context,
+                clarification_needed=clarification_needed,
+                priority=Priority.MEDIUM,
+                clarification=clarification_found
+            )
+            ambiguities.append(ambiguity)  # Only report each term once
         
         return ambiguities
     
-    def _search_for_clarification(self, term: str, content: str) -> str:
+    def _extract_clarifications(self, content: str, hits: KeywordHits) -> Dict[str, List[Optional[str]]]:
         """
-        Search for clarification of an ambiguous term in documents.
-        Only returns clarification if explicitly stated, never infers.
+        Find the first match of every clarification pattern in one document.
         
         Args:
-            term: The ambiguous term to clarify
-            content: All document content to search
+            content: Document content to search
+            hits: Keyword hits for the content
             
         Returns:
-            Clarification text if found, None otherwise
+            Term -> context around the first match of each of its patterns (or None)
         """
-        # Look for clarification patterns near the term
-        # Pattern: term followed by specific details
-        clarification_patterns = {
-            "real-time": [
-                rf'{term}.{{0,100}}(?:within|under|less than)\s+(\d+\s*(?:seconds?|minutes?|milliseconds?))',
-                rf'{term}.{{0,100}}(?:webhook|instant|immediately)',
-            ],
-            "fast": [
-                rf'{term}.{{0,100}}(?:within|under|less than)\s+(\d+\s*(?:seconds?|minutes?|milliseconds?))',
-                rf'{term}.{{0,100}}(?:response time|load time|performance).{{0,50}}(\d+\s*(?:ms|seconds?))',
-            ],
-            "scalable": [
-                rf'{term}.{{0,100}}(?:up to|support|handle)\s+([\d,]+)\s*(?:orders?|users?|transactions?|requests?)',
-            ],
-            "soon": [
-                rf'{term}.{{0,100}}(?:within|in|by)\s+(\d+\s*(?:days?|weeks?|months?))',
-            ],
-        }
-        
-        patterns = clarification_patterns.get(term.lower(), [])
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-            if match:
+        clarifications = {}
+        for term, patterns in self._clarification_patterns.items():
+            positions = hits.positions(term)
+            if not positions:
+                continue
+            
+            contexts = []
+            for compiled in patterns:
+                # Every match starts with the term, so only try where it occurs
+                match = None
+                for pos in positions:
+                    match = compiled.match(content, pos)
+                    if match:
+                        break
+                if not match:
+                    contexts.append(None)
+                    continue
+                
                 # Extract the surrounding context (200 chars) that contains the clarification
                 match_pos = match.start()
                 start = max(0, match_pos - 100)
                 end = min(len(content), match_pos + 200)
                 clarification_context = content[start:end].strip()
                 
-                # Clean up and return
-                clarification_context = " ".join(clarification_context.split())
-                if len(clarification_context) > 20:  # Only return if substantial
-                    return clarification_context
+                # Clean up
+                contexts.append(" ".join(clarification_context.split()))
+            clarifications[term] = contexts
+        return clarifications
+    
+    def _search_for_clarification(self, term: str, findings: List[DocumentFindings]) -> str:
+        """
+        Search for clarification of an ambiguous term in documents.
+        Only returns clarification if explicitly stated, never infers.
+        
+        Args:
+            term: The ambiguous term to clarify
+            findings: Per-document findings to search
+            
+        Returns:
+            Clarification text if found, None otherwise
+        """
+        patterns = self.CLARIFICATION_PATTERNS.get(term.lower(), [])
+        for index in range(len(patterns)):
+            # The first document with a match for this pattern wins
+            clarification_context = next(
+                (f.clarifications[term][index] for f in findings
+                 if term in f.clarifications and f.clarifications[term][index] is not None),
+                None
+            )
+            if clarification_context and len(clarification_context) > 20:  # Only return if substantial
+                return clarification_context
         
         return None
     
-    def _detect_conflicts(self, documents: List[Document]) -> List[Conflict]:
+    def _extract_inventory_statements(self, prepared: PreparedText, hits: KeywordHits) -> List[str]:
+        """Extract sentences naming a source of truth for inventory."""
+        statements = []
+        if hits.contains_any(self.INVENTORY_TERMS):
+            # Look for source of truth statements
+            if hits.contains_any(self.SOURCE_OF_TRUTH_TERMS):
+                # Extract the sentences mentioning both inventory and its source
+                sentences = prepared.sentences
+                
+                def sentence_indexes(terms):
+                    return {sentences.index_of(pos)
+                            for term in terms for pos in hits.positions(term)}
+                
+                matching = sentence_indexes(self.INVENTORY_TERMS) & sentence_indexes(self.SOURCE_TERMS)
+                statements = [sentences.sentence(index).strip() for index in sorted(matching)]
+        return statements
+    
+    def _detect_conflicts(self, documents: List[Document],
+                          findings: List[DocumentFindings]) -> List[Conflict]:
         """Detect conflicting information between documents/stakeholders and search for resolutions."""
         conflicts = []
         
         # Look for conflicting statements about system of record
         inventory_mentions = []
-        for doc in documents:
-            content_lower = doc.content.lower()
-            if "inventory" in content_lower or "stock" in content_lower:
-                # Look for source of truth statements
-                if "source of truth" in content_lower or "master" in content_lower:
-                    # Extract the sentence
-                    sentences = doc.content.split(".")
-                    for sentence in sentences:
-                        if "inventory" in sentence.lower() or "stock" in sentence.lower():
-                            if "source" in sentence.lower() or "master" in sentence.lower():
-                                inventory_mentions.append({
-                                    "statement": sentence.strip(),
-                                    "source": doc.file_path,
-                                    "doc": doc
-                                })
+        for doc, doc_findings in zip(documents, findings):
+            for statement in doc_findings.inventory_statements:
+                inventory_mentions.append({
+                    "statement": statement,
+                    "source": doc.file_path,
+                    "doc": doc
+                })
         
         if len(inventory_mentions) > 1:
             # Search for resolution
-            resolution = self._search_for_resolution("inventory system of record", documents)
+            resolution = self._search_for_resolution("inventory system of record", documents, findings)
             
             conflict = Conflict(
                 topic="Inventory System of Record",
@@ -371,7 +926,8 @@ class DiscoveryAnalyzer:
         
         return conflicts
     
-    def _search_for_resolution(self, conflict_topic: str, documents: List[Document]) -> str:
+    def _search_for_resolution(self, conflict_topic: str, documents: List[Document],
+                               findings: List[DocumentFindings]) -> str:
         """
         Search for resolution of a conflict in documents.
         Only returns resolution if explicitly stated, never infers.
@@ -379,53 +935,205 @@ class DiscoveryAnalyzer:
         Args:
             conflict_topic: The topic of the conflict
             documents: List of documents to search
+            findings: Per-document findings, where resolution candidates are memoized
             
         Returns:
             Resolution text if found, None otherwise
         """
-        # Look for resolution patterns
-        resolution_keywords = [
-            "decided", "decision", "agreed", "final decision", "conclusion",
-            "resolved", "settled on", "confirmed", "ultimately", "clarification"
-        ]
+        pairs = list(zip(documents, findings))
         
-        all_content = "\n\n".join([doc.content for doc in documents])
+        # Resolution statements, in keyword priority order, then document order
+        for index in range(len(self.RESOLUTION_KEYWORDS)):
+            for doc, doc_findings in pairs:
+                context = self._resolution_candidate(conflict_topic, index, doc, doc_findings)
+                if context is not None:
+                    return context
         
-        # Search for resolution statements related to the conflict topic
-        for keyword in resolution_keywords:
-            # Look for sentences containing both the keyword and topic-related terms
-            pattern = rf'([^.]*{keyword}[^.]*{conflict_topic.split()[0]}[^.]*\.)'
-            matches = re.finditer(pattern, all_content, re.IGNORECASE | re.DOTALL)
+        # Then "we will use X" or "X will be" statements
+        for index in range(len(self.RESOLUTION_KEYWORDS),
+                           len(self.RESOLUTION_KEYWORDS) + len(self.DECISION_PATTERNS)):
+            context = None
+            for doc, doc_findings in pairs:
+                context = self._resolution_candidate(conflict_topic, index, doc, doc_findings)
+                if context is not None:
+                    break
+            if context is not None and len(context) > 30:
+                return context
+        
+        return None
+    
+    def _resolution_candidate(self, conflict_topic: str, index: int, doc: Document,
+                              doc_findings: DocumentFindings) -> Optional[str]:
+        """Get one resolution candidate for a document, computing it at most once."""
+        candidates = doc_findings.resolutions.get(conflict_topic)
+        if candidates is not None and index in candidates:
+            return candidates[index]
+        
+        # Large local files are searched as bytes instead of being loaded
+        mapped = map_document(doc, self.mapped_scan_min_bytes)
+        try:
+            if candidates is None:
+                # All resolution keywords are answered from one pass over the document
+                if mapped is not None:
+                    candidates = self._mapped_resolutions(conflict_topic, mapped)
+                else:
+                    candidates = self._extract_resolutions(conflict_topic, prepared_texts.get(doc))
+                doc_findings.resolutions[conflict_topic] = candidates
+            if index not in candidates:
+                content = mapped if mapped is not None else doc.content
+                candidates[index] = self._extract_decision(conflict_topic, index, content)
+        except StaleContentError as e:
+            # Changed since its findings were taken; not memoized, so it is retried
+            print(f"Warning: Skipping {doc.file_path}: {e}")
+            return None
+        finally:
+            if mapped is not None:
+                mapped.close()
+        return candidates[index]
+    
+    def _extract_resolutions(self, conflict_topic: str, prepared: PreparedText) -> Dict[int, Optional[str]]:
+        """
+        Find a resolution statement for a conflict topic for every resolution keyword.
+        
+        A statement is a period-terminated sentence in which the keyword is
+        followed by the topic word (the same sentences `[^.]*keyword[^.]*topic[^.]*\\.`
+        matches). Sentences and keyword offsets are found in a single linear
+        pass, so long text without periods cannot cause backtracking.
+        
+        Args:
+            conflict_topic: The topic of the conflict
+            prepared: Prepared document content to search
             
-            for match in matches:
-                resolution_text = match.group(1).strip()
+        Returns:
+            Index into RESOLUTION_KEYWORDS -> context of the first substantial
+            statement for that keyword, or None
+        """
+        topic_word = conflict_topic.split()[0].lower()
+        candidates: Dict[int, Optional[str]] = {
+            index: None for index in range(len(self.RESOLUTION_KEYWORDS))
+        }
+        
+        content = prepared.text
+        hits = compile_keywords(tuple(self.RESOLUTION_KEYWORDS) + (topic_word,)).scan(content, prepared.lower)
+        topic_positions = hits.positions(topic_word)
+        if not topic_positions:
+            return candidates
+        
+        sentences = prepared.sentences
+        # The last place each sentence mentions the topic
+        last_topic = {}
+        for pos in topic_positions:
+            last_topic[sentences.index_of(pos)] = pos
+        
+        for index, keyword in enumerate(self.RESOLUTION_KEYWORDS):
+            checked = set()
+            for pos in hits.positions(keyword):
+                sentence = sentences.index_of(pos)
+                # Only the earliest keyword occurrence in a sentence matters
+                if sentence in checked:
+                    continue
+                checked.add(sentence)
+                if not sentences.is_terminated(sentence):
+                    continue
+                if last_topic.get(sentence, -1) < pos + len(keyword):
+                    continue
+                
+                resolution_text = sentences.sentence(sentence, with_period=True).strip()
                 # Ensure it's substantial (not just a passing mention)
                 if len(resolution_text) > 30:
                     # Extract surrounding context for better clarity
-                    match_pos = match.start()
+                    match_pos, _ = sentences.span(sentence)
                     start = max(0, match_pos - 50)
-                    end = min(len(all_content), match_pos + 300)
-                    context = all_content[start:end].strip()
-                    context = " ".join(context.split())
-                    return context
+                    end = min(len(content), match_pos + 300)
+                    context = content[start:end].strip()
+                    candidates[index] = " ".join(context.split())
+                    break
+        return candidates
+    
+    def _mapped_resolutions(self, conflict_topic: str, mapped: MappedText) -> Dict[int, Optional[str]]:
+        """
+        Find resolution statements like `_extract_resolutions`, in a memory-mapped body.
         
-        # Also look for "we will use X" or "X will be" statements
-        decision_patterns = [
-            rf'(?:we will use|using|use)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)\s+(?:as|for).{{0,50}}{conflict_topic.split()[0]}',
-            rf'{conflict_topic.split()[0]}.{{0,30}}(?:will be|is)\s+([A-Z][a-zA-Z]+)',
-        ]
+        Keyword hits are walked in order and each sentence is settled once
+        the scan moves past it, so only the sentences that qualify are decoded.
         
-        for pattern in decision_patterns:
-            match = re.search(pattern, all_content, re.IGNORECASE)
-            if match:
-                # Extract context around the match
-                match_pos = match.start()
-                start = max(0, match_pos - 50)
-                end = min(len(all_content), match_pos + 200)
-                context = all_content[start:end].strip()
-                context = " ".join(context.split())
-                if len(context) > 30:
-                    return context
+        Args:
+            conflict_topic: The topic of the conflict
+            mapped: Document body to search
+            
+        Returns:
+            Index into RESOLUTION_KEYWORDS -> context of the first substantial
+            statement for that keyword, or None
+        """
+        topic_word = conflict_topic.split()[0].lower()
+        candidates: Dict[int, Optional[str]] = {
+            index: None for index in range(len(self.RESOLUTION_KEYWORDS))
+        }
+        settled = set()
+        
+        def settle(sentence: Tuple[int, int], firsts: Dict[str, int], last_topic: int):
+            start, end = sentence
+            if end >= len(mapped):
+                return  # Not terminated by a period
+            for index, keyword in enumerate(self.RESOLUTION_KEYWORDS):
+                pos = firsts.get(keyword)
+                if index in settled or pos is None or last_topic < pos + len(keyword):
+                    continue
+                # The sentence ends with its period, so only leading whitespace is stripped
+                resolution_text = mapped.text(start, min(end + 1, start + MATCH_WINDOW_BYTES))
+                if len(resolution_text.lstrip()) <= 30 and start + MATCH_WINDOW_BYTES < end + 1:
+                    resolution_text = mapped.text(start, end + 1)
+                # Ensure it's substantial (not just a passing mention)
+                if len(resolution_text.lstrip()) > 30:
+                    text, match_pos = mapped.window(start, 50 * MAX_CHAR_BYTES, 300 * MAX_CHAR_BYTES)
+                    context = text[max(0, match_pos - 50):match_pos + 300].strip()
+                    candidates[index] = " ".join(context.split())
+                    settled.add(index)
         
+        matcher = compile_keywords(tuple(self.RESOLUTION_KEYWORDS) + (topic_word,))
+        sentences = SentenceCursor(mapped)
+        sentence, firsts, last_topic = None, {}, -1
+        for pos, keyword in self._scan_mapped(mapped, matcher):
+            current = sentences.locate(pos)
+            if current != sentence:
+                if sentence is not None:
+                    settle(sentence, firsts, last_topic)
+                sentence, firsts, last_topic = current, {}, -1
+            # Only the earliest keyword occurrence in a sentence matters
+            firsts.setdefault(keyword, pos)
+            if keyword == topic_word:
+                last_topic = pos
+        if sentence is not None:
+            settle(sentence, firsts, last_topic)
+        return candidates
+    
+    def _extract_decision(self, conflict_topic: str, index: int,
+                          content: Union[str, MappedText]) -> Optional[str]:
+        """
+        Find an explicit decision for a conflict topic in one document.
+        
+        Args:
+            conflict_topic: The topic of the conflict
+            index: Index into RESOLUTION_KEYWORDS, continuing into DECISION_PATTERNS
+            content: Document content to search, or its memory-mapped body
+            
+        Returns:
+            Context of the first match for the decision pattern, or None
+        """
+        topic_word = conflict_topic.split()[0]
+        
+        # Look for "we will use X" or "X will be" statements
+        pattern = self._decision_pattern(index - len(self.RESOLUTION_KEYWORDS), topic_word)
+        if isinstance(content, MappedText):
+            # The match and its context come from the chunk it was found in
+            content, match = content.search(pattern) or ("", None)
+        else:
+            match = pattern.search(content)
+        if match:
+            # Extract context around the match
+            match_pos = match.start()
+            start = max(0, match_pos - 50)
+            end = min(len(content), match_pos + 200)
+            context = content[start:end].strip()
+            return " ".join(context.split())
         return None
-
@@ -0,0 +1,260 @@
+"""Parallel discovery analysis across projects."""
+
+import hashlib
+import os
+import pickle
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+from models.analysis import AnalysisResult
+from models.document import ContentRef, Document, DocumentType
+from models.project_state import ProjectConfig, ProjectState
+from .analysis_cache import DocumentFindings
+from .analyzer import DiscoveryAnalyzer
+
+
+@dataclass
+class BatchOutcome:
+    """Result of analyzing one project in a batch."""
+
+    project_id: str
+    analysis: Optional[AnalysisResult] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    # project_fingerprint of the inputs the analysis was computed from
+    fingerprint: Optional[str] = None
+
+
+def project_fingerprint(project: ProjectState) -> str:
+    """
+    Digest of everything a project's analysis depends on.
+
+    Compared before a batch result is applied, so an analysis computed
+    from documents that have since changed is not stored over them.
+    """
+    digest = hashlib.sha256()
+    for doc in project.documents:
+        try:
+            fingerprint = doc.fingerprint
+        except (OSError, ValueError):
+            fingerprint = None
+        digest.update(repr((doc.file_path, fingerprint, doc.summary)).encode("utf-8", "surrogatepass"))
+    digest.update(repr((project.additional_context, project.config.custom_gap_patterns)).encode(
+        "utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def serialize_project(project: ProjectState,
+                      findings: Optional[Dict[Hashable, DocumentFindings]] = None) -> bytes:
+    """
+    Pack the inputs of a project's analysis into a compact payload.
+
+    Only the fields the analyzer reads are shipped, as plain tuples,
+    pickled and compressed. Bodies that are not loaded and live in local
+    files are shipped as their ContentRef and read by the worker.
+
+    Args:
+        project: Project to analyze
+        findings: Memoized per-document findings to seed the worker's cache with
+
+    Returns:
+        Compressed payload for `analyze_payload`
+    """
+    documents = []
+    for doc in project.documents:
+        ref = doc.content_ref
+        if ref is not None and ref.path and not doc.content_loaded:
+            content, ref_data = None, ref.to_dict()
+        else:
+            content, ref_data = doc.content, None
+        documents.append(
+            (doc.file_path, content, ref_data, doc.doc_type.value, doc.participants, doc.summary, doc.source)
+        )
+    data = (documents, project.additional_context, project.config.custom_gap_patterns, findings or {})
+    return zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def deserialize_project(
+    payload: bytes
+) -> Tuple[List[Document], List[str], ProjectConfig, Dict[Hashable, DocumentFindings]]:
+    """Unpack a payload created by `serialize_project`."""
+    documents, additional_context, custom_gap_patterns, findings = pickle.loads(zlib.decompress(payload))
+    return (
+        [
+            Document(file_path=file_path, content=content, doc_type=DocumentType(doc_type),
+                     participants=participants, summary=summary, source=source,
+                     content_ref=ContentRef.from_dict(ref_data) if ref_data else None)
+            for file_path, content, ref_data, doc_type, participants, summary, source in documents
+        ],
+        additional_context,
+        ProjectConfig(custom_gap_patterns=custom_gap_patterns),
+        findings,
+    )
+
+
+def analyze_payload(payload: bytes) -> bytes:
+    """
+    Analyze one serialized project (runs in a worker process).
+
+    The shipped findings are memoized first, so only documents the parent
+    has not analyzed before are scanned.
+
+    Args:
+        payload: Payload created by `serialize_project`
+
+    Returns:
+        Compressed, pickled (AnalysisResult, findings computed here by cache key)
+    """
+    documents, additional_context, project_config, findings = deserialize_project(payload)
+    analyzer = DiscoveryAnalyzer(project_config)
+    analyzer.add_findings(findings)
+    analysis = analyzer.analyze(documents, additional_context)
+    computed = {
+        key: value for key, value in analyzer.cached_findings(documents, additional_context).items()
+        if key not in findings
+    }
+    return zlib.compress(pickle.dumps((analysis, computed), protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+class BatchAnalyzer:
+    """
+    Analyzes many projects in parallel worker processes.
+
+    Analysis is CPU-bound regex work, so projects are fanned out to a
+    process pool rather than threads. At most `max_workers` projects are in
+    flight at a time, which keeps payload memory bounded and lets the
+    timeout be measured from when a project actually starts. Outcomes are
+    yielded as each project finishes.
+
+    Worker processes only live for one batch, so the findings cache is
+    kept in this process: each payload carries the cached findings of its
+    documents, and the findings a worker computes are memoized here when
+    its project finishes. Repeated batches only scan changed documents.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize batch analyzer.
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+            timeout: Seconds a single project may take before it is abandoned
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.timeout = timeout
+
+    def analyze(self, projects: List[ProjectState]) -> Iterator[BatchOutcome]:
+        """
+        Analyze projects, yielding each outcome as soon as it is ready.
+
+        Args:
+            projects: Projects to analyze (must have documents loaded)
+
+        Yields:
+            BatchOutcome per project, in completion order
+        """
+        if not projects:
+            return
+        if self.max_workers == 1 or len(projects) == 1:
+            yield from self._analyze_serial(projects)
+            return
+
+        workers = min(self.max_workers, len(projects))
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError) as e:
+            # No multiprocessing support (e.g. restricted sandboxes)
+            print(f"Warning: Process pool unavailable, analyzing serially: {e}")
+            yield from self._analyze_serial(projects)
+            return
+
+        pending = list(reversed(projects))
+        in_flight: Dict[Future, Tuple[ProjectState, float, str]] = {}
+
+        def fill():
+            while pending and len(in_flight) < workers:
+                project = pending.pop()
+                # Taken before the payload, so a change made meanwhile shows as stale
+                fingerprint = project_fingerprint(project)
+                findings = DiscoveryAnalyzer(project.config).cached_findings(
+                    project.documents, project.additional_context
+                )
+                future = executor.submit(analyze_payload, serialize_project(project, findings))
+                in_flight[future] = (project, time.monotonic(), fingerprint)
+
+        try:
+            fill()
+            while in_flight:
+                wait_for = None
+                if self.timeout is not None:
+                    oldest = min(started for _, started, _ in in_flight.values())
+                    wait_for = max(0.0, oldest + self.timeout - time.monotonic())
+                done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                now = time.monotonic()
+                for future in done:
+                    project, started, fingerprint = in_flight.pop(future)
+                    yield self._outcome(project.project_id, future, now - started, fingerprint)
+
+                expired = [
+                    future for future, (_, started, _) in in_flight.items()
+                    if self.timeout is not None and now - started >= self.timeout
+                ]
+                if expired:
+                    for future in expired:
+                        project, started, _ = in_flight.pop(future)
+                        yield BatchOutcome(
+                            project_id=project.project_id,
+                            error=f"Analysis timed out after {self.timeout:g}s",
+                            duration=now - started
+                        )
+                    # A running task cannot be cancelled, so replace the pool
+                    # and restart the projects that were still running
+                    pending.extend(project for project, _, _ in in_flight.values())
+                    in_flight.clear()
+                    self._terminate(executor)
+                    executor = ProcessPoolExecutor(max_workers=workers)
+
+                fill()
+        finally:
+            if in_flight:
+                self._terminate(executor)
+            else:
+                executor.shutdown(wait=True)
+
+    def _terminate(self, executor: ProcessPoolExecutor):
+        """Stop a pool without waiting for its running tasks."""
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _outcome(self, project_id: str, future: Future, duration: float, fingerprint: str) -> BatchOutcome:
+        """Convert a finished future into an outcome, memoizing the findings it computed."""
+        try:
+            analysis, findings = pickle.loads(zlib.decompress(future.result()))
+            DiscoveryAnalyzer.add_findings(findings)
+            return BatchOutcome(project_id=project_id, analysis=analysis, duration=duration,
+                                fingerprint=fingerprint)
+        except Exception as e:
+            return BatchOutcome(project_id=project_id, error=f"Error analyzing project: {str(e)}",
+                                duration=duration)
+
+    def _analyze_serial(self, projects: List[ProjectState]) -> Iterator[BatchOutcome]:
+        """Analyze projects one by one in this process."""
+        for project in projects:
+            started = time.monotonic()
+            try:
+                fingerprint = project_fingerprint(project)
+                analysis = DiscoveryAnalyzer(project.config).analyze(
+                    project.documents, project.additional_context
+                )
+                yield BatchOutcome(project_id=project.project_id, analysis=analysis,
+                                   duration=time.monotonic() - started, fingerprint=fingerprint)
+            except Exception as e:
+                yield BatchOutcome(project_id=project.project_id,
+                                   error=f"Error analyzing project: {str(e)}",
+                                   duration=time.monotonic() - started)
@@ -0,0 +1,225 @@
+"""Watch project folders and report debounced batches of changed files."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import watchfiles
+except ImportError:  # Optional: folders are polled without it
+    watchfiles = None
+
+# Kinds of change reported per file
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+def _merge(pending: Dict[Path, str], path: Path, kind: str):
+    """Fold a change into a batch; a file added in the batch stays added."""
+    if pending.get(path) == ADDED and kind == MODIFIED:
+        return
+    pending[path] = kind
+
+
+class FolderWatcher:
+    """
+    Watches the folders of a set of projects from a background thread.
+
+    Changes are collected until the folders have been quiet for the debounce
+    interval, then passed to `on_changes` once per project, as file path ->
+    "added" / "modified" / "deleted". Uses native notifications (inotify on
+    Linux) through the optional `watchfiles` package, and otherwise polls
+    the folders, comparing file sizes and mtimes.
+
+    The watched folders are re-read from `folders` every `poll_interval`
+    seconds, so projects and folders that appear later are picked up.
+    """
+
+    def __init__(
+        self,
+        folders: Callable[[], Dict[str, List[Path]]],
+        on_changes: Callable[[str, Dict[Path, str]], None],
+        suffix: str = ".txt",
+        debounce_ms: int = 1000,
+        poll_interval: float = 2.0,
+        force_polling: bool = False
+    ):
+        """
+        Initialize watcher (call `start` to begin watching).
+
+        Args:
+            folders: Returns the folders to watch, by project ID
+            on_changes: Called with a project ID and its changed files
+            suffix: Only files whose name ends with this are reported
+            debounce_ms: Quiet time after the last change before a batch is reported
+            poll_interval: Seconds between polls, and between re-reads of `folders`
+            force_polling: Poll even if native notifications are available
+        """
+        self._folders = folders
+        self._on_changes = on_changes
+        self.suffix = suffix
+        self.debounce_ms = debounce_ms
+        self.poll_interval = poll_interval
+        self.backend = "polling" if force_polling or watchfiles is None else "native"
+        self._watched: Dict[Path, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.files = 0
+        self.errors = 0
+        self.last_batch_at: Optional[float] = None
+
+    def start(self):
+        """Start watching in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop watching and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.backend == "native":
+                    self._watch_native()
+                else:
+                    self._watch_polling()
+            except Exception as e:
+                # e.g. a watched folder removed while the watch was starting
+                self.errors += 1
+                print(f"Warning: Folder watcher error: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def _refresh(self) -> Dict[Path, str]:
+        """Re-read the folders to watch, as folder -> project ID."""
+        try:
+            watched = {
+                Path(folder): project_id
+                for project_id, folders in self._folders().items()
+                for folder in folders
+            }
+        except Exception as e:
+            self.errors += 1
+            print(f"Warning: Could not list folders to watch: {e}")
+            return self._watched
+        self._watched = watched
+        return watched
+
+    def _project_of(self, path: Path) -> Optional[str]:
+        """Get the project a changed file belongs to (innermost watched folder)."""
+        for parent in path.parents:
+            project_id = self._watched.get(parent)
+            if project_id is not None:
+                return project_id
+        return None
+
+    def _watch_native(self):
+        """Watch with OS notifications until the set of folders changes."""
+        watched = self._refresh()
+        if not watched:
+            self._stop.wait(self.poll_interval)
+            return
+        changes_iter = watchfiles.watch(
+            *watched,
+            watch_filter=lambda change, path: path.endswith(self.suffix),
+            # A batch ends after `step` ms without changes; a continuous burst is cut at `debounce`
+            debounce=max(self.debounce_ms, 1) * 4,
+            step=max(self.debounce_ms, 1),
+            stop_event=self._stop,
+            rust_timeout=int(self.poll_interval * 1000),
+            yield_on_timeout=True,
+            raise_interrupt=False
+        )
+        for changes in changes_iter:
+            if changes:
+                pending: Dict[Path, str] = {}
+                for change, path in changes:
+                    # Change names are "added", "modified" and "deleted"
+                    _merge(pending, Path(path), change.name)
+                self._dispatch(pending)
+            if self._refresh().keys() != watched.keys():
+                return
+
+    def _watch_polling(self):
+        """Poll the folders until stopped."""
+        snapshot = self._scan(self._refresh())
+        pending: Dict[Path, str] = {}
+        while not self._stop.wait(self.debounce_ms / 1000 if pending else self.poll_interval):
+            current = self._scan(self._refresh())
+            found = False
+            # Folders that just started being watched only seed the snapshot
+            for folder in snapshot.keys() & current.keys():
+                before, after = snapshot[folder], current[folder]
+                for path, info in after.items():
+                    previous = before.get(path)
+                    if previous is None:
+                        _merge(pending, path, ADDED)
+                        found = True
+                    elif previous != info:
+                        _merge(pending, path, MODIFIED)
+                        found = True
+                for path in before.keys() - after.keys():
+                    _merge(pending, path, DELETED)
+                    found = True
+            snapshot = current
+            # Report once a check finds nothing new
+            if pending and not found:
+                self._dispatch(pending)
+                pending = {}
+
+    def _scan(self, watched: Dict[Path, str]) -> Dict[Path, Dict[Path, Tuple[int, int]]]:
+        """Get size and mtime of every matching file, by watched folder."""
+        snapshot: Dict[Path, Dict[Path, Tuple[int, int]]] = {}
+        for folder in watched:
+            files = snapshot[folder] = {}
+            for root, _, names in os.walk(folder):
+                for name in names:
+                    if not name.endswith(self.suffix):
+                        continue
+                    path = Path(root) / name
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    files[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _dispatch(self, pending: Dict[Path, str]):
+        """Report a batch of changes, grouped by project."""
+        by_project: Dict[str, Dict[Path, str]] = {}
+        for path, kind in pending.items():
+            project_id = self._project_of(path)
+            if project_id is not None:
+                by_project.setdefault(project_id, {})[path] = kind
+        for project_id, changes in by_project.items():
+            try:
+                self._on_changes(project_id, changes)
+            except Exception as e:
+                self.errors += 1
+                print(f"Warning: Could not apply file changes to {project_id}: {e}")
+            self.files += len(changes)
+        if by_project:
+            self.batches += 1
+            self.last_batch_at = time.time()
+
+    def stats(self) -> Dict:
+        """Get watcher state and counters."""
+        return {
+            "backend": self.backend,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "folders": len(self._watched),
+            "batches": self.batches,
+            "files": self.files,
+            "errors": self.errors,
+            "last_batch_at": self.last_batch_at,
+        }
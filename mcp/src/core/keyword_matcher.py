@@ -0,0 +1,193 @@
+"""Single-pass multi-keyword matching for discovery analysis."""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+
+# Marks a trie node where a complete keyword ends
+_END = ""
+
+
+def is_word_boundary(text: str, index: int) -> bool:
+    """Return True if `index` sits on a word boundary, using `re`'s `\\b` rules."""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+    after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+    return before != after
+
+
+class KeywordHits:
+    """Keyword occurrences found in one pass over a text, grouped by keyword."""
+
+    def __init__(self, positions: Dict[str, List[int]]):
+        """
+        Initialize hits.
+
+        Args:
+            positions: Lowercased keyword -> ascending start offsets
+        """
+        self._positions = positions
+
+    def positions(self, keyword: str) -> List[int]:
+        """Get start offsets of every occurrence of a keyword."""
+        return self._positions.get(keyword.lower(), [])
+
+    def contains(self, keyword: str) -> bool:
+        """Check whether a keyword occurs anywhere in the text."""
+        return bool(self.positions(keyword))
+
+    def contains_any(self, keywords: Iterable[str]) -> bool:
+        """Check whether any of the keywords occurs in the text."""
+        return any(self.contains(keyword) for keyword in keywords)
+
+    def keywords(self) -> FrozenSet[str]:
+        """Get the set of keywords that occur at least once."""
+        return frozenset(k for k, positions in self._positions.items() if positions)
+
+    def shifted(self, offset: int) -> "KeywordHits":
+        """Get hits relative to `offset`, dropping those that start before it."""
+        return KeywordHits({
+            keyword: [pos - offset for pos in positions if pos >= offset]
+            for keyword, positions in self._positions.items()
+        })
+
+    def bounded_positions(self, keyword: str, text: str) -> List[int]:
+        """Get offsets of occurrences delimited by word boundaries (like `\\bkeyword\\b`)."""
+        length = len(keyword)
+        return [
+            pos for pos in self.positions(keyword)
+            if is_word_boundary(text, pos) and is_word_boundary(text, pos + length)
+        ]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick style matcher for a fixed keyword vocabulary.
+
+    Keywords are compiled once into a trie, which is rendered as a single
+    regular expression inside a lookahead. Scanning lowercases the text once
+    and walks it once in the regex engine, reporting every occurrence of
+    every keyword with its offset, including overlapping ones. Matching is
+    case-insensitive.
+
+    UTF-8 bytes (e.g. a memory-mapped file) can be scanned directly with
+    `scan_bytes`, which folds ASCII case only.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile the keyword vocabulary.
+
+        Args:
+            keywords: Keywords to match (case-insensitive, duplicates ignored)
+        """
+        self.keywords: Tuple[str, ...] = tuple(sorted({k.lower() for k in keywords if k}))
+
+        trie: Dict = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[_END] = True
+
+        # The trie regex reports the longest keyword starting at each offset;
+        # shorter keywords that are prefixes of it start at the same offset.
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [other for other in self.keywords
+                      if other != keyword and keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+        self._pattern = None
+        self._folding_pattern = None
+        self._bytes_pattern = None
+        self._encoded = {keyword.encode("utf-8", "surrogatepass"): keyword for keyword in self.keywords}
+        # Longest keyword in bytes, i.e. how far past a chunk a match can reach
+        self.max_bytes = max((len(encoded) for encoded in self._encoded), default=0)
+        if trie:
+            source = f"(?=({self._render(trie)}))"
+            # Case-sensitive matching over lowercased text lets the regex
+            # engine skip ahead on first characters; the folding variant is
+            # only needed when lowercasing changes the text length.
+            self._pattern = re.compile(source)
+            self._folding_pattern = re.compile(source, re.IGNORECASE)
+            self._bytes_pattern = re.compile(source.encode("utf-8", "surrogatepass"))
+
+    def _render(self, node: Dict) -> str:
+        """Render a trie node as a regex fragment."""
+        branches = [
+            re.escape(char) + self._render(child)
+            for char, child in sorted(node.items()) if char != _END
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if _END in node:
+            return f"(?:{body})?"
+        return body
+
+    def scan(self, text: str, lowered: Optional[str] = None) -> KeywordHits:
+        """
+        Find all keyword occurrences in a single pass.
+
+        Args:
+            text: Text to scan
+            lowered: `text.lower()`, if already computed
+
+        Returns:
+            KeywordHits with the offsets of every occurrence
+        """
+        positions: Dict[str, List[int]] = defaultdict(list)
+        if self._pattern is None or not text:
+            return KeywordHits({})
+
+        if lowered is None:
+            lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self._pattern.finditer(lowered)
+        else:
+            matches = self._folding_pattern.finditer(text)
+
+        for match in matches:
+            start = match.start()
+            keyword = match.group(1).lower()
+            positions[keyword].append(start)
+            for prefix in self._prefixes.get(keyword, ()):
+                positions[prefix].append(start)
+
+        return KeywordHits(dict(positions))
+
+    def scan_bytes(self, data: bytes, limit: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Find keyword occurrences in UTF-8 encoded bytes, in offset order.
+
+        Only ASCII letters are case-folded; other characters match as given
+        in the vocabulary.
+
+        Args:
+            data: Bytes to scan
+            limit: Only report occurrences starting before this offset
+                (the bytes after it let keywords starting before it match whole)
+
+        Yields:
+            (byte offset, lowercased keyword), with shorter keywords that are
+            prefixes of a match reported at the same offset
+        """
+        if self._bytes_pattern is None:
+            return
+        limit = len(data) if limit is None else limit
+        # bytes.lower() only changes ASCII letters, so offsets are unchanged
+        for match in self._bytes_pattern.finditer(data.lower()):
+            start = match.start()
+            if start >= limit:
+                break
+            keyword = self._encoded[match.group(1)]
+            yield start, keyword
+            for prefix in self._prefixes.get(keyword, ()):
+                yield start, prefix
+
+
+@lru_cache(maxsize=32)
+def compile_keywords(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Get a compiled matcher for a vocabulary, reusing it across analyzers."""
+    return KeywordMatcher(keywords)
@@ -0,0 +1,367 @@
+"""Memory-mapped access to large local documents, scanned as bytes and decoded in windows."""
+
+import codecs
+import mmap
+import os
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple
+
+from models.document import ContentRef, Document
+
+# Bytes scanned (and, for searches, decoded) per step; a multiple of the page size
+CHUNK_BYTES = 1024 * 1024
+
+# Context decoded on both sides of a search chunk, so matches near its edges
+# (and context windows around them) see the surrounding text
+SEARCH_MARGIN_BYTES = 4096
+
+# Widest window a match that runs to the edge of its window is retried with
+MAX_WINDOW_BYTES = 16 * CHUNK_BYTES
+
+# A UTF-8 character is at most this many bytes, so `n * MAX_CHAR_BYTES`
+# bytes always hold at least `n` characters
+MAX_CHAR_BYTES = 4
+
+# Mapped files remembered as matching their recorded digest
+MAX_VERIFIED = 256
+
+_MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+
+def _normalize_newlines(text: str) -> str:
+    """Normalize newlines like ContentRef.read."""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class MappedText:
+    """
+    A document body mapped read-only into memory, behind an optional text prefix.
+
+    Offsets are byte offsets into the UTF-8 encoded prefix followed by the
+    body, which is how analysis sees a document (a header line, then the
+    text). Callers scan the bytes for keywords and periods and decode only
+    windows around what they find; decoded text has its newlines normalized
+    like ContentRef.read, so windows read the same as the loaded body.
+
+    Pages are released once a pass has scanned past them, so resident
+    memory stays bounded by the chunks and windows in use rather than by
+    the size of the file.
+    """
+
+    def __init__(self, path: str, offset: int = 0, length: Optional[int] = None, prefix: str = ""):
+        """
+        Map a file.
+
+        Args:
+            path: File to map
+            offset: Start of the body in the file
+            length: Length of the body in bytes (None = to the end of the file)
+            prefix: Text that precedes the body (e.g. a document header)
+
+        Raises:
+            OSError: If the file cannot be opened or mapped
+        """
+        self.prefix = prefix.encode("utf-8", "surrogatepass")
+        self._map: Optional[mmap.mmap] = None
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._end = size if length is None else min(size, offset + length)
+            self._offset = min(offset, self._end)
+            if self._end > self._offset:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.body_start = len(self.prefix)
+        self._size = self.body_start + self._end - self._offset
+
+    def __len__(self) -> int:
+        """Get the size of prefix and body in bytes."""
+        return self._size
+
+    def __enter__(self) -> "MappedText":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # Bytes
+
+    def read(self, start: int, end: int) -> bytes:
+        """Get the bytes in [start, end)."""
+        start, end = max(0, start), min(self._size, end)
+        if start >= end:
+            return b""
+        body = self.body_start
+        head = self.prefix[start:end] if start < body else b""
+        if end <= body:
+            return head
+        return head + self._map[self._offset + max(start, body) - body:self._offset + end - body]
+
+    def find(self, sub: bytes, start: int = 0, end: Optional[int] = None) -> int:
+        """Get the lowest offset of `sub` in [start, end), or -1 (`sub` must not straddle the prefix)."""
+        end = self._size if end is None else min(end, self._size)
+        body = self.body_start
+        if start < body:
+            found = self.prefix.find(sub, start, min(end, body))
+            if found != -1:
+                return found
+            start = body
+        if start >= end or self._map is None:
+            return -1
+        found = self._map.find(sub, self._offset + start - body, self._offset + end - body)
+        return -1 if found == -1 else found - self._offset + body
+
+    def rfind(self, sub: bytes, start: int = 0, end: Optional[int] = None) -> int:
+        """Get the highest offset of `sub` in [start, end), or -1 (`sub` must not straddle the prefix)."""
+        end = self._size if end is None else min(end, self._size)
+        body = self.body_start
+        if end > body and self._map is not None:
+            found = self._map.rfind(sub, self._offset + max(start, body) - body, self._offset + end - body)
+            if found != -1:
+                return found - self._offset + body
+        if start < body:
+            return self.prefix.rfind(sub, start, min(end, body))
+        return -1
+
+    def chunks(self, start: int = 0, overlap: int = 0) -> Iterator[Tuple[int, bytes, int]]:
+        """
+        Read from `start` to the end in chunks, releasing each once it is consumed.
+
+        Args:
+            start: Offset to start at
+            overlap: Extra bytes read past each chunk, so that a match
+                starting in the chunk can be seen whole
+
+        Yields:
+            (offset, data, length): data starts at offset and holds the
+            chunk's `length` bytes followed by up to `overlap` more
+        """
+        pos = start
+        while pos < self._size:
+            end = min(self._size, pos + CHUNK_BYTES)
+            yield pos, self.read(pos, end + overlap), end - pos
+            self.release(pos, end)
+            pos = end
+
+    def release(self, start: int, end: int):
+        """Let the OS drop mapped pages in [start, end); they are re-read if touched again."""
+        if self._map is None or _MADV_DONTNEED is None:
+            return
+        start = max(start, self.body_start) - self.body_start + self._offset
+        end = min(end, self._size) - self.body_start + self._offset
+        start -= start % mmap.PAGESIZE
+        if start < end:
+            self._map.madvise(_MADV_DONTNEED, start, end - start)
+
+    # Text
+
+    def _char_start(self, pos: int) -> int:
+        """Move an offset back to the start of the character it falls in."""
+        while 0 < pos < self._size:
+            byte = self.read(pos, pos + 1)[0]
+            if byte & 0xC0 != 0x80:
+                break
+            pos -= 1
+        return pos
+
+    def _decode(self, *bounds: int) -> List[str]:
+        """Decode consecutive spans between character-aligned offsets, one string per span."""
+        bounds = [self._char_start(max(0, min(bound, self._size))) for bound in bounds]
+        data = self.read(bounds[0], bounds[-1])
+        parts = []
+        carriage_return = False
+        for start, end in zip(bounds, bounds[1:]):
+            part = data[start - bounds[0]:end - bounds[0]]
+            # A CRLF split between spans is one newline, kept in the first span
+            if carriage_return and part.startswith(b"\n"):
+                part = part[1:]
+                carriage_return = False
+            if part:
+                carriage_return = part.endswith(b"\r")
+            parts.append(_normalize_newlines(part.decode("utf-8", "surrogatepass")))
+        return parts
+
+    def text(self, start: int, end: int) -> str:
+        """Decode [start, end)."""
+        return self._decode(start, end)[0]
+
+    def window(self, pos: int, before: int, after: int, floor: int = 0) -> Tuple[str, int]:
+        """
+        Decode the text around an offset.
+
+        Args:
+            pos: Offset of a character
+            before: Bytes to include before it (holding at least
+                `before // MAX_CHAR_BYTES` characters)
+            after: Bytes to include from it on
+            floor: Offset the window never starts before
+
+        Returns:
+            (text, index of the character at `pos` in it)
+        """
+        head, tail = self._decode(max(floor, pos - before), pos, pos + after)
+        return head + tail, len(head)
+
+    def advance(self, pos: int, text: str) -> int:
+        """Get the offset just past `text`, decoded starting at `pos`."""
+        end = pos + len(text.encode("utf-8", "surrogatepass"))
+        if "\n" not in text:
+            return end
+        # Each CRLF decodes to one character but is two bytes
+        pairs = 0
+        while True:
+            found = self.read(pos, end + pairs).count(b"\r\n")
+            if found == pairs:
+                return end + pairs
+            pairs = found
+
+    def is_word_boundary(self, pos: int) -> bool:
+        """Check whether an offset sits on a word boundary, using `re`'s `\\b` rules."""
+        text, index = self.window(pos, MAX_CHAR_BYTES, MAX_CHAR_BYTES)
+        before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+        after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+        return before != after
+
+    def search(self, pattern, start: int = 0) -> Optional[Tuple[str, re.Match]]:
+        """
+        Find the first match of a text pattern at or after an offset, decoding a chunk at a time.
+
+        Each chunk is decoded with SEARCH_MARGIN_BYTES of context on either
+        side, so anchors, lookarounds and context windows near its edges see
+        the surrounding text. A match must start in the chunk; one that runs
+        to the end of the decoded text is retried with a wider margin. Text
+        before `start` is not visible to the pattern.
+
+        Args:
+            pattern: Compiled text pattern (`re.Pattern` or CompiledPattern)
+            start: Offset to search from
+
+        Returns:
+            (decoded text, match in it), or None
+        """
+        pos = start
+        while pos < self._size:
+            end = self._char_start(min(self._size, pos + CHUNK_BYTES))
+            margin = SEARCH_MARGIN_BYTES
+            while True:
+                head, core, tail = self._decode(max(start, pos - SEARCH_MARGIN_BYTES), pos, end, end + margin)
+                text = head + core + tail
+                match = pattern.search(text, len(head))
+                if match is None or match.start() >= len(head) + len(core):
+                    break
+                if match.end() < len(text) or end + margin >= self._size or margin >= MAX_WINDOW_BYTES:
+                    return text, match
+                margin *= 4
+            self.release(pos, end)
+            pos = end
+        return None
+
+
+class SentenceCursor:
+    """
+    Locates the sentences of mapped text for offsets visited in ascending order.
+
+    Sentences are split on periods like SentenceIndex, starting at `floor`.
+    Each byte is searched at most once across calls, so walking every hit
+    of a scan is linear, even in text without periods.
+    """
+
+    def __init__(self, mapped: MappedText, floor: int = 0):
+        """
+        Initialize cursor.
+
+        Args:
+            mapped: Text to segment
+            floor: Offset where the first sentence starts
+        """
+        self.mapped = mapped
+        self.floor = floor
+        self.start = -1
+        self.end = -1
+
+    def locate(self, pos: int) -> Tuple[int, int]:
+        """
+        Get the sentence containing an offset (at or after the previous one).
+
+        Returns:
+            (start, end) offsets; `end` is its terminating period, or the end
+            of the text for the last sentence
+        """
+        if self.start <= pos < self.end:
+            return self.start, self.end
+        low = self.floor if self.end == -1 else self.end + 1
+        period = self.mapped.rfind(b".", low, pos)
+        self.start = period + 1 if period != -1 else low
+        self.end = self.mapped.find(b".", pos)
+        if self.end == -1:
+            self.end = len(self.mapped)
+        return self.start, self.end
+
+    def is_terminated(self) -> bool:
+        """Check whether the current sentence ends with a period."""
+        return self.end < len(self.mapped)
+
+
+def map_document(document: Document, min_bytes: int, prefix: str = "") -> Optional[MappedText]:
+    """
+    Map a document's body if it is a large, unloaded local UTF-8 file.
+
+    A file that no longer matches the size and digest recorded at ingest is
+    not mapped, so its body is read (or found stale) through its ContentRef.
+
+    Args:
+        document: Document to map
+        min_bytes: Smallest body to map (0 = never map)
+        prefix: Text to place before the body
+
+    Returns:
+        MappedText (to be closed by the caller), or None to use the loaded body
+    """
+    ref = document.content_ref
+    if min_bytes <= 0 or ref is None or not ref.path or document.content_loaded:
+        return None
+    try:
+        if codecs.lookup(ref.encoding).name != "utf-8":
+            return None
+        stat = os.stat(ref.path)
+    except (LookupError, OSError):
+        return None
+    size = max(0, stat.st_size - ref.offset)
+    if ref.length is not None:
+        size = min(size, ref.length)
+    if size < min_bytes or not _is_current(ref, size, stat):
+        return None
+    return MappedText(ref.path, ref.offset, ref.length, prefix)
+
+
+# Refs whose file was last found to match its recorded digest, with the
+# (size, mtime) it was checked at, so a large file is hashed once per version
+_verified: "OrderedDict[ContentRef, Tuple[int, int]]" = OrderedDict()
+_verified_lock = Lock()
+
+
+def _is_current(ref: ContentRef, size: int, stat: os.stat_result) -> bool:
+    """Check a mapped file against the size and digest recorded at ingest."""
+    if ref.sha256 is None:
+        return True
+    if ref.size is not None and size != ref.size:
+        return False
+    version = (stat.st_size, stat.st_mtime_ns)
+    with _verified_lock:
+        if _verified.get(ref) == version:
+            _verified.move_to_end(ref)
+            return True
+    if not ref.is_current():
+        return False
+    with _verified_lock:
+        _verified[ref] = version
+        _verified.move_to_end(ref)
+        while len(_verified) > MAX_VERIFIED:
+            _verified.popitem(last=False)
+    return True
@@ -0,0 +1,202 @@
+"""Registry of precompiled analyzer regexes with match statistics."""
+
+import re
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class CompiledPattern:
+    """A compiled regex that records how often it matches and how long matching takes."""
+
+    def __init__(self, name: str, source: str, flags: int = 0):
+        """
+        Compile and validate a pattern.
+
+        Args:
+            name: Registry name (e.g. "pain_point:problem")
+            source: Regex source
+            flags: `re` flags
+
+        Raises:
+            ValueError: If the pattern does not compile
+        """
+        try:
+            self.regex = re.compile(source, flags)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern '{name}' ({source!r}): {e}") from e
+        self.name = name
+        self.source = source
+        self.flags = flags
+        self.calls = 0
+        self.matches = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def _record(self, elapsed: float, matched: int):
+        """Record one matching operation."""
+        self.calls += 1
+        self.matches += matched
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def match(self, string: str, pos: int = 0, endpos: int = sys.maxsize) -> Optional[re.Match]:
+        """Timed `re.Pattern.match`."""
+        start = time.perf_counter()
+        result = self.regex.match(string, pos, endpos)
+        self._record(time.perf_counter() - start, 1 if result else 0)
+        return result
+
+    def search(self, string: str, pos: int = 0, endpos: int = sys.maxsize) -> Optional[re.Match]:
+        """Timed `re.Pattern.search`."""
+        start = time.perf_counter()
+        result = self.regex.search(string, pos, endpos)
+        self._record(time.perf_counter() - start, 1 if result else 0)
+        return result
+
+    def finditer(self, string: str, pos: int = 0, endpos: int = sys.maxsize) -> Iterator[re.Match]:
+        """Timed `re.Pattern.finditer`; time spent inside the regex engine is accumulated lazily."""
+        iterator = self.regex.finditer(string, pos, endpos)
+        elapsed = 0.0
+        matched = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    match = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    return
+                elapsed += time.perf_counter() - start
+                matched += 1
+                yield match
+        finally:
+            self._record(elapsed, matched)
+
+    def stats(self) -> Dict:
+        """Get match statistics for this pattern."""
+        return {
+            "name": self.name,
+            "pattern": self.source,
+            "calls": self.calls,
+            "matches": self.matches,
+            "total_ms": round(self.total_time * 1000, 3),
+            "max_ms": round(self.max_time * 1000, 3),
+            "avg_ms": round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+        }
+
+
+class PatternRegistry:
+    """
+    Compiles every analyzer pattern once and tracks how each one performs.
+
+    Patterns are registered under a stable name; registering the same name
+    and source again returns the existing compiled pattern, so callers can
+    register lazily without recompiling.
+
+    Project-supplied patterns are kept apart, keyed by source and flags so
+    projects using the same regex share one compiled pattern, and bounded
+    by an LRU so they do not accumulate for the life of the process.
+    """
+
+    def __init__(self, max_custom: int = 256):
+        """
+        Initialize an empty registry.
+
+        Args:
+            max_custom: Maximum number of project-supplied patterns to keep
+        """
+        self.max_custom = max_custom
+        self._patterns: Dict[str, CompiledPattern] = {}
+        self._custom: "OrderedDict[Tuple[str, int], CompiledPattern]" = OrderedDict()
+        self._lock = Lock()
+
+    def register(self, name: str, source: str, flags: int = 0) -> CompiledPattern:
+        """
+        Compile and register a pattern, or return the already registered one.
+
+        Args:
+            name: Registry name
+            source: Regex source
+            flags: `re` flags
+
+        Returns:
+            The compiled pattern
+
+        Raises:
+            ValueError: If the pattern does not compile
+        """
+        with self._lock:
+            existing = self._patterns.get(name)
+            if existing and existing.source == source and existing.flags == flags:
+                return existing
+            compiled = CompiledPattern(name, source, flags)
+            self._patterns[name] = compiled
+            return compiled
+
+    def register_custom(self, source: str, flags: int = 0) -> CompiledPattern:
+        """
+        Compile a project-supplied pattern, or return the one already compiled.
+
+        Args:
+            source: Regex source
+            flags: `re` flags
+
+        Returns:
+            The compiled pattern, named "custom:<source>"
+
+        Raises:
+            ValueError: If the pattern does not compile
+        """
+        key = (source, flags)
+        with self._lock:
+            compiled = self._custom.get(key)
+            if compiled is None:
+                compiled = self._custom[key] = CompiledPattern(f"custom:{source}", source, flags)
+                while len(self._custom) > self.max_custom:
+                    self._custom.popitem(last=False)
+            else:
+                self._custom.move_to_end(key)
+            return compiled
+
+    def get(self, name: str) -> Optional[CompiledPattern]:
+        """Get a registered pattern by name."""
+        return self._patterns.get(name)
+
+    def names(self) -> List[str]:
+        """List registered pattern names."""
+        return sorted(self._patterns)
+
+    def stats(self, prefix: str = "") -> List[Dict]:
+        """
+        Get statistics for registered patterns, slowest first.
+
+        Args:
+            prefix: Only include patterns whose name starts with this prefix
+
+        Returns:
+            List of per-pattern stats dicts
+        """
+        with self._lock:
+            patterns = [p for p in self._all() if p.name.startswith(prefix)]
+        return sorted((p.stats() for p in patterns), key=lambda s: s["total_ms"], reverse=True)
+
+    def _all(self) -> List[CompiledPattern]:
+        """Get named and project-supplied patterns (call with the lock held)."""
+        return list(self._patterns.values()) + list(self._custom.values())
+
+    def reset_stats(self):
+        """Reset match counters and timings for all patterns."""
+        with self._lock:
+            for pattern in self._all():
+                pattern.calls = 0
+                pattern.matches = 0
+                pattern.total_time = 0.0
+                pattern.max_time = 0.0
+
+
+# Shared registry for all analyzers
+pattern_registry = PatternRegistry()
@@ -0,0 +1,329 @@
+"""Inverted index and BM25 ranking for searching project documents."""
+
+import math
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from models.document import Document, StaleContentError
+from .sentence_index import TOKEN_PATTERN, prepared_texts
+
+
+PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+
+# Question words that carry no meaning for ranking
+STOPWORDS = frozenset("""
+    a about after all also an and any are as at be been but by can could did do does
+    for from had has have how i if in into is it its me my no not of on or our so
+    that the their them then there these they this those to up us was we were what
+    when where which who whom why will with would you your
+""".split())
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_term(token: str) -> str:
+    """
+    Normalize a token to an index term.
+
+    Terms are lowercased and plural "s" is dropped, so "Refunds" and
+    "refund" match.
+    """
+    term = token.lower()
+    if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+        term = term[:-1]
+    return term
+
+
+def parse_query(question: str) -> Tuple[List[str], List[Tuple[str, ...]]]:
+    """
+    Split a question into search terms and quoted phrases.
+
+    Args:
+        question: Free-text question; double-quoted parts are phrases
+
+    Returns:
+        (terms, phrases), each de-duplicated in question order. Stopwords
+        are dropped from terms but kept inside phrases.
+    """
+    phrases: List[Tuple[str, ...]] = []
+    terms: List[str] = []
+    for quoted in PHRASE_PATTERN.findall(question):
+        phrase = tuple(normalize_term(token) for token in TOKEN_PATTERN.findall(quoted))
+        if len(phrase) == 1:
+            terms.append(phrase[0])
+        elif phrase and phrase not in phrases:
+            phrases.append(phrase)
+    for token in TOKEN_PATTERN.findall(PHRASE_PATTERN.sub(" ", question)):
+        term = normalize_term(token)
+        if len(term) > 1 and term not in STOPWORDS:
+            terms.append(term)
+    return list(dict.fromkeys(terms)), phrases
+
+
+@dataclass
+class SearchHit:
+    """A ranked document with its best matching sentences."""
+
+    document: Document
+    score: float
+    excerpts: List[str] = field(default_factory=list)
+
+
+class _IndexedDocument:
+    """Per-document data kept by the index."""
+
+    __slots__ = ("document", "version", "length", "sentence_tokens", "starts", "ends", "terms")
+
+    def __init__(self, document: Document, version: Hashable):
+        self.document = document
+        self.version = version
+        self.length = 0
+        # First token position of each sentence, and sentence spans; the
+        # text itself is not kept, so lazy bodies can still be dropped
+        self.sentence_tokens = array("I")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.terms: Tuple[str, ...] = ()
+
+    def sentence_of(self, position: int) -> int:
+        """Get the sentence containing a token position."""
+        return bisect_right(self.sentence_tokens, position) - 1
+
+
+class SearchIndex:
+    """
+    Inverted index over one project's documents.
+
+    Postings map each term to the documents containing it and the token
+    positions it occurs at; positions map back to sentences for excerpts
+    and make phrase queries possible. `sync` keeps the index in step with a
+    project's document list, re-indexing only documents that were added or
+    whose content changed, and `search` ranks with BM25.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._docs: Dict[int, _IndexedDocument] = {}
+        # term -> {document key: positions}
+        self._postings: Dict[str, Dict[int, array]] = {}
+        self._total_length = 0
+        self._lock = Lock()
+        self.indexed = 0
+
+    @staticmethod
+    def _key(document: Document) -> int:
+        # The index holds the documents it has indexed, so ids are not reused
+        return id(document)
+
+    @staticmethod
+    def _version(document: Document) -> Hashable:
+        """Identify a document's content without loading a lazy body."""
+        if document.content_ref is not None:
+            # Replacing the body clears content_ref, so the ref names this content
+            return document.content_ref
+        return document.fingerprint
+
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        return len(self._docs)
+
+    def sync(self, documents: Iterable[Document]) -> int:
+        """
+        Bring the index in line with a document list.
+
+        Args:
+            documents: The project's current documents
+
+        Returns:
+            Number of documents (re-)indexed
+        """
+        with self._lock:
+            current = {self._key(document): document for document in documents}
+
+            for key in [key for key in self._docs if key not in current]:
+                self._remove(key)
+
+            indexed = 0
+            for key, document in current.items():
+                version = self._version(document)
+                entry = self._docs.get(key)
+                if entry is not None:
+                    if entry.version == version:
+                        continue
+                    self._remove(key)
+                try:
+                    self._add(key, document, version)
+                except StaleContentError as e:
+                    # Left out until its file matches again or it is re-ingested
+                    print(f"Warning: Not indexing {document.file_path}: {e}")
+                    continue
+                indexed += 1
+            self.indexed += indexed
+            return indexed
+
+    def _add(self, key: int, document: Document, version: Hashable):
+        """Index a document; caller holds the lock."""
+        entry = _IndexedDocument(document, version)
+        # Tokens and sentences come from the shared per-version preprocessing
+        prepared = prepared_texts.get(document)
+        entry.sentence_tokens = prepared.sentence_tokens()
+        # Same pattern over the same text, so the n-th word is token n
+        words = TOKEN_PATTERN.findall(prepared.lower if prepared.lower is not None else prepared.text)
+        # Postings are arrays: compact, and not tracked by the garbage collector
+        positions: Dict[str, array] = {}
+        for position, term in enumerate(map(normalize_term, words)):
+            term_positions = positions.get(term)
+            if term_positions is None:
+                term_positions = positions[term] = array("I")
+            term_positions.append(position)
+
+        entry.length = len(words)
+        entry.starts = array("I", prepared.sentences.starts)
+        entry.ends = array("I", prepared.sentences.ends)
+        entry.terms = tuple(positions)
+        for term, term_positions in positions.items():
+            self._postings.setdefault(term, {})[key] = term_positions
+        self._docs[key] = entry
+        self._total_length += entry.length
+
+    def _remove(self, key: int):
+        """Drop a document from the index; caller holds the lock."""
+        entry = self._docs.pop(key)
+        self._total_length -= entry.length
+        for term in entry.terms:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+    def _phrase_positions(self, phrase: Tuple[str, ...]) -> Dict[int, array]:
+        """Get start positions of a phrase per document; caller holds the lock."""
+        postings = [self._postings.get(term) for term in phrase]
+        if not all(postings):
+            return {}
+        # Walk the rarest term's documents
+        matches: Dict[int, array] = {}
+        for key in min(postings, key=len):
+            if not all(key in term_postings for term_postings in postings):
+                continue
+            entry = self._docs[key]
+            following = [set(term_postings[key]) for term_postings in postings[1:]]
+            starts = array("I", (
+                start for start in postings[0][key]
+                if all(start + offset + 1 in positions for offset, positions in enumerate(following))
+                and entry.sentence_of(start) == entry.sentence_of(start + len(phrase) - 1)
+            ))
+            if starts:
+                matches[key] = starts
+        return matches
+
+    def search(self, question: str, limit: int = 5, excerpts: int = 3) -> Tuple[List[SearchHit], int]:
+        """
+        Rank documents for a question with BM25.
+
+        Each query term and each quoted phrase is scored as a unit. Excerpts
+        are the sentences matching the most units, in document order among
+        equals.
+
+        Args:
+            question: Free-text question; double-quoted parts must match as phrases
+            limit: Maximum documents to return
+            excerpts: Maximum excerpts per document
+
+        Returns:
+            (top hits, total number of matching documents)
+        """
+        terms, phrases = parse_query(question)
+        with self._lock:
+            units = [self._postings.get(term, {}) for term in terms]
+            units.extend(self._phrase_positions(phrase) for phrase in phrases)
+            if not self._docs:
+                return [], 0
+
+            count = len(self._docs)
+            average_length = self._total_length / count or 1.0
+            scores: Dict[int, float] = {}
+            for postings in units:
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, positions in postings.items():
+                    frequency = len(positions)
+                    norm = K1 * (1 - B + B * self._docs[key].length / average_length)
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            hits = []
+            for key, score in ranked:
+                entry = self._docs[key]
+                matched: Dict[int, int] = {}
+                for postings in units:
+                    positions = postings.get(key)
+                    if positions is None:
+                        continue
+                    for sentence in {entry.sentence_of(position) for position in positions}:
+                        matched[sentence] = matched.get(sentence, 0) + 1
+
+                best = sorted(matched, key=lambda sentence: (-matched[sentence], sentence))
+                hit = SearchHit(document=entry.document, score=round(score, 4))
+                try:
+                    content = entry.document.content
+                except StaleContentError:
+                    best = []
+                for sentence in best:
+                    text = content[entry.starts[sentence]:entry.ends[sentence]].strip()
+                    if text:
+                        hit.excerpts.append(text)
+                    if len(hit.excerpts) >= excerpts:
+                        break
+                hits.append(hit)
+            return hits, len(scores)
+
+
+class SearchIndexes:
+    """Bounded LRU of per-project search indexes."""
+
+    def __init__(self, max_projects: int = 32):
+        """
+        Initialize registry.
+
+        Args:
+            max_projects: Maximum projects to keep an index for (0 = unbounded)
+        """
+        self.max_projects = max_projects
+        self._indexes: "OrderedDict[str, SearchIndex]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, project_id: str) -> SearchIndex:
+        """Get a project's index, creating an empty one if needed."""
+        with self._lock:
+            index = self._indexes.get(project_id)
+            if index is None:
+                index = self._indexes[project_id] = SearchIndex()
+            self._indexes.move_to_end(project_id)
+            while self.max_projects > 0 and len(self._indexes) > self.max_projects:
+                self._indexes.popitem(last=False)
+            return index
+
+    def drop(self, project_id: str):
+        """Forget a project's index."""
+        with self._lock:
+            self._indexes.pop(project_id, None)
+
+    def stats(self) -> Dict:
+        """Get indexed project and document counts."""
+        with self._lock:
+            return {
+                "projects": len(self._indexes),
+                "max_projects": self.max_projects,
+                "documents": sum(len(index) for index in self._indexes.values()),
+            }
@@ -0,0 +1,189 @@
+"""Sentence segmentation and shared text preprocessing for discovery analysis."""
+
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from models.document import Document
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class SentenceIndex:
+    """
+    Sentence boundaries of a text, computed in one pass.
+
+    Sentences are split on periods exactly like `text.split(".")`: sentence
+    `i` spans `[starts[i], ends[i])`, where `ends[i]` is the offset of its
+    terminating period, or the end of the text for the last sentence.
+    """
+
+    def __init__(self, text: str):
+        """
+        Segment a text.
+
+        Args:
+            text: Text to segment
+        """
+        self.text = text
+        self.starts: List[int] = [0]
+        self.ends: List[int] = []
+
+        period = text.find(".")
+        while period != -1:
+            self.ends.append(period)
+            self.starts.append(period + 1)
+            period = text.find(".", period + 1)
+        self.ends.append(len(text))
+
+    def __len__(self) -> int:
+        """Get the number of sentences."""
+        return len(self.starts)
+
+    def index_of(self, offset: int) -> int:
+        """Get the index of the sentence containing a text offset."""
+        return bisect_right(self.starts, offset) - 1
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """Get the (start, end) offsets of a sentence, excluding its period."""
+        return self.starts[index], self.ends[index]
+
+    def is_terminated(self, index: int) -> bool:
+        """Check whether a sentence ends with a period."""
+        return self.ends[index] < len(self.text)
+
+    def sentence(self, index: int, with_period: bool = False) -> str:
+        """
+        Get the text of a sentence.
+
+        Args:
+            index: Sentence index
+            with_period: Include the terminating period, if any
+
+        Returns:
+            Sentence text, unstripped
+        """
+        start, end = self.span(index)
+        if with_period and self.is_terminated(index):
+            end += 1
+        return self.text[start:end]
+
+
+class PreparedText:
+    """
+    Preprocessing of one text version, shared by analysis and search.
+
+    Holds the lowercased text, sentence boundaries and (on first use) the
+    word tokens of each sentence as compact arrays, so consumers work from
+    spans instead of re-splitting and re-lowercasing the text. The text
+    itself is not rewritten: every consumer reports excerpts and offsets in
+    the original.
+    """
+
+    def __init__(self, text: str):
+        """
+        Preprocess a text.
+
+        Args:
+            text: Text to preprocess
+        """
+        self.text = text
+        lowered = text.lower()
+        # Lowercasing some characters changes their length, and offsets
+        # into the lowercased text would no longer line up
+        self.lower: Optional[str] = lowered if len(lowered) == len(text) else None
+        self.sentences = SentenceIndex(text)
+        self._sentence_tokens: Optional[array] = None
+
+    def __len__(self) -> int:
+        """Get the length of the text."""
+        return len(self.text)
+
+    def sentence_tokens(self) -> array:
+        """
+        Get the index of the first word token (run of `\\w`) of each sentence, computed once.
+
+        Tokens never contain a period, so each lies within one sentence, and
+        token `n` is the n-th match of TOKEN_PATTERN over the text. The
+        array has one extra entry, the total number of tokens.
+        """
+        if self._sentence_tokens is None:
+            text = self.lower if self.lower is not None else self.text
+            firsts = array("I", [0])
+            count = 0
+            for index in range(len(self.sentences)):
+                start, end = self.sentences.span(index)
+                count += len(TOKEN_PATTERN.findall(text, start, end))
+                firsts.append(count)
+            self._sentence_tokens = firsts
+        return self._sentence_tokens
+
+
+class PreparedTexts:
+    """
+    Bounded LRU of PreparedText keyed by document fingerprint.
+
+    A document is preprocessed once per content version, however many
+    consumers ask for it. The bound is on cached text size, since prepared
+    texts hold their body (and keep it alive after a lazy document drops it).
+    """
+
+    def __init__(self, max_chars: int = 32 * 1024 * 1024):
+        """
+        Initialize cache.
+
+        Args:
+            max_chars: Budget for cached texts in characters (0 = unbounded)
+        """
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, PreparedText]" = OrderedDict()
+        self._total = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document: Document) -> PreparedText:
+        """Get a document's prepared text, preprocessing it if not cached."""
+        key = document.fingerprint
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return prepared
+            self.misses += 1
+
+        prepared = PreparedText(document.content)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = prepared
+                self._total += len(prepared)
+            while self.max_chars > 0 and self._total > self.max_chars and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total -= len(evicted)
+        return prepared
+
+    def clear(self):
+        """Drop all prepared texts."""
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "chars": self._total,
+                "max_chars": self.max_chars,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by the analyzer and search indexes
+prepared_texts = PreparedTexts()
@@ -1,54 +1,176 @@
 """Project state management singleton."""
 
-from typing import Dict, Optional
+import functools
+import inspect
+import sqlite3
+from collections import OrderedDict
+from threading import RLock
+from typing import Callable, Dict, Optional, Set
 from models.project_state import ProjectState
+from .state_store import ProjectStateStore
 
 
 class ProjectStateManager:
-    """Singleton manager for project states across tool calls."""
-    
+    """
+    Singleton manager for project states across tool calls.
+
+    Hot projects are kept in memory. When a durable store is configured,
+    every created or updated project is written through to it, the number
+    of projects kept in memory is bounded (least recently used are evicted),
+    and projects not in memory are reloaded lazily from the store.
+    """
+
     _instance = None
-    _projects: Dict[str, ProjectState] = {}
-    
+    _projects: "OrderedDict[str, ProjectState]" = OrderedDict()
+    _store: Optional[ProjectStateStore] = None
+    _max_projects: int = 0
+    _unsaved: Set[str] = set()
+    _counters: Dict[str, int] = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0}
+    _lock = RLock()
+    _project_locks: Dict[str, RLock] = {}
+
     def __new__(cls):
         """Ensure only one instance exists."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
-    
+
+    @classmethod
+    def configure(cls, store: Optional[ProjectStateStore] = None, max_projects: int = 0):
+        """
+        Configure persistence and the in-memory bound.
+
+        Args:
+            store: Durable store to write through to and reload from
+            max_projects: Maximum projects kept in memory (0 = unbounded).
+                Only enforced with a store, so evicted projects can be reloaded.
+        """
+        with cls._lock:
+            cls._store = store
+            cls._max_projects = max_projects
+            if store:
+                # Projects created before the store existed must not be lost on eviction
+                for project in cls._projects.values():
+                    cls._save(project)
+                cls._evict()
+
+    @classmethod
+    def project_lock(cls, project_id: str) -> RLock:
+        """
+        Get the lock serializing changes to one project.
+
+        Tool calls and the folder watcher's thread both change projects;
+        each holds the project's lock for the whole read-modify-write.
+        """
+        with cls._lock:
+            lock = cls._project_locks.get(project_id)
+            if lock is None:
+                lock = cls._project_locks[project_id] = RLock()
+            return lock
+
+    @classmethod
+    def _save(cls, project: ProjectState):
+        """Write a project through to the store, if configured."""
+        if cls._store is None:
+            return
+        try:
+            cls._store.save(project)
+            cls._unsaved.discard(project.project_id)
+        except sqlite3.Error as e:
+            # Keep it in memory (not evictable) until a later save succeeds
+            cls._unsaved.add(project.project_id)
+            print(f"Warning: Could not persist project {project.project_id}: {e}")
+
+    @classmethod
+    def _remember(cls, project: ProjectState):
+        """Mark a project as most recently used and evict cold ones."""
+        cls._projects[project.project_id] = project
+        cls._projects.move_to_end(project.project_id)
+        cls._evict()
+
+    @classmethod
+    def _evict(cls):
+        """Drop least recently used projects beyond the in-memory bound."""
+        if cls._store is None or cls._max_projects <= 0:
+            return
+        for project_id in list(cls._projects):
+            if len(cls._projects) <= cls._max_projects:
+                break
+            if project_id in cls._unsaved:
+                continue
+            del cls._projects[project_id]
+            cls._counters["evictions"] += 1
+
     def get_project(self, project_id: str) -> Optional[ProjectState]:
-        """Get project state by ID."""
-        return self._projects.get(project_id)
-    
-    def create_project(self, project_id: str, project_name: str, 
+        """Get project state by ID, reloading it from the store if it was paged out."""
+        with self._lock:
+            project = self._projects.get(project_id)
+            if project is not None:
+                self._projects.move_to_end(project_id)
+                self._counters["hits"] += 1
+                return project
+
+            self._counters["misses"] += 1
+            if self._store is None:
+                return None
+            try:
+                project = self._store.load(project_id)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not load project {project_id}: {e}")
+                return None
+            if project is not None:
+                self._counters["loads"] += 1
+                self._remember(project)
+            return project
+
+    def create_project(self, project_id: str, project_name: str,
                       project_description: str = "") -> ProjectState:
         """Create a new project state."""
-        if project_id in self._projects:
-            return self._projects[project_id]
-        
-        project = ProjectState(
-            project_id=project_id,
-            project_name=project_name,
-            project_description=project_description
-        )
-        self._projects[project_id] = project
-        return project
-    
+        with self._lock:
+            existing = self.get_project(project_id)
+            if existing is not None:
+                return existing
+
+            project = ProjectState(
+                project_id=project_id,
+                project_name=project_name,
+                project_description=project_description
+            )
+            self._save(project)
+            self._remember(project)
+            return project
+
     def update_project(self, project: ProjectState):
         """Update an existing project state."""
-        self._projects[project.project_id] = project
-    
+        with self._lock:
+            self._save(project)
+            self._remember(project)
+
     def clear_project(self, project_id: str) -> bool:
-        """Clear a project from memory."""
-        if project_id in self._projects:
-            del self._projects[project_id]
-            return True
-        return False
-    
+        """Clear a project from memory and the store."""
+        with self._lock:
+            cleared = self._projects.pop(project_id, None) is not None
+            self._unsaved.discard(project_id)
+            if self._store is not None:
+                try:
+                    cleared = self._store.delete(project_id) or cleared
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not delete stored project {project_id}: {e}")
+            return cleared
+
     def list_projects(self) -> list:
-        """List all project IDs."""
-        return list(self._projects.keys())
-    
+        """List all project IDs, including those paged out to the store."""
+        with self._lock:
+            project_ids = list(self._projects.keys())
+            if self._store is not None:
+                try:
+                    stored = self._store.list_project_ids()
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not list stored projects: {e}")
+                    stored = []
+                project_ids.extend(pid for pid in stored if pid not in self._projects)
+            return project_ids
+
     def get_or_create(self, project_id: str, project_name: str = "",
                      project_description: str = "") -> ProjectState:
         """Get existing project or create new one."""
@@ -57,3 +179,27 @@ class ProjectStateManager:
             project = self.create_project(project_id, project_name, project_description)
         return project
 
+    def stats(self) -> Dict:
+        """Get in-memory cache size and hit/miss/load/eviction counters."""
+        with self._lock:
+            return {
+                "projects_in_memory": len(self._projects),
+                "max_projects": self._max_projects,
+                "persistent": self._store is not None,
+                "store_path": str(self._store.path) if self._store else None,
+                **self._counters,
+            }
+
+
+def with_project_lock(func: Callable) -> Callable:
+    """Decorator running a function under the lock of its `project_id` argument (if given)."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        project_id = signature.bind(*args, **kwargs).arguments.get("project_id")
+        if not isinstance(project_id, str):
+            return func(*args, **kwargs)
+        with ProjectStateManager.project_lock(project_id):
+            return func(*args, **kwargs)
+    return wrapper
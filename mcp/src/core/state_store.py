@@ -0,0 +1,153 @@
+"""Durable local store for project state."""
+
+import hashlib
+import json
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+from models.document import Document
+from models.project_state import ProjectState
+
+
+class ProjectStateStore:
+    """
+    SQLite-backed store for ProjectState.
+
+    Project state (config, analysis, context, updates log, confidence
+    history) is stored as one row per project, and documents as one row per
+    document, so saving a project only rewrites documents that changed.
+    Rows hold zlib-compressed JSON; lazy document bodies are stored as
+    their ContentRef and reloaded from the source on access.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: SQLite database file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS projects ("
+                " project_id TEXT PRIMARY KEY,"
+                " data BLOB NOT NULL,"
+                " updated_at TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " project_id TEXT NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " data BLOB NOT NULL,"
+                " PRIMARY KEY (project_id, position))"
+            )
+
+    @staticmethod
+    def _encode(data: dict) -> bytes:
+        """Serialize a dict to compressed JSON."""
+        return zlib.compress(json.dumps(data, default=str).encode("utf-8"), 1)
+
+    @staticmethod
+    def _decode(blob: bytes) -> dict:
+        """Deserialize compressed JSON."""
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    @staticmethod
+    def _document_digest(doc_data: dict, doc: Document) -> str:
+        """Digest of a document's metadata and stored content, to skip unchanged rows."""
+        metadata = {key: value for key, value in doc_data.items() if key != "content"}
+        digest = hashlib.sha256(json.dumps(metadata, sort_keys=True, default=str).encode("utf-8"))
+        # Lazy bodies are not stored, so reading them is unnecessary
+        if doc_data.get("content") is not None:
+            digest.update(doc.fingerprint.encode("ascii"))
+        return digest.hexdigest()
+
+    def save(self, project: ProjectState):
+        """
+        Persist a project, rewriting only documents that changed.
+
+        Args:
+            project: Project to save
+
+        Raises:
+            sqlite3.Error: If the write fails
+        """
+        state = self._encode(project.to_dict())
+        with self._lock, self._conn:
+            stored = dict(self._conn.execute(
+                "SELECT position, digest FROM documents WHERE project_id = ?",
+                (project.project_id,)
+            ))
+            for position, doc in enumerate(project.documents):
+                doc_data = doc.to_dict(include_content=False)
+                digest = self._document_digest(doc_data, doc)
+                if stored.get(position) == digest:
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents (project_id, position, digest, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (project.project_id, position, digest, self._encode(doc_data))
+                )
+            self._conn.execute(
+                "DELETE FROM documents WHERE project_id = ? AND position >= ?",
+                (project.project_id, len(project.documents))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects (project_id, data, updated_at) VALUES (?, ?, ?)",
+                (project.project_id, state, datetime.now().isoformat())
+            )
+
+    def load(self, project_id: str) -> Optional[ProjectState]:
+        """
+        Load a project.
+
+        Args:
+            project_id: Project identifier
+
+        Returns:
+            ProjectState, or None if the project is not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM projects WHERE project_id = ?", (project_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            documents = self._conn.execute(
+                "SELECT data FROM documents WHERE project_id = ? ORDER BY position",
+                (project_id,)
+            ).fetchall()
+
+        data = self._decode(row[0])
+        data["documents"] = [self._decode(doc_row[0]) for doc_row in documents]
+        return ProjectState.from_dict(data)
+
+    def delete(self, project_id: str) -> bool:
+        """Delete a project. Returns True if it was stored."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE project_id = ?", (project_id,))
+            deleted = self._conn.execute(
+                "DELETE FROM projects WHERE project_id = ?", (project_id,)
+            ).rowcount
+        return deleted > 0
+
+    def list_project_ids(self) -> List[str]:
+        """List stored project IDs."""
+        with self._lock:
+            rows = self._conn.execute("SELECT project_id FROM projects ORDER BY project_id").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,410 @@
+"""Per-tool latency and resource metrics for the MCP server."""
+
+import contextvars
+import json
+import random
+import re
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .tracing import span
+
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+BYTES_BUCKETS = tuple(1 << shift for shift in range(16, 32, 2))  # 64 KB .. 1 GB
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style: cumulative buckets, sum, count)."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds; larger values fall in +Inf
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max)
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Get (upper bound, cumulative count) pairs, ending with +Inf."""
+        pairs = []
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            pairs.append((f"{bound:g}", seen))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for serialization."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "max": round(self.max, 3),
+            "p50": round(self.quantile(0.5), 3),
+            "p95": round(self.quantile(0.95), 3),
+            "p99": round(self.quantile(0.99), 3),
+        }
+
+
+class CallRecord:
+    """Measurements for one tool invocation in progress."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.error = False
+        # Stage name -> milliseconds, in first-entered order
+        self.stages: Dict[str, float] = {}
+        # Service -> [calls, errors, milliseconds]
+        self.http: Dict[str, List[float]] = {}
+        self._lock = Lock()
+
+    def add_stage(self, name: str, elapsed_ms: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+
+    def add_http(self, service: str, elapsed_ms: float, ok: bool):
+        with self._lock:
+            totals = self.http.setdefault(service, [0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += 0 if ok else 1
+            totals[2] += elapsed_ms
+
+
+# The invocation being measured; copied into worker threads running sync tools
+_current_call: contextvars.ContextVar[Optional[CallRecord]] = contextvars.ContextVar("current_tool_call", default=None)
+
+
+class ToolMetrics:
+    """
+    Latency and resource metrics per MCP tool.
+
+    Each invocation records wall time, process CPU time and outbound HTTP
+    calls per service (see `http_call`); a sampled fraction of invocations
+    also record peak traced allocation with tracemalloc. Code running inside
+    a tool can mark named stages with `stage`, which are reported in the
+    slow-call log.
+
+    CPU time is the process's, so it includes work from calls that overlap;
+    sampled allocation peaks are likewise process-wide while sampled calls
+    overlap.
+    """
+
+    def __init__(self):
+        """Initialize with sampling and the slow-call log off; see `configure`."""
+        self.alloc_sample_rate = 0.0
+        self.slow_call_ms = 0.0
+        self.slow_call_log: Optional[str] = None
+        self._wall: Dict[str, Histogram] = {}
+        self._cpu: Dict[str, Histogram] = {}
+        self._alloc: Dict[str, Histogram] = {}
+        self._errors: Dict[str, int] = {}
+        # (tool, service) -> latency histogram; errors counted separately
+        self._http: Dict[Tuple[str, str], Histogram] = {}
+        self._http_errors: Dict[Tuple[str, str], int] = {}
+        self._slow_calls = 0
+        self._lock = Lock()
+        self._tracing_calls = 0
+        self._owns_tracing = False
+
+    def configure(self, alloc_sample_rate: float = 0.0, slow_call_ms: float = 0.0,
+                  slow_call_log: Optional[str] = None):
+        """
+        Set sampling and slow-call logging.
+
+        Args:
+            alloc_sample_rate: Fraction of invocations traced with tracemalloc (0 = none)
+            slow_call_ms: Log invocations at least this slow (0 = off)
+            slow_call_log: File to append slow calls to as JSON lines (default: stderr)
+        """
+        self.alloc_sample_rate = alloc_sample_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_log = slow_call_log
+
+    @contextmanager
+    def measure(self, tool: str, arguments: Optional[Dict] = None) -> Iterator[CallRecord]:
+        """
+        Measure one tool invocation.
+
+        Args:
+            tool: Tool name
+            arguments: Call arguments, shown in the slow-call log
+
+        Yields:
+            The invocation's CallRecord (set `error` on a failed result)
+        """
+        record = CallRecord(tool)
+        token = _current_call.set(record)
+        sampled = self.alloc_sample_rate > 0 and random.random() < self.alloc_sample_rate
+        alloc_base = self._start_tracing() if sampled else 0
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.error = True
+            raise
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            alloc = self._stop_tracing(alloc_base) if sampled else None
+            _current_call.reset(token)
+            self._finish(record, wall_ms, cpu_ms, alloc, arguments)
+
+    def _start_tracing(self) -> int:
+        """Start (or join) tracemalloc tracing and return traced memory at the start."""
+        with self._lock:
+            if self._tracing_calls == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            self._tracing_calls += 1
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+
+    def _stop_tracing(self, base: int) -> int:
+        """Get peak traced allocation above `base`, stopping tracing if no sampled call remains."""
+        with self._lock:
+            _, peak = tracemalloc.get_traced_memory()
+            self._tracing_calls -= 1
+            if self._tracing_calls == 0 and self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+            return max(0, peak - base)
+
+    def _finish(self, record: CallRecord, wall_ms: float, cpu_ms: float,
+                alloc: Optional[int], arguments: Optional[Dict]):
+        """Fold a finished invocation into the histograms and log it if slow."""
+        with self._lock:
+            tool = record.tool
+            if tool not in self._wall:
+                self._wall[tool] = Histogram(LATENCY_BUCKETS_MS)
+                self._cpu[tool] = Histogram(LATENCY_BUCKETS_MS)
+                self._alloc[tool] = Histogram(BYTES_BUCKETS)
+                self._errors[tool] = 0
+            self._wall[tool].observe(wall_ms)
+            self._cpu[tool].observe(cpu_ms)
+            if alloc is not None:
+                self._alloc[tool].observe(alloc)
+            if record.error:
+                self._errors[tool] += 1
+            slow = self.slow_call_ms > 0 and wall_ms >= self.slow_call_ms
+            if slow:
+                self._slow_calls += 1
+
+        if slow:
+            self._log_slow_call(record, wall_ms, cpu_ms, alloc, arguments)
+
+    def _log_slow_call(self, record: CallRecord, wall_ms: float, cpu_ms: float,
+                       alloc: Optional[int], arguments: Optional[Dict]):
+        """Write a slow invocation, with its stage breakdown, as one JSON line."""
+        entry = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "tool": record.tool,
+            "wall_ms": round(wall_ms, 1),
+            "cpu_ms": round(cpu_ms, 1),
+            "alloc_bytes": alloc,
+            "error": record.error,
+            "stages": {name: round(ms, 1) for name, ms in record.stages.items()},
+            "http": {
+                service: {"calls": int(calls), "errors": int(errors), "ms": round(ms, 1)}
+                for service, (calls, errors, ms) in record.http.items()
+            },
+            # Long values (e.g. raw text being ingested) are cut short
+            "arguments": {
+                name: value if not isinstance(value, str) or len(value) <= 80 else value[:77] + "..."
+                for name, value in (arguments or {}).items()
+            },
+        }
+        line = json.dumps(entry, default=str)
+        try:
+            if self.slow_call_log:
+                with open(self.slow_call_log, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            else:
+                print(f"Slow tool call: {line}", file=sys.stderr)
+        except OSError as e:
+            print(f"Warning: Could not write slow call log: {e}", file=sys.stderr)
+
+    def record_http(self, service: str, elapsed_ms: float, ok: bool):
+        """
+        Record one outbound HTTP request.
+
+        Args:
+            service: Remote service ("convex", "merge")
+            elapsed_ms: Request latency in milliseconds
+            ok: False if the request failed
+        """
+        record = _current_call.get()
+        if record is not None:
+            record.add_http(service, elapsed_ms, ok)
+        key = (record.tool if record is not None else "", service)
+        with self._lock:
+            histogram = self._http.get(key)
+            if histogram is None:
+                histogram = self._http[key] = Histogram(LATENCY_BUCKETS_MS)
+                self._http_errors[key] = 0
+            histogram.observe(elapsed_ms)
+            if not ok:
+                self._http_errors[key] += 1
+
+    def snapshot(self) -> Dict:
+        """Get per-tool and per-service summaries."""
+        with self._lock:
+            return {
+                "tools": {
+                    tool: {
+                        "calls": self._wall[tool].count,
+                        "errors": self._errors[tool],
+                        "wall_ms": self._wall[tool].to_dict(),
+                        "cpu_ms": self._cpu[tool].to_dict(),
+                        "alloc_bytes": self._alloc[tool].to_dict(),
+                    }
+                    for tool in sorted(self._wall)
+                },
+                "http": [
+                    {"tool": tool, "service": service, "errors": self._http_errors[(tool, service)],
+                     "latency_ms": histogram.to_dict()}
+                    for (tool, service), histogram in sorted(self._http.items())
+                ],
+                "alloc_sample_rate": self.alloc_sample_rate,
+                "slow_call_ms": self.slow_call_ms,
+                "slow_calls": self._slow_calls,
+            }
+
+    def prometheus(self, gauges: Optional[Dict[str, Dict]] = None) -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Args:
+            gauges: Extra stats by section (e.g. {"state_cache": {...}}); their
+                numeric values are exported as `offbench_<section>_<key>`
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: Dict[Tuple[Tuple[str, str], ...], Histogram]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series.items():
+                label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+                for bound, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{label_text}}} {hist.sum:.6g}")
+                lines.append(f"{name}_count{{{label_text}}} {hist.count}")
+
+        def counter(name: str, help_text: str, series: Dict[Tuple[Tuple[str, str], ...], int]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        with self._lock:
+            tools = sorted(self._wall)
+            histogram("offbench_tool_duration_ms", "Tool wall time in milliseconds",
+                      {(("tool", tool),): self._wall[tool] for tool in tools})
+            histogram("offbench_tool_cpu_ms", "Process CPU time during tool calls in milliseconds",
+                      {(("tool", tool),): self._cpu[tool] for tool in tools})
+            histogram("offbench_tool_alloc_bytes", "Peak traced allocation of sampled tool calls in bytes",
+                      {(("tool", tool),): self._alloc[tool] for tool in tools})
+            counter("offbench_tool_errors_total", "Tool calls that failed or returned an error",
+                    {(("tool", tool),): self._errors[tool] for tool in tools})
+            http_keys = sorted(self._http)
+            histogram("offbench_http_request_duration_ms", "Outbound HTTP request latency in milliseconds",
+                      {(("tool", tool), ("service", service)): self._http[(tool, service)]
+                       for tool, service in http_keys})
+            counter("offbench_http_errors_total", "Outbound HTTP requests that failed",
+                    {(("tool", tool), ("service", service)): self._http_errors[(tool, service)]
+                     for tool, service in http_keys})
+            counter("offbench_slow_tool_calls_total", "Tool calls over the slow-call threshold",
+                    {(): self._slow_calls})
+
+        for section, stats in (gauges or {}).items():
+            for key, value in stats.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    name = re.sub(r"[^a-zA-Z0-9_]", "_", f"offbench_{section}_{key}")
+                    lines.append(f"# TYPE {name} gauge")
+                    lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a named stage of the current tool call, also as a tracing span.
+
+    Repeated stages with the same name are summed in the slow-call log.
+    """
+    record = _current_call.get()
+    with span(name):
+        if record is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.add_stage(name, (time.perf_counter() - start) * 1000)
+
+
+@contextmanager
+def http_call(service: str) -> Iterator[None]:
+    """
+    Time one outbound HTTP request; an exception counts as a failed request.
+
+    Args:
+        service: Remote service ("convex", "merge")
+    """
+    start = time.perf_counter()
+    ok = False
+    try:
+        with span(f"{service}.request"):
+            yield
+        ok = True
+    finally:
+        tool_metrics.record_http(service, (time.perf_counter() - start) * 1000, ok)
+
+
+# Shared metrics for all tools
+tool_metrics = ToolMetrics()
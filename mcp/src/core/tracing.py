@@ -0,0 +1,288 @@
+"""Lightweight tracing: nested spans kept in a ring buffer or exported as OTLP JSON."""
+
+import contextvars
+import functools
+import json
+import random
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns",
+                 "_perf_start", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        # Wall-clock start for export; the duration comes from a monotonic clock
+        self.start_ns = time.time_ns()
+        self._perf_start = time.perf_counter_ns()
+        self.end_ns = 0
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute (str, bool, int or float) to the span."""
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        """Mark the span as failed."""
+        self.error = message
+
+    def _end(self):
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._perf_start)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# The innermost open span; copied into asyncio tasks and threads started via anyio
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Collects spans into traces.
+
+    A span opened with no span open becomes the root of a new trace; spans
+    opened inside it become its children. When the root ends, the trace is
+    kept in a ring buffer of recent traces and, if an export path is set,
+    appended to it as one OTLP/JSON `ExportTraceServiceRequest` line (the
+    format read by the OpenTelemetry Collector's otlpjsonfile receiver).
+    Spans are not propagated to worker processes.
+    """
+
+    def __init__(self):
+        """Initialize disabled; see `configure`."""
+        self.enabled = False
+        self.max_spans = 1000
+        self.export_path: Optional[str] = None
+        self.service_name = "offbench-mcp"
+        self._traces: Deque[List[Span]] = deque(maxlen=100)
+        # trace id -> finished spans of traces whose root is still open
+        self._open: Dict[str, List[Span]] = {}
+        self._dropped: Dict[str, int] = {}
+        self._lock = Lock()
+        self.exported = 0
+
+    def configure(self, enabled: bool = True, buffer_size: int = 100, max_spans: int = 1000,
+                  export_path: Optional[str] = None):
+        """
+        Enable tracing and set where traces go.
+
+        Args:
+            enabled: Record spans
+            buffer_size: Recent traces kept in memory
+            max_spans: Spans kept per trace; later ones are counted as dropped
+            export_path: File to append traces to as OTLP/JSON lines (optional)
+        """
+        with self._lock:
+            self.enabled = enabled
+            self.max_spans = max_spans
+            self.export_path = export_path
+            self._traces = deque(self._traces, maxlen=max(1, buffer_size))
+
+    def _start(self, name: str, attributes: Dict[str, Any]) -> Span:
+        parent = _current_span.get()
+        if parent is None:
+            return Span(name, f"{random.getrandbits(128):032x}", None, attributes)
+        return Span(name, parent.trace_id, parent.span_id, attributes)
+
+    def _finish(self, span: Span):
+        span._end()
+        with self._lock:
+            if span.parent_id is not None:
+                spans = self._open.setdefault(span.trace_id, [])
+                if len(spans) < self.max_spans - 1:
+                    spans.append(span)
+                else:
+                    self._dropped[span.trace_id] = self._dropped.get(span.trace_id, 0) + 1
+                return
+            # The root ended: the trace is complete (children finishing later are lost)
+            spans = self._open.pop(span.trace_id, [])
+            dropped = self._dropped.pop(span.trace_id, 0)
+            if dropped:
+                span.attributes["dropped_spans"] = dropped
+            spans.append(span)
+            spans.sort(key=lambda s: s.start_ns)
+            self._traces.append(spans)
+        if self.export_path:
+            self._export(spans)
+
+    def _export(self, spans: List[Span]):
+        """Append one trace to the export file."""
+        try:
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_otlp([spans]), separators=(",", ":")) + "\n")
+            self.exported += 1
+        except OSError as e:
+            print(f"Warning: Could not export trace: {e}", file=sys.stderr)
+
+    def recent(self, limit: int = 10, name: Optional[str] = None) -> List[List[Span]]:
+        """
+        Get recent traces, newest first.
+
+        Args:
+            limit: Maximum traces to return
+            name: Only traces whose root span has this name
+        """
+        with self._lock:
+            traces = list(self._traces)
+        traces.reverse()
+        if name:
+            traces = [spans for spans in traces if spans[0].name == name]
+        return traces[:limit]
+
+    def clear(self):
+        """Forget buffered traces."""
+        with self._lock:
+            self._traces.clear()
+
+    def stats(self) -> Dict:
+        """Get buffer and export counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "buffered_traces": len(self._traces),
+                "buffer_size": self._traces.maxlen,
+                "open_traces": len(self._open),
+                "exported": self.exported,
+            }
+
+    def to_otlp(self, traces: List[List[Span]]) -> Dict:
+        """Convert traces to an OTLP/JSON ExportTraceServiceRequest."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "offbench"},
+                    "spans": [_otlp_span(span) for spans in traces for span in spans],
+                }],
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict:
+    """Encode one attribute as an OTLP KeyValue (64-bit ints are strings in OTLP/JSON)."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def _otlp_span(span: Span) -> Dict:
+    """Encode one span as OTLP/JSON."""
+    return {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent_id or "",
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+        # STATUS_CODE_ERROR / STATUS_CODE_UNSET
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+    }
+
+
+def trace_tree(spans: List[Span]) -> Dict:
+    """
+    Nest a trace's spans under their parents for display.
+
+    Returns:
+        The root span as a dict, with `children` in start order
+    """
+    nodes = {}
+    for span in spans:
+        nodes[span.span_id] = {
+            "name": span.name,
+            "duration_ms": round(span.duration_ms, 3),
+            "offset_ms": round((span.start_ns - spans[0].start_ns) / 1e6, 3),
+            **({"attributes": span.attributes} if span.attributes else {}),
+            **({"error": span.error} if span.error else {}),
+            "children": [],
+        }
+    root = None
+    for span in spans:
+        parent = nodes.get(span.parent_id) if span.parent_id else None
+        if parent is not None:
+            parent["children"].append(nodes[span.span_id])
+        elif span.parent_id is None:
+            root = nodes[span.span_id]
+    root = root or nodes[spans[0].span_id]
+    root["trace_id"] = spans[0].trace_id
+    root["start"] = datetime.fromtimestamp(spans[0].start_ns / 1e9, timezone.utc).isoformat()
+    return root
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Trace a block as a span, nested under the enclosing span if any.
+
+    An exception leaving the block marks the span as failed.
+
+    Args:
+        name: Span name (e.g. "analyze.gaps")
+        **attributes: Initial span attributes
+
+    Yields:
+        The span, for adding attributes
+    """
+    if not tracer.enabled:
+        yield _NOOP_SPAN
+        return
+    current = tracer._start(name, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer._finish(current)
+
+
+def traced(name: str) -> Callable:
+    """Decorator tracing every call of a function as a span."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Shared tracer for the server
+tracer = Tracer()
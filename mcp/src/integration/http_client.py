@@ -0,0 +1,67 @@
+"""Shared HTTP settings for the async API clients."""
+
+import httpx
+from typing import Optional
+from config import config
+
+
+def http2_available() -> bool:
+    """Check if HTTP/2 support (the h2 package) is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_async_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """
+    Create a pooled async HTTP client.
+
+    Connections are kept alive and reused across requests within the
+    HTTP_* pool limits. HTTP/2 is used when HTTP2_ENABLED is set and the h2
+    package is installed (`pip install httpx[http2]`), so many concurrent
+    calls share one connection.
+
+    Args:
+        timeout: Request timeout in seconds
+
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    http2 = config.HTTP2_ENABLED
+    if http2 and not http2_available():
+        print("Warning: HTTP2_ENABLED is set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=timeout,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def backoff_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Get seconds to wait before retrying a request.
+
+    Args:
+        attempt: Zero-based attempt that failed
+        response: Failed response, if any
+
+    Returns:
+        The server's Retry-After (in seconds) if given, else exponential backoff
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                # HTTP-date form; fall back to exponential backoff
+                pass
+    return float(2 ** attempt)
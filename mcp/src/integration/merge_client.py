@@ -1,9 +1,41 @@
 """Merge API client for Google Drive integration."""
 
+import asyncio
 import httpx
 import time
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any
+from urllib.parse import urlencode
 from config import config
+from core.tool_metrics import http_call
+from integration.http_client import backoff_delay, create_async_client
+from integration.rate_limiter import AsyncRateLimiter
+
+
+def _retry_delay(error: Exception, attempt: int, retries: int) -> Optional[float]:
+    """
+    Get the delay before retrying a failed request, or None if it is not retried.
+    
+    Rate limits (429), server errors and network failures are retried; a
+    429's Retry-After is honored.
+    """
+    if attempt >= retries - 1:
+        return None
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status == 429 or status >= 500:
+            return backoff_delay(attempt, error.response)
+        return None
+    if isinstance(error, httpx.RequestError):
+        return backoff_delay(attempt)
+    return None
+
+
+def _folder_files_path(folder_id: str, page_size: int, cursor: Optional[str] = None) -> str:
+    """Build the API path for one page of a folder listing."""
+    params = {"folder_id": folder_id, "page_size": page_size}
+    if cursor:
+        params["cursor"] = cursor
+    return f"/files?{urlencode(params)}"
 
 
 class MergeClient:
@@ -66,32 +98,21 @@ class MergeClient:
         last_error = None
         for attempt in range(retries):
             try:
-                if method == "GET":
-                    response = self.client.get(url, headers=headers)
-                elif method == "POST":
-                    response = self.client.post(url, json=data, headers=headers)
-                else:
+                if method not in ("GET", "POST"):
                     raise ValueError(f"Unsupported method: {method}")
-                
-                response.raise_for_status()
+                with http_call("merge"):
+                    if method == "GET":
+                        response = self.client.get(url, headers=headers)
+                    else:
+                        response = self.client.post(url, json=data, headers=headers)
+                    response.raise_for_status()
                 return response.json()
             
-            except httpx.HTTPStatusError as e:
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
                 last_error = e
-                if e.response.status_code == 429:  # Rate limited
-                    if attempt < retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                        continue
-                elif e.response.status_code >= 500 and attempt < retries - 1:
-                    # Retry on server errors
-                    time.sleep(2 ** attempt)
-                    continue
-                raise
-            
-            except httpx.RequestError as e:
-                last_error = e
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
+                delay = _retry_delay(e, attempt, retries)
+                if delay is not None:
+                    time.sleep(delay)  # Exponential backoff (or Retry-After)
                     continue
                 raise
         
@@ -115,6 +136,44 @@ class MergeClient:
         # TODO: Implement when portal tables are available
         raise NotImplementedError("Integration token retrieval not yet implemented")
     
+    def iter_folder_files(
+        self,
+        folder_id: str,
+        account_token: str,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Iterate over files in a Google Drive folder, page by page.
+        
+        Follows Merge's `next` cursors until the listing is exhausted. Files
+        are yielded as each page arrives, so callers can start on the first
+        page while later ones are still being fetched, and only one page is
+        held in memory at a time.
+        
+        Args:
+            folder_id: Google Drive folder ID
+            account_token: Account token for authentication
+            page_size: Files per page (defaults to MERGE_PAGE_SIZE)
+            
+        Yields:
+            File metadata dictionaries
+        """
+        page_size = page_size or config.MERGE_PAGE_SIZE
+        cursor = None
+        while True:
+            try:
+                response = self._make_request(
+                    "GET",
+                    _folder_files_path(folder_id, page_size, cursor),
+                    account_token=account_token
+                )
+            except Exception as e:
+                raise Exception(f"Failed to list folder files: {str(e)}")
+            yield from response.get("results", [])
+            cursor = response.get("next")
+            if not cursor:
+                return
+    
     def list_folder_files(self, folder_id: str, account_token: str) -> List[Dict]:
         """
         List files in a Google Drive folder.
@@ -124,17 +183,9 @@ class MergeClient:
             account_token: Account token for authentication
             
         Returns:
-            List of file metadata dictionaries
+            List of file metadata dictionaries (all pages)
         """
-        try:
-            response = self._make_request(
-                "GET",
-                f"/files?folder_id={folder_id}",
-                account_token=account_token
-            )
-            return response.get("results", [])
-        except Exception as e:
-            raise Exception(f"Failed to list folder files: {str(e)}")
+        return list(self.iter_folder_files(folder_id, account_token))
     
     def download_file(self, file_id: str, account_token: str) -> bytes:
         """
@@ -167,8 +218,9 @@ class MergeClient:
             headers = self._get_headers()
             headers["X-Account-Token"] = account_token
             
-            response = self.client.get(download_url, headers=headers)
-            response.raise_for_status()
+            with http_call("merge"):
+                response = self.client.get(download_url, headers=headers)
+                response.raise_for_status()
             
             return response.content
             
@@ -205,4 +257,209 @@ class MergeClient:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.close()
\ No newline at end of file
+        self.close()
+
+
+class AsyncMergeClient:
+    """
+    Async client for Merge API, for use from async tool handlers.
+    
+    Requests go through a pooled keep-alive client (optionally HTTP/2) and
+    retries back off with `asyncio.sleep`, so rate-limited or slow calls
+    don't block other work. With a rate limiter, every request (including
+    downloads) spends from its budget and a 429 pauses all callers sharing
+    it. Same API and semantics as MergeClient, as coroutines.
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None
+    ):
+        """
+        Initialize async Merge API client.
+        
+        Args:
+            api_key: Merge API key for authentication
+            client: Optional shared httpx.AsyncClient (a pooled one is created if not provided)
+            rate_limiter: Optional request budget shared with other callers
+        """
+        self.api_key = api_key
+        self.base_url = config.MERGE_API_BASE_URL
+        self.client = client or create_async_client(timeout=30.0)
+        self._owns_client = client is None
+        self.rate_limiter = rate_limiter
+    
+    def _get_headers(self, account_token: Optional[str] = None) -> Dict[str, str]:
+        """Get headers for Merge API requests."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "X-Account-Token": account_token or "",
+        }
+    
+    async def _get(
+        self,
+        url: str,
+        account_token: Optional[str] = None,
+        retries: int = 3
+    ) -> httpx.Response:
+        """
+        GET a Merge URL with non-blocking retry logic.
+        
+        Args:
+            url: Absolute URL
+            account_token: Account token for the request
+            retries: Number of retry attempts
+            
+        Returns:
+            Successful response
+            
+        Raises:
+            Exception on failure after all retries
+        """
+        headers = self._get_headers(account_token)
+        
+        last_error = None
+        for attempt in range(retries):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            try:
+                with http_call("merge"):
+                    response = await self.client.get(url, headers=headers)
+                    response.raise_for_status()
+                return response
+            
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                last_error = e
+                delay = _retry_delay(e, attempt, retries)
+                if (self.rate_limiter and isinstance(e, httpx.HTTPStatusError)
+                        and e.response.status_code == 429):
+                    # Back off every caller sharing the budget, not just this one
+                    self.rate_limiter.pause(delay if delay is not None else backoff_delay(attempt, e.response))
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+                raise
+        
+        raise last_error or Exception("Request failed after all retries")
+    
+    async def _make_request(self, path: str, account_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        GET from Merge API.
+        
+        Args:
+            path: API path
+            account_token: Account token for the request
+            
+        Returns:
+            Response data as dictionary
+        """
+        response = await self._get(f"{self.base_url}{path}", account_token=account_token)
+        return response.json()
+    
+    async def iter_folder_files(
+        self,
+        folder_id: str,
+        account_token: str,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Iterate over files in a Google Drive folder, page by page.
+        
+        See MergeClient.iter_folder_files.
+        
+        Args:
+            folder_id: Google Drive folder ID
+            account_token: Account token for authentication
+            page_size: Files per page (defaults to MERGE_PAGE_SIZE)
+            
+        Yields:
+            File metadata dictionaries
+        """
+        page_size = page_size or config.MERGE_PAGE_SIZE
+        cursor = None
+        while True:
+            try:
+                response = await self._make_request(
+                    _folder_files_path(folder_id, page_size, cursor),
+                    account_token=account_token
+                )
+            except Exception as e:
+                raise Exception(f"Failed to list folder files: {str(e)}")
+            for file_info in response.get("results", []):
+                yield file_info
+            cursor = response.get("next")
+            if not cursor:
+                return
+    
+    async def list_folder_files(self, folder_id: str, account_token: str) -> List[Dict]:
+        """
+        List files in a Google Drive folder.
+        
+        Args:
+            folder_id: Google Drive folder ID
+            account_token: Account token for authentication
+            
+        Returns:
+            List of file metadata dictionaries (all pages)
+        """
+        return [file_info async for file_info in self.iter_folder_files(folder_id, account_token)]
+    
+    async def download_file(self, file_id: str, account_token: str) -> bytes:
+        """
+        Download file content from Google Drive.
+        
+        Args:
+            file_id: Google Drive file ID
+            account_token: Account token for authentication
+            
+        Returns:
+            File content as bytes
+            
+        Raises:
+            Exception if download fails
+        """
+        try:
+            # First get file metadata to get download URL
+            file_info = await self._make_request(f"/files/{file_id}", account_token=account_token)
+            
+            download_url = file_info.get("download_url")
+            if not download_url:
+                raise Exception("No download URL available for file")
+            
+            response = await self._get(download_url, account_token=account_token)
+            return response.content
+            
+        except Exception as e:
+            raise Exception(f"Failed to download file {file_id}: {str(e)}")
+    
+    async def get_file_metadata(self, file_id: str, account_token: str) -> Dict:
+        """
+        Get file metadata from Google Drive.
+        
+        Args:
+            file_id: Google Drive file ID
+            account_token: Account token for authentication
+            
+        Returns:
+            File metadata dictionary
+        """
+        try:
+            return await self._make_request(f"/files/{file_id}", account_token=account_token)
+        except Exception as e:
+            raise Exception(f"Failed to get file metadata: {str(e)}")
+    
+    async def aclose(self):
+        """Close the HTTP client if owned by this instance."""
+        if self._owns_client:
+            await self.client.aclose()
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
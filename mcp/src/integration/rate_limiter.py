@@ -0,0 +1,51 @@
+"""Shared request budget for concurrent API calls."""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket shared by concurrent coroutines.
+
+    Requests spend one token each; tokens refill at `rate` per second up to
+    `burst`. When the API answers 429, `pause` stops every caller, not just
+    the one that was throttled, until the server's backoff has elapsed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Sustained requests per second (0 = unlimited, only 429 pauses apply)
+            burst: Requests allowed back to back before throttling
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Hold back all callers for `seconds` (e.g. a 429's Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
@@ -7,23 +7,36 @@ import sys
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
 
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 
 # Import storage layer
 from storage import get_storage_provider, FolderType
+from storage.local_provider import LocalStorageProvider
 
 # Import models and core logic
-from models.document import Document, DocumentType
+from models.document import ContentRef, Document, DocumentType, infer_document_type, resident_bodies
 from models.project_state import ProjectState, ProjectConfig
-from core.state_manager import ProjectStateManager
+from models.analysis import AnalysisResult
+from core.state_manager import ProjectStateManager, with_project_lock
+from core.state_store import ProjectStateStore
 from core.analyzer import DiscoveryAnalyzer
+from core.batch_analyzer import BatchAnalyzer, project_fingerprint
+from core.folder_watcher import FolderWatcher
+from core.search_index import SearchIndexes
+from core.sentence_index import prepared_texts
+from core.tool_metrics import stage, tool_metrics
+from core.tracing import span, trace_tree, traced, tracer
 
 # Import Convex integration
 from config import config
-from persistence import ConvexSync
+from persistence import AsyncConvexClient, ConvexSync, SyncLedger
 
 # Create FastMCP instance
 mcp = FastMCP(name="OffBench")
@@ -37,6 +50,18 @@ TEMPLATES_PATH = str(BASE_PATH / "templates")
 IS_RAILWAY = os.getenv("RAILWAY_ENVIRONMENT") is not None or os.getenv("PORT") is not None
 IS_LOCAL = not IS_RAILWAY
 
+def _local_storage():
+    """Create the local storage provider, with its directory catalog settings."""
+    catalog_path = None
+    if config.PERSIST_DIRECTORY_CATALOG:
+        catalog_path = config.DIRECTORY_CATALOG_PATH or str(Path(TEST_DATA_PATH) / ".state" / "catalog.json")
+    return get_storage_provider(
+        "local",
+        base_path=TEST_DATA_PATH,
+        catalog_path=catalog_path,
+        catalog_revalidate_seconds=config.DIRECTORY_CATALOG_REVALIDATE_SECONDS
+    )
+
 # Initialize storage provider based on environment
 if config.USE_INTEGRATION_STORAGE and config.is_convex_enabled() and config.MERGE_API_KEY:
     # Integration mode - use Convex + Merge
@@ -50,23 +75,143 @@ if config.USE_INTEGRATION_STORAGE and config.is_convex_enabled() and config.MERG
         storage = get_storage_provider(
             "integration",
             convex_client=convex_client,
-            merge_client=merge_client
+            merge_client=merge_client,
+            cache_dir=config.INTEGRATION_CACHE_DIR or str(Path(TEST_DATA_PATH) / ".state" / "integration")
         )
         print("🔗 Integration storage enabled - using Convex + Merge API")
     except Exception as e:
         print(f"Warning: Could not initialize integration storage: {e}")
         print("Falling back to local storage")
-        storage = get_storage_provider("local", base_path=TEST_DATA_PATH)
+        storage = _local_storage()
 else:
     # Local development - use test-data folder
     print("🏠 Local environment detected - using test-data folder")
-    storage = get_storage_provider("local", base_path=TEST_DATA_PATH)
+    storage = _local_storage()
+
+# Bound memory held by lazily loaded document bodies
+resident_bodies.max_chars = config.DOCUMENT_BODY_BUDGET_MB * 1024 * 1024
+
+# Analyze large local files through a memory map instead of loading them
+DiscoveryAnalyzer.mapped_scan_min_bytes = config.MAPPED_SCAN_MIN_MB * 1024 * 1024
+
+# Persist project state so a restart does not require re-ingesting
+if config.PERSIST_PROJECT_STATE:
+    try:
+        state_store_path = config.STATE_STORE_PATH or str(
+            Path(getattr(storage, "base_path", TEST_DATA_PATH)) / ".state" / "projects.db"
+        )
+        ProjectStateManager.configure(
+            store=ProjectStateStore(state_store_path),
+            max_projects=config.STATE_MAX_PROJECTS
+        )
+    except Exception as e:
+        print(f"Warning: Could not open project state store: {e}")
+        print("Project state will be kept in memory only")
+
+# Per-project inverted indexes for query(), built at ingest
+search_indexes = SearchIndexes(max_projects=config.STATE_MAX_PROJECTS)
+
+
+
+def _resource_stats() -> Dict[str, Dict]:
+    """Get sizes and counters of the server's caches, by section."""
+    stats = {
+        "state_cache": ProjectStateManager().stats(),
+        "search_index": search_indexes.stats(),
+        "prepared_texts": prepared_texts.stats(),
+        "findings_cache": DiscoveryAnalyzer.cache_stats(),
+        "document_bodies": resident_bodies.stats(),
+        "tracing": tracer.stats(),
+    }
+    catalog = getattr(storage, "catalog", None)
+    if catalog is not None:
+        stats["directory_catalog"] = catalog.stats()
+    if folder_watcher is not None:
+        stats["folder_watcher"] = folder_watcher.stats()
+    blob_cache = getattr(storage, "blob_cache", None)
+    if blob_cache is not None:
+        stats["blob_cache"] = blob_cache.stats()
+    return stats
+
+
+def _metrics_snapshot() -> Dict:
+    """Get tool metrics, cache stats and the slowest analyzer patterns."""
+    return {
+        **tool_metrics.snapshot(),
+        "resources": _resource_stats(),
+        "slowest_patterns": DiscoveryAnalyzer.pattern_stats()[:20],
+    }
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records wall time, CPU, sampled allocation and HTTP calls of every tool call."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        with tool_metrics.measure(context.message.name, context.message.arguments) as record:
+            result = await call_next(context)
+            # Tools report failures as {"error": ...} rather than raising
+            structured = getattr(result, "structured_content", None)
+            record.error = isinstance(structured, dict) and "error" in structured
+            return result
+
+
+class TracingMiddleware(Middleware):
+    """Opens a root span per tool call, so stages and pipeline spans nest under it."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        # Scalar arguments label the trace; long text is cut short
+        attributes = {
+            name: value[:80] if isinstance(value, str) else value
+            for name, value in (context.message.arguments or {}).items()
+            if isinstance(value, (str, bool, int, float))
+        }
+        with span(f"tool.{context.message.name}", **attributes) as root:
+            result = await call_next(context)
+            structured = getattr(result, "structured_content", None)
+            if isinstance(structured, dict) and "error" in structured:
+                root.set_error(str(structured["error"]))
+            return result
+
+
+if config.TRACING_ENABLED:
+    tracer.configure(
+        buffer_size=config.TRACE_BUFFER_SIZE,
+        max_spans=config.TRACE_MAX_SPANS,
+        export_path=config.TRACE_EXPORT_PATH
+    )
+    mcp.add_middleware(TracingMiddleware())
+
+if config.TOOL_METRICS_ENABLED:
+    tool_metrics.configure(
+        alloc_sample_rate=config.TOOL_METRICS_ALLOC_SAMPLE_RATE,
+        slow_call_ms=config.SLOW_TOOL_CALL_MS,
+        slow_call_log=config.SLOW_TOOL_CALL_LOG
+    )
+    mcp.add_middleware(ToolMetricsMiddleware())
+    
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_endpoint(request: Request):
+        """Serve metrics in Prometheus text format, or as JSON with ?format=json."""
+        if request.query_params.get("format") == "json":
+            return JSONResponse(_metrics_snapshot())
+        return PlainTextResponse(
+            tool_metrics.prometheus(_resource_stats()),
+            media_type="text/plain; version=0.0.4"
+        )
 
 # Initialize Convex sync (optional - only if configured)
 convex_sync = None
+async_convex = None
 if config.is_convex_enabled():
     try:
-        convex_sync = ConvexSync()
+        # Record what was pushed so re-syncs only send changes
+        sync_ledger_path = config.CONVEX_SYNC_LEDGER_PATH or (
+            str(Path(getattr(storage, "base_path", TEST_DATA_PATH)) / ".state" / "convex_sync.db")
+            if config.PERSIST_PROJECT_STATE else ":memory:"
+        )
+        convex_sync = ConvexSync(ledger=SyncLedger(sync_ledger_path))
+        # Non-blocking client for calls made from async tool handlers
+        async_convex = AsyncConvexClient()
     except Exception as e:
         print(f"Warning: Could not initialize Convex sync: {e}")
         convex_sync = None
@@ -76,6 +221,7 @@ if config.is_convex_enabled():
 # CORE TOOLS (5 General-Purpose Tools)
 # ============================================================================
 
+@with_project_lock
 def _manage_project(
     action: str,
     project_id: Optional[str] = None,
@@ -86,7 +232,7 @@ def _manage_project(
     Internal function to manage projects.
     
     Args:
-        action: Action to perform ("list", "create", "get", "delete", "configure")
+        action: Action to perform ("list", "create", "get", "delete", "configure", "metrics")
         project_id: Project identifier (required for get/delete/configure)
         project_name: Human-readable name (required for create)
         config: Project configuration dict (for create/configure)
@@ -101,9 +247,17 @@ def _manage_project(
                 "action": "list",
                 "projects": projects,
                 "count": len(projects),
+                "state_cache": ProjectStateManager().stats(),
+                "search_index": search_indexes.stats(),
                 "message": f"Found {len(projects)} project(s)"
             }
         
+        elif action == "metrics":
+            return {
+                "action": "metrics",
+                **_metrics_snapshot()
+            }
+        
         elif action == "create":
             if not project_id or not project_name:
                 return {"error": "create action requires project_id and project_name"}
@@ -111,6 +265,13 @@ def _manage_project(
             if storage.project_exists(project_id):
                 return {"error": f"Project {project_id} already exists"}
             
+            # Reject custom gap patterns that do not compile before creating anything
+            if config:
+                try:
+                    DiscoveryAnalyzer.validate_custom_gap_patterns(config.get("custom_gap_patterns", []))
+                except ValueError as e:
+                    return {"error": f"Invalid config: {str(e)}"}
+            
             # Create via storage provider (creates folder structure)
             project_meta = storage.create_project(
                 project_id=project_id,
@@ -182,6 +343,7 @@ def _manage_project(
                 # Also clear from state manager
                 state_manager = ProjectStateManager()
                 state_manager.clear_project(project_id)
+                search_indexes.drop(project_id)
                 
                 return {
                     "action": "delete",
@@ -198,6 +360,11 @@ def _manage_project(
             if not config:
                 return {"error": "configure action requires config parameter"}
             
+            try:
+                DiscoveryAnalyzer.validate_custom_gap_patterns(config.get("custom_gap_patterns", []))
+            except ValueError as e:
+                return {"error": f"Invalid config: {str(e)}"}
+            
             # Update in storage
             storage.save_config(project_id, config)
             
@@ -216,7 +383,7 @@ def _manage_project(
             }
         
         else:
-            return {"error": f"Unknown action: {action}. Valid: list, create, get, delete, configure"}
+            return {"error": f"Unknown action: {action}. Valid: list, create, get, delete, configure, metrics"}
     
     except Exception as e:
         return {"error": f"Error in manage_project: {str(e)}"}
@@ -233,7 +400,7 @@ def manage_project(
     Unified project management tool.
     
     Args:
-        action: Action to perform ("list", "create", "get", "delete", "configure")
+        action: Action to perform ("list", "create", "get", "delete", "configure", "metrics")
         project_id: Project identifier (required for get/delete/configure)
         project_name: Human-readable name (required for create)
         config: Project configuration dict (for create/configure)
@@ -247,6 +414,7 @@ def manage_project(
         - get: Retrieve project metadata and status (shows if project needs ingest())
         - delete: Remove project
         - configure: Update project settings (thresholds, patterns, etc.)
+        - metrics: Per-tool latency/resource histograms and cache statistics
     
     Status Information:
         - "not_initialized": Project exists in storage but not in memory (run ingest() first)
@@ -255,6 +423,8 @@ def manage_project(
     return _manage_project(action, project_id, project_name, config)
 
 
+@traced("ingest_documents")
+@with_project_lock
 def _ingest_documents(
     project_id: str,
     source: str = "local",
@@ -270,7 +440,8 @@ def _ingest_documents(
         source: Source type ("local", "text", "google_drive", "url")
         location: Source location (path, folder ID, URL, or raw text)
         doc_type: Override document type detection ("email", "transcript", "sow", "note")
-        append: If True, add to existing docs. If False, replace all docs.
+        append: If True, add to existing docs (a file already loaded is replaced
+            if it changed and skipped if not). If False, replace all docs.
     
     Returns:
         Summary of ingested documents
@@ -299,6 +470,9 @@ def _ingest_documents(
             project.documents = []
         
         documents_found = []
+        errors: List[Dict] = []
+        # Re-ingested files that are identical count as unchanged; changed ones replace their old version
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
         
         if source == "local":
             # Ingest from local filesystem
@@ -308,19 +482,25 @@ def _ingest_documents(
                 return {"error": f"Location not found: {location}"}
             
             # Use storage provider's method to get all discovery documents
-            if hasattr(storage, 'get_all_discovery_documents'):
-                doc_paths = storage.get_all_discovery_documents(project_id)
-            else:
-                # Fallback: scan location
-                doc_paths = list(location_path.rglob("*.txt"))
-            
-            for file_path in doc_paths:
-                doc = _parse_document_file(file_path, doc_type_override=doc_type)
-                project.add_document(doc)
-                documents_found.append({
-                    "file": file_path.name,
-                    "type": doc.doc_type.value
-                })
+            with stage("discover"):
+                if hasattr(storage, 'get_all_discovery_documents'):
+                    doc_paths = storage.get_all_discovery_documents(project_id)
+                else:
+                    # Fallback: scan location
+                    doc_paths = sorted(location_path.rglob("*.txt"))
+            
+            with stage("parse"):
+                docs, errors = _parse_document_files(doc_paths, doc_type_override=doc_type)
+                for file_path, doc in zip(doc_paths, docs):
+                    if doc is None:
+                        continue
+                    status = project.add_document(doc)
+                    counts[status] += 1
+                    documents_found.append({
+                        "file": file_path.name,
+                        "type": doc.doc_type.value,
+                        "status": status
+                    })
         
         elif source == "text":
             # Ingest raw text as a document
@@ -330,6 +510,11 @@ def _ingest_documents(
             doc_type_enum = DocumentType(doc_type) if doc_type else DocumentType.NOTES
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"note_{timestamp}.txt"
+            # A second note within the same second must not replace the first
+            suffix = 1
+            while project.get_document(filename):
+                suffix += 1
+                filename = f"note_{timestamp}_{suffix}.txt"
             
             doc = Document(
                 file_path=filename,
@@ -337,20 +522,23 @@ def _ingest_documents(
                 doc_type=doc_type_enum,
                 metadata={"source": "text_input", "timestamp": timestamp}
             )
-            project.add_document(doc)
+            status = project.add_document(doc)
+            counts[status] += 1
             
-            # Save to working folder for persistence
-            storage.add_document(
-                project_id=project_id,
-                folder_type=FolderType.WORKING,
-                filename=filename,
-                content=location,
-                metadata={"type": "text_input"}
-            )
+            # Save to working folder for persistence (identical notes are not saved twice)
+            if status == "added":
+                storage.add_document(
+                    project_id=project_id,
+                    folder_type=FolderType.WORKING,
+                    filename=filename,
+                    content=location,
+                    metadata={"type": "text_input"}
+                )
             
             documents_found.append({
                 "file": filename,
-                "type": doc_type_enum.value
+                "type": doc_type_enum.value,
+                "status": status
             })
         
         elif source == "integration":
@@ -365,27 +553,51 @@ def _ingest_documents(
             try:
                 # Use integration storage provider to sync documents
                 if hasattr(storage, 'sync_documents_from_integration'):
-                    synced_documents = storage.sync_documents_from_integration(project_id)
+                    with stage("integration_sync"):
+                        sync_result = storage.sync_documents_from_integration(project_id)
                     
-                    # Add documents to project state
-                    for doc in synced_documents:
-                        project.add_document(doc)
+                    # Replace modified and deleted files; keep unchanged ones
+                    # as they are (with their summaries)
+                    replaced = set(sync_result.downloaded) | set(sync_result.deleted)
+                    existing = {
+                        d.external_id: d for d in project.documents
+                        if d.external_id and d.external_id not in replaced
+                    }
+                    project.documents = [
+                        d for d in project.documents
+                        if not (d.source == "integration" and d.external_id in replaced)
+                    ]
+                    
+                    for doc in sync_result.documents:
+                        if doc.external_id in existing:
+                            counts["unchanged"] += 1
+                            continue
+                        status = project.add_document(doc)
+                        counts[status] += 1
                         documents_found.append({
                             "file": doc.file_path,
                             "type": doc.doc_type.value,
                             "external_id": doc.external_id,
-                            "convex_document_id": doc.convex_document_id
+                            "convex_document_id": doc.convex_document_id,
+                            "status": status
                         })
                     
                     # Update state
-                    state_manager.update_project(project)
+                    with stage("persist"):
+                        state_manager.update_project(project)
+                    with stage("index"):
+                        search_indexes.get(project_id).sync(project.documents)
                     
                     return {
                         "project_id": project_id,
                         "source": "integration",
                         "documents_loaded": len(documents_found),
                         "total_documents": len(project.documents),
+                        **counts,
                         "documents": documents_found,
+                        "downloaded": len(sync_result.downloaded),
+                        "manifest_unchanged": len(sync_result.unchanged),
+                        "deleted": sync_result.deleted,
                         "message": f"Successfully ingested {len(documents_found)} document(s). "
                                    f"Run analyze() next - it will request summaries if needed."
                     }
@@ -404,15 +616,22 @@ def _ingest_documents(
             return {"error": f"Unknown source: {source}. Valid: local, text, google_drive, url"}
         
         # Update state
-        state_manager.update_project(project)
+        with stage("persist"):
+            state_manager.update_project(project)
+        with stage("index"):
+            search_indexes.get(project_id).sync(project.documents)
         
         return {
             "project_id": project_id,
             "source": source,
             "documents_loaded": len(documents_found),
             "total_documents": len(project.documents),
+            **counts,
             "documents": documents_found,
-            "message": f"Successfully ingested {len(documents_found)} document(s)"
+            **({"errors": errors} if errors else {}),
+            "message": f"Successfully ingested {len(documents_found)} document(s): "
+                       f"{counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged"
+                       + (f"; {len(errors)} file(s) could not be read" if errors else "")
         }
     
     except Exception as e:
@@ -435,10 +654,12 @@ def ingest(
         source: Source type ("local", "text", "google_drive", "url")
         location: Source location (path, folder ID, URL, or raw text)
         doc_type: Override document type detection ("email", "transcript", "sow", "note")
-        append: If True, add to existing docs. If False, replace all docs.
+        append: If True, add to existing docs (a file already loaded is replaced
+            if it changed and skipped if not). If False, replace all docs.
     
     Returns:
-        Summary of ingested documents
+        Summary of ingested documents, with counts of documents added,
+        updated (changed since last ingest) and unchanged
     
     Prerequisites:
         - Project folder must exist in storage (use manage_project(action="list") to see available projects)
@@ -461,11 +682,31 @@ def ingest(
     return _ingest_documents(project_id, source, location, doc_type, append)
 
 
+# Modes that run a single analysis of the project's documents
+SINGLE_ANALYSIS_MODES = ["full", "gaps_only", "questions_only", "quick", "confidence_only"]
+
+# Rounds of parallel analysis per batch; a project whose documents changed
+# while it was analyzed is queued for the next round
+BATCH_ANALYSIS_ROUNDS = 3
+
+
+def _documents_needing_summaries(project: ProjectState, mode: str) -> List[Document]:
+    """Get integration documents that must be summarized before a full analysis."""
+    if mode != "full":
+        return []
+    return [
+        d for d in project.documents 
+        if not d.summary and d.source == "integration"
+    ]
+
+
+@with_project_lock
 def _analyze_project(
     project_id: str,
     mode: str = "full",
     focus: Optional[List[str]] = None,
-    compare_to: Optional[str] = None
+    compare_to: Optional[str] = None,
+    analysis: Optional[AnalysisResult] = None
 ) -> Dict:
     """
     Internal function to analyze a project.
@@ -475,6 +716,7 @@ def _analyze_project(
         mode: Analysis mode
         focus: Specific categories to focus on
         compare_to: Another project ID to compare against
+        analysis: Precomputed analysis of the project (from batch mode)
     
     Returns:
         Analysis results based on mode
@@ -499,10 +741,8 @@ def _analyze_project(
         
         # Check for missing summaries in full analysis mode
         if mode == "full":
-            docs_without_summaries = [
-                d for d in project.documents 
-                if not d.summary and d.source == "integration"
-            ]
+            with stage("summary_gate"):
+                docs_without_summaries = _documents_needing_summaries(project, mode)
             
             if docs_without_summaries:
                 return {
@@ -529,15 +769,18 @@ def _analyze_project(
             previous_confidence = project.analysis.overall_confidence
         
         # Run analysis based on mode
-        analyzer = DiscoveryAnalyzer()
+        analyzer = DiscoveryAnalyzer(project.config)
         
-        if mode in ["full", "gaps_only", "questions_only", "quick", "confidence_only"]:
-            analysis = analyzer.analyze(project.documents, project.additional_context)
+        if mode in SINGLE_ANALYSIS_MODES:
+            if analysis is None:
+                with stage("analyze"):
+                    analysis = analyzer.analyze(project.documents, project.additional_context)
             
             # Update project state unless mode is read-only
             if mode in ["full", "quick"]:
-                project.update_analysis(analysis)
-                state_manager.update_project(project)
+                with stage("persist"):
+                    project.update_analysis(analysis)
+                    state_manager.update_project(project)
             
             # Build response based on mode
             if mode == "full":
@@ -596,7 +839,7 @@ def _analyze_project(
             if not project2:
                 return {"error": f"Comparison project {compare_to} not found"}
             
-            analysis2 = analyzer.analyze(project2.documents, project2.additional_context)
+            analysis2 = DiscoveryAnalyzer(project2.config).analyze(project2.documents, project2.additional_context)
             
             return {
                 "mode": "compare",
@@ -678,22 +921,90 @@ def analyze(
     """
     # Batch mode
     if isinstance(project_id, list):
-        results = []
-        for pid in project_id:
-            result = _analyze_project(pid, mode=mode, focus=focus, compare_to=compare_to)
-            results.append(result)
-        return {
-            "batch_mode": True,
-            "projects_analyzed": len(results),
-            "results": results
-        }
+        return _analyze_batch(project_id, mode=mode, focus=focus, compare_to=compare_to)
     
     # Single project mode
     return _analyze_project(project_id, mode=mode, focus=focus, compare_to=compare_to)
 
 
+def _analyze_batch(
+    project_ids: List[str],
+    mode: str = "full",
+    focus: Optional[List[str]] = None,
+    compare_to: Optional[str] = None
+) -> Dict:
+    """
+    Internal function to analyze several projects.
+    
+    Projects that are ready for analysis are analyzed in parallel worker
+    processes; each one's state is updated as soon as it finishes. A project
+    whose documents changed while it was being analyzed is queued again
+    (after BATCH_ANALYSIS_ROUNDS rounds it is analyzed in this process,
+    under its lock, like the projects below). Projects that are missing, empty or waiting on
+    summaries get the same response as a single-project call.
+    
+    Args:
+        project_ids: Project identifiers
+        mode: Analysis mode
+        focus: Specific categories to focus on
+        compare_to: Another project ID to compare against
+    
+    Returns:
+        Batch results in the order of project_ids
+    """
+    state_manager = ProjectStateManager()
+    
+    ready = []
+    if mode in SINGLE_ANALYSIS_MODES:
+        for pid in dict.fromkeys(project_ids):
+            project = state_manager.get_project(pid)
+            if project and project.documents and not _documents_needing_summaries(project, mode):
+                ready.append(project)
+    
+    results = {}
+    timings = {}
+    batch_analyzer = BatchAnalyzer(
+        max_workers=config.ANALYSIS_WORKERS,
+        timeout=config.ANALYSIS_TIMEOUT_SECONDS
+    )
+    queue = ready
+    for _ in range(BATCH_ANALYSIS_ROUNDS):
+        stale = []
+        for outcome in batch_analyzer.analyze(queue):
+            pid = outcome.project_id
+            timings[pid] = timings.get(pid, 0) + round(outcome.duration * 1000, 1)
+            if outcome.error:
+                results[pid] = {"project_id": pid, "error": outcome.error}
+                continue
+            with ProjectStateManager.project_lock(pid):
+                project = state_manager.get_project(pid)
+                if project is None or project_fingerprint(project) != outcome.fingerprint:
+                    # Changed (e.g. by an ingest) since its payload was taken
+                    if project is not None and project.documents:
+                        stale.append(project)
+                    continue
+                results[pid] = _analyze_project(
+                    pid, mode=mode, focus=focus, compare_to=compare_to, analysis=outcome.analysis
+                )
+        if not stale:
+            break
+        queue = stale
+    
+    for pid in project_ids:
+        if pid not in results:
+            results[pid] = _analyze_project(pid, mode=mode, focus=focus, compare_to=compare_to)
+    
+    return {
+        "batch_mode": True,
+        "projects_analyzed": len(project_ids),
+        "parallel_workers": min(batch_analyzer.max_workers, len(ready)),
+        "analysis_ms": timings,
+        "results": [results[pid] for pid in project_ids]
+    }
+
+
 @mcp.tool()
-def summarize_document(
+async def summarize_document(
     project_id: str,
     document_id: str,
     summary: str
@@ -714,10 +1025,10 @@ def summarize_document(
     Returns:
         Confirmation of summary storage
     """
-    return _summarize_document(project_id, document_id, summary)
+    return await _summarize_document(project_id, document_id, summary)
 
 
-def _summarize_document(
+async def _summarize_document(
     project_id: str,
     document_id: str,
     summary: str
@@ -731,29 +1042,31 @@ def _summarize_document(
             return {"error": "Summary too long. Please keep under 4000 characters."}
         
         state_manager = ProjectStateManager()
-        project = state_manager.get_project(project_id)
-        
-        if not project:
-            return {"error": f"Project {project_id} not found"}
-        
-        # Find document in project
-        doc = None
-        for d in project.documents:
-            if d.convex_document_id == document_id or d.file_path.endswith(document_id):
-                doc = d
-                break
-        
-        if not doc:
-            return {"error": f"Document {document_id} not found in project"}
-        
-        # Update document summary
-        doc.summary = summary
-        state_manager.update_project(project)
+        # Not held across the Convex call below
+        with state_manager.project_lock(project_id):
+            project = state_manager.get_project(project_id)
+            
+            if not project:
+                return {"error": f"Project {project_id} not found"}
+            
+            # Find document in project
+            doc = None
+            for d in project.documents:
+                if d.convex_document_id == document_id or d.file_path.endswith(document_id):
+                    doc = d
+                    break
+            
+            if not doc:
+                return {"error": f"Document {document_id} not found in project"}
+            
+            # Update document summary
+            doc.summary = summary
+            state_manager.update_project(project)
         
         # Sync to Convex if available
-        if convex_sync and doc.convex_document_id:
+        if async_convex and doc.convex_document_id:
             try:
-                convex_sync.client.mutation(
+                await async_convex.mutation(
                     "mutations/documents:updateDocumentSummary",
                     {"documentId": doc.convex_document_id, "summary": summary}
                 )
@@ -819,6 +1132,7 @@ def update(
     return _update_project(project_id, type, content, target_id, metadata)
 
 
+@with_project_lock
 def _update_project(
     project_id: str,
     type: str,
@@ -1088,32 +1402,34 @@ def _generate_deliverable(
                 template_content = f.read()
             
             # Return template + analysis for AI to fill
-            content = {
-                "template": template_content,
-                "analysis": project.analysis.to_dict(),
-                "project_name": project.project_name,
-                "instructions": "Fill the template placeholders with analysis data"
-            }
+            with stage("render"):
+                content = {
+                    "template": template_content,
+                    "analysis": project.analysis.to_dict(),
+                    "project_name": project.project_name,
+                    "instructions": "Fill the template placeholders with analysis data"
+                }
             
             # Save to implementation folder
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{output_type}_{timestamp}.{format}"
             
-            if format == "json":
-                import json
-                storage.save_deliverable(
-                    project_id=project_id,
-                    filename=filename,
-                    content=json.dumps(content, indent=2),
-                    metadata={"confidence": project.analysis.overall_confidence}
-                )
-            else:
-                storage.save_deliverable(
-                    project_id=project_id,
-                    filename=filename,
-                    content=str(content),
-                    metadata={"confidence": project.analysis.overall_confidence}
-                )
+            with stage("save"):
+                if format == "json":
+                    import json
+                    storage.save_deliverable(
+                        project_id=project_id,
+                        filename=filename,
+                        content=json.dumps(content, indent=2),
+                        metadata={"confidence": project.analysis.overall_confidence}
+                    )
+                else:
+                    storage.save_deliverable(
+                        project_id=project_id,
+                        filename=filename,
+                        content=str(content),
+                        metadata={"confidence": project.analysis.overall_confidence}
+                    )
             
             return {
                 "project_id": project_id,
@@ -1263,6 +1579,16 @@ def sync_to_convex(
         sync_to_convex(project_id="scenario-1-cozyhome", sync_type="full", 
                       components=["metadata", "questions"])
     """
+    return _sync_to_convex(project_id, sync_type, components)
+
+
+@with_project_lock
+def _sync_to_convex(
+    project_id: str,
+    sync_type: str = "full",
+    components: Optional[List[str]] = None
+) -> Dict:
+    """Internal function to sync a project to Convex."""
     try:
         if not convex_sync:
             return {
@@ -1300,37 +1626,56 @@ def sync_to_convex(
         convex_project_id = None
         
         if "metadata" in sync_components:
-            convex_project_id = convex_sync.sync_project_metadata(project)
+            with stage("metadata"):
+                convex_project_id = convex_sync.sync_project_metadata(project)
             results["convex_project_id"] = convex_project_id
             results["synced_components"].append("metadata")
         
         # Get convex project ID for other operations
         if not convex_project_id and project.analysis:
             # Need to sync metadata first to get the ID
-            convex_project_id = convex_sync.sync_project_metadata(project)
+            with stage("metadata"):
+                convex_project_id = convex_sync.sync_project_metadata(project)
             results["convex_project_id"] = convex_project_id
         
         if convex_project_id:
+            sync_errors: List[str] = []
+            changed = 0
+            
+            def _record(key: str, synced: list) -> int:
+                nonlocal changed
+                sync_errors.extend(f"{key}: {item.error}" for item in synced if item.error)
+                changed += sum(1 for item in synced if item.action != "unchanged")
+                return sum(1 for item in synced if item.ok)
+            
             if "analysis" in sync_components and project.analysis:
-                gaps_ids = convex_sync.sync_gaps(convex_project_id, project.analysis.gaps)
-                conflicts_ids = convex_sync.sync_conflicts(convex_project_id, project.analysis.conflicts)
-                ambiguities_ids = convex_sync.sync_ambiguities(convex_project_id, project.analysis.ambiguities)
-                
-                results["gaps_synced"] = len(gaps_ids)
-                results["conflicts_synced"] = len(conflicts_ids)
-                results["ambiguities_synced"] = len(ambiguities_ids)
+                with stage("analysis"):
+                    results["gaps_synced"] = _record(
+                        "gaps", convex_sync.sync_gaps(convex_project_id, project.analysis.gaps))
+                    results["conflicts_synced"] = _record(
+                        "conflicts", convex_sync.sync_conflicts(convex_project_id, project.analysis.conflicts))
+                    results["ambiguities_synced"] = _record(
+                        "ambiguities", convex_sync.sync_ambiguities(convex_project_id, project.analysis.ambiguities))
                 results["synced_components"].append("analysis")
             
             if "questions" in sync_components and project.analysis:
                 questions = _extract_questions_from_analysis(project.analysis)
-                questions_ids = convex_sync.sync_questions(convex_project_id, questions)
-                results["questions_synced"] = len(questions_ids)
+                with stage("questions"):
+                    results["questions_synced"] = _record(
+                        "questions", convex_sync.sync_questions(convex_project_id, questions))
                 results["synced_components"].append("questions")
             
             if "documents" in sync_components:
-                doc_ids = convex_sync.sync_documents(convex_project_id, project)
-                results["documents_synced"] = len(doc_ids)
+                with stage("documents"):
+                    results["documents_synced"] = _record(
+                        "documents", convex_sync.sync_documents(convex_project_id, project))
                 results["synced_components"].append("documents")
+                # Keep the Convex document IDs recorded on the documents
+                state_manager.update_project(project)
+            
+            results["changed"] = changed
+            if sync_errors:
+                results["sync_errors"] = sync_errors
         
         results["message"] = f"Successfully synced {len(results['synced_components'])} component(s) to Convex"
         return results
@@ -1372,6 +1717,7 @@ def query(project_id: str, question: str) -> Dict:
         - "Which documents mention QuickBooks?"
         - "Who are the stakeholders?"
         - "What are the main pain points?"
+        - 'Where is "source of truth" discussed?' (quoted words match as a phrase)
     """
     try:
         state_manager = ProjectStateManager()
@@ -1381,33 +1727,23 @@ def query(project_id: str, question: str) -> Dict:
             return {"error": f"Project {project_id} not found"}
         
         question_lower = question.lower()
-        results = []
         
-        # Search documents
-        for doc in project.documents:
-            content_lower = doc.content.lower()
-            
-            # Simple keyword matching (can be enhanced with semantic search later)
-            keywords = [word for word in question_lower.split() if len(word) > 3]
-            matches = sum(1 for kw in keywords if kw in content_lower)
-            
-            if matches > 0:
-                # Find relevant excerpts
-                sentences = doc.content.split('.')
-                relevant_excerpts = []
-                
-                for sentence in sentences:
-                    sentence_lower = sentence.lower()
-                    if any(kw in sentence_lower for kw in keywords):
-                        relevant_excerpts.append(sentence.strip())
-                
-                if relevant_excerpts:
-                    results.append({
-                        "document": doc.file_path,
-                        "doc_type": doc.doc_type.value,
-                        "relevance_score": matches,
-                        "excerpts": relevant_excerpts[:3]  # Top 3
-                    })
+        # Search documents (BM25 over the project's inverted index; only
+        # documents added or changed since the last call are re-indexed)
+        index = search_indexes.get(project_id)
+        with stage("index"):
+            index.sync(project.documents)
+        with stage("search"):
+            hits, results_count = index.search(question, limit=5, excerpts=3)
+        results = [
+            {
+                "document": hit.document.file_path,
+                "doc_type": hit.document.doc_type.value,
+                "relevance_score": hit.score,
+                "excerpts": hit.excerpts
+            }
+            for hit in hits
+        ]
         
         # Also search analysis results
         analysis_insights = []
@@ -1439,22 +1775,63 @@ def query(project_id: str, question: str) -> Dict:
                     "data": list(set(participants))
                 })
         
-        # Sort results by relevance
-        results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-        
         return {
             "project_id": project_id,
             "question": question,
-            "document_results": results[:5],  # Top 5
+            "document_results": results,  # Top 5, best first
             "analysis_insights": analysis_insights,
-            "results_count": len(results),
-            "message": f"Found {len(results)} relevant result(s)"
+            "results_count": results_count,
+            "message": f"Found {results_count} relevant result(s)"
         }
     
     except Exception as e:
         return {"error": f"Error querying project: {str(e)}"}
 
 
+@mcp.tool()
+def get_traces(limit: int = 5, tool: Optional[str] = None, format: str = "tree") -> Dict:
+    """
+    Return recent traces of tool calls, showing where their time went.
+    
+    Each trace is one tool call, broken into nested spans (e.g. analyze ->
+    analyze.findings, analyze.gaps, analyze.ambiguities, analyze.conflicts)
+    with durations and attributes such as counts.
+    
+    Args:
+        limit: Maximum number of traces, newest first
+        tool: Only traces of this tool (e.g. "analyze")
+        format: "tree" (nested spans) or "otlp" (OpenTelemetry OTLP/JSON)
+    
+    Returns:
+        Recent traces
+    
+    Prerequisites:
+        - Tracing must be enabled (TRACING_ENABLED, on by default)
+    
+    Examples:
+        # Why was the last analyze slow?
+        get_traces(limit=1, tool="analyze")
+        
+        # Export for an OpenTelemetry backend
+        get_traces(limit=20, format="otlp")
+    """
+    if not tracer.enabled:
+        return {"error": "Tracing is disabled. Set TRACING_ENABLED=true to record traces."}
+    if format not in ("tree", "otlp"):
+        return {"error": f"Unknown format: {format}. Valid: tree, otlp"}
+    
+    # The current call's own trace is still open, so it is never included
+    traces = tracer.recent(limit, name=f"tool.{tool}" if tool else None)
+    if format == "otlp":
+        return {"format": "otlp", "traces": len(traces), **tracer.to_otlp(traces)}
+    return {
+        "format": "tree",
+        "traces": [trace_tree(spans) for spans in traces],
+        "count": len(traces),
+        "tracing": tracer.stats()
+    }
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -1462,22 +1839,10 @@ def query(project_id: str, question: str) -> Dict:
 def _parse_document_file(file_path: Path, doc_type_override: Optional[str] = None) -> Document:
     """Parse a document file based on its location and type."""
     # Determine document type from path
-    path_str = str(file_path).lower()
-    
     if doc_type_override:
         doc_type = DocumentType(doc_type_override)
-    elif "email" in path_str:
-        doc_type = DocumentType.EMAIL
-    elif "transcript" in path_str:
-        doc_type = DocumentType.TRANSCRIPT
-    elif "sow" in file_path.name.lower():
-        doc_type = DocumentType.SOW
-    elif "guide" in file_path.name.lower() or "brand" in file_path.name.lower():
-        doc_type = DocumentType.GUIDE
-    elif "note" in file_path.name.lower():
-        doc_type = DocumentType.NOTES
     else:
-        doc_type = DocumentType.OTHER
+        doc_type = infer_document_type(str(file_path))
     
     # Parse based on type
     if doc_type == DocumentType.EMAIL:
@@ -1488,18 +1853,59 @@ def _parse_document_file(file_path: Path, doc_type_override: Optional[str] = Non
         return _parse_client_doc(file_path, doc_type)
 
 
+def _parse_document_files(
+    file_paths: List[Path],
+    doc_type_override: Optional[str] = None
+) -> Tuple[List[Optional[Document]], List[Dict]]:
+    """
+    Parse files concurrently on a bounded thread pool.
+    
+    Each worker reads and parses one file and hashes its content (so
+    ProjectState.add_document does not read it again), which overlaps the
+    per-file latency of network file systems.
+    
+    Args:
+        file_paths: Files to parse
+        doc_type_override: Document type for every file (default: detect from path)
+    
+    Returns:
+        Documents in the order of file_paths (None where parsing failed),
+        and one {"file", "error"} per failed file
+    """
+    def parse(file_path: Path) -> Tuple[Optional[Document], Optional[str]]:
+        try:
+            doc = _parse_document_file(file_path, doc_type_override=doc_type_override)
+            doc.hash_content()
+            return doc, None
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+    
+    workers = max(1, min(config.INGEST_WORKERS, len(file_paths)))
+    if workers == 1:
+        results = [parse(file_path) for file_path in file_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+            results = list(pool.map(parse, file_paths))
+    
+    errors = [
+        {"file": str(file_path), "error": error}
+        for file_path, (_, error) in zip(file_paths, results) if error
+    ]
+    return [doc for doc, _ in results], errors
+
+
 def _parse_email(file_path: Path) -> Document:
-    """Parse an email file."""
+    """Parse an email file's headers; the body is loaded on first access."""
+    # Headers live in the first 10 lines, so the body is never read here
     with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+        lines = [line.rstrip('\n') for _, line in zip(range(10), f)]
     
     metadata = {}
     participants = []
     subject = None
     date = None
     
-    lines = content.split('\n')
-    for line in lines[:10]:
+    for line in lines:
         if line.startswith('From:'):
             sender = line.replace('From:', '').strip()
             participants.append(sender)
@@ -1523,7 +1929,8 @@ def _parse_email(file_path: Path) -> Document:
     
     return Document(
         file_path=str(file_path),
-        content=content,
+        content=None,
+        content_ref=ContentRef.for_file(str(file_path)),
         doc_type=DocumentType.EMAIL,
         metadata=metadata,
         date=date,
@@ -1533,21 +1940,25 @@ def _parse_email(file_path: Path) -> Document:
 
 
 def _parse_transcript(file_path: Path) -> Document:
-    """Parse a transcript file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+    """Parse a transcript file's speakers; the body is loaded on first access."""
+    # Speakers are found anywhere in the transcript, but the text is not kept;
+    # it is read in batches of whole lines so large transcripts stay out of memory
     participants = []
-    speaker_pattern = r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*:'
-    matches = re.finditer(speaker_pattern, content, re.MULTILINE)
-    for match in matches:
-        speaker = match.group(1)
-        if speaker not in participants:
-            participants.append(speaker)
+    speaker_pattern = re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*:', re.MULTILINE)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            lines = f.readlines(1024 * 1024)
+            if not lines:
+                break
+            for match in speaker_pattern.finditer("".join(lines)):
+                speaker = match.group(1)
+                if speaker not in participants:
+                    participants.append(speaker)
     
     return Document(
         file_path=str(file_path),
-        content=content,
+        content=None,
+        content_ref=ContentRef.for_file(str(file_path)),
         doc_type=DocumentType.TRANSCRIPT,
         metadata={},
         participants=participants
@@ -1555,13 +1966,11 @@ def _parse_transcript(file_path: Path) -> Document:
 
 
 def _parse_client_doc(file_path: Path, doc_type: DocumentType) -> Document:
-    """Parse a client document file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+    """Reference a client document file; the body is loaded on first access."""
     return Document(
         file_path=str(file_path),
-        content=content,
+        content=None,
+        content_ref=ContentRef.for_file(str(file_path)),
         doc_type=doc_type,
         metadata={}
     )
@@ -1612,6 +2021,114 @@ def _extract_questions_from_analysis(analysis) -> List[Dict]:
     return questions
 
 
+# ============================================================================
+# FOLDER WATCH
+# ============================================================================
+
+def _watched_folders() -> Dict[str, List[Path]]:
+    """Get the document folders of every ingested project, by project ID."""
+    folders = {}
+    for project_id in ProjectStateManager().list_projects():
+        if storage.project_exists(project_id):
+            folders[project_id] = storage.get_watch_folders(project_id)
+    return folders
+
+
+@with_project_lock
+def _ingest_file_changes(project_id: str, changes: Dict[Path, str]) -> Dict:
+    """
+    Apply changed files to an ingested project (incremental ingest).
+    
+    Deleted files are removed first, then created and modified files are
+    (re-)parsed and added, replacing the document loaded from the same path
+    (see ProjectState.add_document), so a rename (a deletion and a creation)
+    leaves one document, under the new path. Notes saved by
+    ingest(source="text") are matched by filename, so the copy written to
+    the working folder is not loaded twice. Files that cannot be parsed are
+    reported under "errors" and the rest of the batch is still applied.
+    Re-runs the analysis if the project has one and auto_reanalyze is on.
+    
+    Args:
+        project_id: Project identifier
+        changes: File path -> "added", "modified" or "deleted"
+    
+    Returns:
+        Summary of applied changes
+    """
+    state_manager = ProjectStateManager()
+    project = state_manager.get_project(project_id)
+    if project is None:
+        return {"error": f"Project '{project_id}' is not loaded"}
+    
+    with span("watch.ingest", project_id=project_id, files=len(changes)) as current:
+        updated, removed, errors = [], 0, []
+        for path, kind in sorted(changes.items(), key=lambda change: (change[1] != "deleted", change[0])):
+            file_path = str(path)
+            override = None
+            if project.get_document(file_path) is None and path.parent.name == FolderType.WORKING.value:
+                note = project.get_document(path.name)
+                if note is not None:
+                    if kind == "added":
+                        # Written by ingest(source="text"), already loaded
+                        continue
+                    file_path, override = path.name, note.doc_type.value
+            doc = None
+            if path.is_file():
+                try:
+                    doc = _parse_document_file(path, doc_type_override=override)
+                    doc.hash_content()
+                except FileNotFoundError:
+                    # Deleted since it was reported; removed below
+                    pass
+                except Exception as e:
+                    # One unreadable file must not drop the rest of the batch
+                    errors.append({"file": str(path), "error": f"{type(e).__name__}: {e}"})
+                    continue
+            if doc is not None:
+                doc.file_path = file_path
+                if project.add_document(doc) != "unchanged":
+                    updated.append(path.name)
+            elif project.remove_document(file_path):
+                removed += 1
+        current.set_attribute("errors", len(errors))
+        
+        if not updated and not removed:
+            return {"project_id": project_id, "updated": [], "removed": 0,
+                    **({"errors": errors} if errors else {})}
+        state_manager.update_project(project)
+        search_indexes.get(project_id).sync(project.documents)
+        current.set_attribute("updated", len(updated))
+        current.set_attribute("removed", removed)
+        
+        reanalyzed = False
+        if project.analysis and project.config.auto_reanalyze:
+            # Not "analysis" when integration documents still need summaries
+            reanalyzed = "analysis" in _analyze_project(project_id, mode="full")
+        current.set_attribute("reanalyzed", reanalyzed)
+    
+    return {
+        "project_id": project_id,
+        "updated": updated,
+        "removed": removed,
+        "reanalyzed": reanalyzed,
+        **({"errors": errors} if errors else {})
+    }
+
+
+# Opt-in: keep ingested local projects in line with their folders
+folder_watcher = None
+if config.WATCH_FOLDERS and isinstance(storage, LocalStorageProvider):
+    folder_watcher = FolderWatcher(
+        _watched_folders,
+        _ingest_file_changes,
+        debounce_ms=config.WATCH_DEBOUNCE_MS,
+        poll_interval=config.WATCH_POLL_INTERVAL_SECONDS,
+        force_polling=config.WATCH_FORCE_POLLING
+    )
+    folder_watcher.start()
+    print(f"👀 Watching project folders ({folder_watcher.backend})")
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
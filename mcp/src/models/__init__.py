@@ -1,12 +1,14 @@
 """Data models for discovery analysis."""
 
-from .document import Document, DocumentType
+from .document import ContentRef, Document, DocumentType, infer_document_type
 from .analysis import AnalysisResult, Gap, Ambiguity, Conflict
 from .project_state import ProjectState
 
 __all__ = [
+    "ContentRef",
     "Document",
     "DocumentType",
+    "infer_document_type",
     "AnalysisResult",
     "Gap",
     "Ambiguity",
@@ -45,6 +45,19 @@ class Gap:
             "answered": self.answered,
             "answer": self.answer,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Gap':
+        """Create from dictionary."""
+        return cls(
+            category=GapCategory(data["category"]),
+            description=data["description"],
+            impact=data["impact"],
+            priority=Priority(data["priority"]),
+            suggested_question=data.get("suggested_question"),
+            answered=data.get("answered", False),
+            answer=data.get("answer")
+        )
 
 
 @dataclass
@@ -66,6 +79,17 @@ class Ambiguity:
             "priority": self.priority.value,
             "clarification": self.clarification,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Ambiguity':
+        """Create from dictionary."""
+        return cls(
+            term=data["term"],
+            context=data["context"],
+            clarification_needed=data["clarification_needed"],
+            priority=Priority(data["priority"]),
+            clarification=data.get("clarification")
+        )
 
 
 @dataclass
@@ -89,6 +113,18 @@ class Conflict:
             "priority": self.priority.value,
             "resolution": self.resolution,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Conflict':
+        """Create from dictionary."""
+        return cls(
+            topic=data["topic"],
+            conflicting_statements=data.get("conflicting_statements", []),
+            sources=data.get("sources", []),
+            resolution_needed=data["resolution_needed"],
+            priority=Priority(data["priority"]),
+            resolution=data.get("resolution")
+        )
 
 
 @dataclass
@@ -146,4 +182,19 @@ class AnalysisResult:
             "pain_points": self.pain_points,
             "business_objectives": self.business_objectives,
         }
-
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AnalysisResult':
+        """Create from dictionary."""
+        result = cls(
+            gaps=[Gap.from_dict(g) for g in data.get("gaps", [])],
+            ambiguities=[Ambiguity.from_dict(a) for a in data.get("ambiguities", [])],
+            conflicts=[Conflict.from_dict(c) for c in data.get("conflicts", [])],
+            systems_identified=data.get("systems_identified", []),
+            client_name=data.get("client_name"),
+            pain_points=data.get("pain_points", []),
+            business_objectives=data.get("business_objectives", []),
+        )
+        # Scores are rounded in to_dict; recompute them exactly from the findings
+        result.calculate_confidence()
+        return result
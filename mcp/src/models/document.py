@@ -1,9 +1,15 @@
 """Document data model."""
 
+import codecs
+import hashlib
+import os
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 class DocumentType(Enum):
@@ -16,12 +22,350 @@ class DocumentType(Enum):
     OTHER = "other"
 
 
+def infer_document_type(path: str) -> DocumentType:
+    """
+    Infer a document's type from its path.
+
+    Folder names decide emails and transcripts; otherwise the file name does.
+
+    Args:
+        path: File path (folders included)
+    """
+    path_str = path.lower()
+    name = os.path.basename(path_str)
+    if "email" in path_str:
+        return DocumentType.EMAIL
+    if "transcript" in path_str:
+        return DocumentType.TRANSCRIPT
+    if "sow" in name:
+        return DocumentType.SOW
+    if "guide" in name or "brand" in name:
+        return DocumentType.GUIDE
+    if "note" in name:
+        return DocumentType.NOTES
+    return DocumentType.OTHER
+
+
+# Bytes read per step when hashing a local body without loading it
+DIGEST_CHUNK_BYTES = 1024 * 1024
+
+
+# Loaders for bodies held by external systems, keyed by ContentRef.source
+_external_loaders: Dict[str, Callable[[str], str]] = {}
+
+
+def register_external_loader(source: str, loader: Callable[[str], str]):
+    """
+    Register how to fetch bodies for ContentRefs with an external id.
+    
+    Args:
+        source: ContentRef.source the loader serves (e.g. an integration ID)
+        loader: Function from external id to document text
+    """
+    _external_loaders[source] = loader
+
+
+# Reads cached bodies by SHA-256 (returns None on a miss), if a blob cache is set up
+_blob_reader: Optional[Callable[[str], Optional[bytes]]] = None
+
+
+def register_blob_reader(reader: Optional[Callable[[str], Optional[bytes]]]):
+    """
+    Register a content-addressed cache to read bodies from before their source.
+    
+    Args:
+        reader: Function from SHA-256 hex digest to content bytes, or None on a miss
+    """
+    global _blob_reader
+    _blob_reader = reader
+
+
+class StaleContentError(OSError):
+    """A local body is missing or has changed since it was ingested."""
+
+
+def _file_digest(path: str, offset: int = 0, length: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Hash a UTF-8 file slice in chunks, as ContentRef.read would return it.
+    
+    Returns:
+        (hex digest of the body with newlines normalized, size of the slice in bytes)
+        
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    digest = hashlib.sha256()
+    # Decoding only validates; valid UTF-8 re-encodes to the same bytes
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    remaining = length
+    size = 0
+    carriage_return = False
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while remaining is None or remaining > 0:
+            data = f.read(DIGEST_CHUNK_BYTES if remaining is None else min(DIGEST_CHUNK_BYTES, remaining))
+            if not data:
+                break
+            size += len(data)
+            if remaining is not None:
+                remaining -= len(data)
+            decoder.decode(data)
+            # Normalize newlines like `read`, including a CRLF split across chunks
+            if carriage_return and data.startswith(b"\n"):
+                data = data[1:]
+            carriage_return = data.endswith(b"\r")
+            digest.update(data.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+    decoder.decode(b"", final=True)
+    return digest.hexdigest(), size
+
+
+@dataclass(frozen=True)
+class ContentRef:
+    """Where a document body lives, so it can be loaded on demand."""
+    
+    # Local file slice; length None reads to the end of the file
+    path: Optional[str] = None
+    offset: int = 0
+    length: Optional[int] = None
+    encoding: str = "utf-8"
+    
+    # Body held by an external system, fetched with the loader registered for source
+    external_id: Optional[str] = None
+    source: Optional[str] = None
+    
+    # Digest of the body: looked up in the blob cache (before an external
+    # source, or when a local file no longer matches it)
+    sha256: Optional[str] = None
+    
+    # Size in bytes of a local file slice when it was ingested
+    size: Optional[int] = None
+    
+    @classmethod
+    def for_file(cls, path: str) -> 'ContentRef':
+        """
+        Reference a local UTF-8 file, recording its size and digest.
+        
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        sha256, size = _file_digest(path)
+        return cls(path=path, sha256=sha256, size=size)
+    
+    def read(self) -> str:
+        """
+        Load the body.
+        
+        A local file is read only while it matches the size and digest
+        recorded at ingest; otherwise the body comes from the blob cache.
+        
+        Returns:
+            Document text, with newlines normalized like text-mode file reads
+            
+        Raises:
+            StaleContentError: If a local file is missing or has changed since
+                ingest and the blob cache does not hold its body
+            OSError: If the file cannot be read
+            LookupError: If no loader is registered for an external body
+        """
+        if self.path:
+            text = self._read_file()
+            if text is None:
+                text = self._read_blob()
+            if text is None:
+                raise StaleContentError(f"{self.path} is missing or has changed since it was ingested")
+            return text
+        
+        text = self._read_blob()
+        if text is not None:
+            return text
+        
+        if self.external_id:
+            loader = _external_loaders.get(self.source)
+            if loader is None:
+                raise LookupError(f"No content loader registered for source '{self.source}'")
+            return loader(self.external_id)
+        
+        return ""
+    
+    def _read_file(self) -> Optional[str]:
+        """Read a local body, or None if it no longer matches the recorded size and digest."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(-1 if self.length is None else self.length)
+        except FileNotFoundError:
+            if self.sha256 is None:
+                raise
+            return None
+        if self.size is not None and len(data) != self.size:
+            return None
+        text = data.decode(self.encoding).replace("\r\n", "\n").replace("\r", "\n")
+        if self.sha256 is not None and hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest() != self.sha256:
+            return None
+        return text
+    
+    def _read_blob(self) -> Optional[str]:
+        """Read the body from the blob cache, or None on a miss."""
+        if not self.sha256 or _blob_reader is None:
+            return None
+        data = _blob_reader(self.sha256)
+        return None if data is None else data.decode(self.encoding)
+    
+    def digest(self) -> Optional[str]:
+        """
+        Get the SHA-256 of the body as `read` returns it, without loading it.
+        
+        Returns:
+            Hex digest of the UTF-8 encoded body (the one recorded at ingest,
+            or hashed from a local UTF-8 file in chunks), or None if the body
+            must be read to be hashed
+            
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        if self.sha256:
+            return self.sha256
+        if not self.path:
+            return None
+        if codecs.lookup(self.encoding).name != "utf-8":
+            return None
+        return _file_digest(self.path, self.offset, self.length)[0]
+    
+    def is_current(self) -> bool:
+        """
+        Check whether a local file still holds the body recorded at ingest.
+        
+        Returns:
+            True if the file matches the recorded size and digest (or none
+            were recorded), False if it is missing or has changed
+        """
+        if not self.path or self.sha256 is None:
+            return True
+        try:
+            if codecs.lookup(self.encoding).name != "utf-8":
+                return self._read_file() is not None
+            sha256, size = _file_digest(self.path, self.offset, self.length)
+        except (OSError, UnicodeDecodeError):
+            return False
+        return sha256 == self.sha256 and self.size in (None, size)
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for serialization."""
+        return {
+            "path": self.path,
+            "offset": self.offset,
+            "length": self.length,
+            "encoding": self.encoding,
+            "external_id": self.external_id,
+            "source": self.source,
+            "sha256": self.sha256,
+            "size": self.size,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ContentRef':
+        """Create from dictionary."""
+        return cls(
+            path=data.get("path"),
+            offset=data.get("offset", 0),
+            length=data.get("length"),
+            encoding=data.get("encoding", "utf-8"),
+            external_id=data.get("external_id"),
+            source=data.get("source"),
+            sha256=data.get("sha256"),
+            size=data.get("size"),
+        )
+
+
+class ResidentBodies:
+    """
+    Bounds the memory held by lazily loaded document bodies.
+    
+    Bodies loaded through a ContentRef are tracked in load order; once their
+    total size exceeds the budget, the least recently loaded ones are dropped
+    and reloaded on their next access.
+    """
+    
+    def __init__(self, max_chars: int = 0):
+        """
+        Initialize tracker.
+        
+        Args:
+            max_chars: Budget for resident lazy bodies in characters (0 = unbounded)
+        """
+        self.max_chars = max_chars
+        self._bodies: "OrderedDict[int, tuple]" = OrderedDict()
+        self._total = 0
+        self._lock = RLock()
+        self.loads = 0
+        self.drops = 0
+    
+    def loaded(self, doc: 'Document', size: int):
+        """Record a loaded body and drop older ones over budget."""
+        with self._lock:
+            self.loads += 1
+            self._forget(id(doc))
+            key = id(doc)
+            self._bodies[key] = (weakref.ref(doc, lambda _, key=key: self.released(key)), size)
+            self._total += size
+            
+            victims = []
+            if self.max_chars > 0:
+                for other_key in list(self._bodies):
+                    if self._total <= self.max_chars or other_key == key:
+                        break
+                    ref, _ = self._bodies[other_key]
+                    self._forget(other_key)
+                    victim = ref()
+                    if victim is not None:
+                        victims.append(victim)
+        for victim in victims:
+            victim.drop_content()
+    
+    def released(self, key: int, dropped: bool = False):
+        """Stop tracking a body (dropped, replaced or garbage collected)."""
+        with self._lock:
+            self._forget(key)
+            if dropped:
+                self.drops += 1
+    
+    def _forget(self, key: int):
+        """Untrack a body; caller holds the lock."""
+        entry = self._bodies.pop(key, None)
+        if entry is not None:
+            self._total -= entry[1]
+    
+    def stats(self) -> Dict[str, int]:
+        """Get resident size and load/drop counters."""
+        with self._lock:
+            return {
+                "resident_bodies": len(self._bodies),
+                "resident_chars": self._total,
+                "max_chars": self.max_chars,
+                "loads": self.loads,
+                "drops": self.drops,
+            }
+
+
+# Shared budget for all lazily loaded bodies
+resident_bodies = ResidentBodies()
+
+
 @dataclass
 class Document:
-    """Represents a discovery document."""
+    """
+    Represents a discovery document.
+    
+    The body can be given eagerly as `content`, or lazily as `content_ref`
+    (with `content=None`), in which case it is loaded on first access of
+    `content` and can be dropped again with `drop_content()`.
+    """
     
     file_path: str
-    content: str
+    content: Optional[str] = field(repr=False)  # may be lazy; repr must not load it
     doc_type: DocumentType
     metadata: dict = field(default_factory=dict)
     
@@ -38,16 +382,90 @@ class Document:
     source: str = "local"  # "local", "integration", "upload"
     convex_document_id: Optional[str] = None  # Convex document ID for updates
     
+    # Where the body can be (re)loaded from, if it is lazy
+    content_ref: Optional[ContentRef] = None
+    
     def __post_init__(self):
         """Ensure doc_type is DocumentType enum."""
         if isinstance(self.doc_type, str):
             self.doc_type = DocumentType(self.doc_type)
+        # A body given alongside its ref counts against the budget like a loaded one
+        if self.content_ref is not None and self._content is not None:
+            resident_bodies.loaded(self, len(self._content))
     
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization."""
+    def _get_content(self) -> str:
+        """Get the body, loading it from content_ref on first access."""
+        if self._content is None:
+            if self.content_ref is None:
+                return ""
+            body = self.content_ref.read()
+            self._content = body
+            # The source may have changed since the body was dropped
+            self._fingerprint = None
+            resident_bodies.loaded(self, len(body))
+        return self._content
+    
+    def _set_content(self, value: Optional[str]):
+        """Replace the body; a replaced body no longer matches content_ref."""
+        if getattr(self, "_content", None) is not None and self.__dict__.get("content_ref"):
+            resident_bodies.released(id(self))
+        self._content = value
+        self._fingerprint = None
+        if value is not None and "content_ref" in self.__dict__:
+            self.content_ref = None
+    
+    @property
+    def content_loaded(self) -> bool:
+        """Check whether the body is resident in memory."""
+        return self._content is not None
+    
+    def drop_content(self) -> bool:
+        """
+        Release the body from memory if it can be reloaded.
+        
+        Returns:
+            True if the body was dropped
+        """
+        if self.content_ref is None or self._content is None:
+            return False
+        self._content = None
+        resident_bodies.released(id(self), dropped=True)
+        return True
+    
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 of the document content, computed once per content version."""
+        if self._fingerprint is None:
+            # A lazy local body is hashed from its file rather than loaded
+            digest = self.content_ref.digest() if self._content is None and self.content_ref else None
+            self._fingerprint = digest or hashlib.sha256(
+                self.content.encode("utf-8", "surrogatepass")
+            ).hexdigest()
+        return self._fingerprint
+    
+    def hash_content(self) -> str:
+        """Get the fingerprint without leaving a lazy body resident in memory."""
+        loaded = self.content_loaded
+        fingerprint = self.fingerprint
+        if not loaded:
+            self.drop_content()
+        return fingerprint
+    
+    def to_dict(self, include_content: bool = True) -> dict:
+        """
+        Convert to dictionary for serialization.
+        
+        Args:
+            include_content: Include the body. When False, bodies backed by a
+                local file or the blob cache are left out (they are reloadable
+                from content_ref).
+        """
+        lazy = (not include_content and self.content_ref is not None
+                and bool(self.content_ref.path or self.content_ref.sha256))
         return {
             "file_path": self.file_path,
-            "content": self.content,
+            "content": None if lazy else self.content,
+            "content_ref": self.content_ref.to_dict() if self.content_ref else None,
             "doc_type": self.doc_type.value,
             "metadata": self.metadata,
             "date": self.date.isoformat() if self.date else None,
@@ -61,4 +479,31 @@ class Document:
             "source": self.source,
             "convex_document_id": self.convex_document_id,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Document':
+        """Create from dictionary."""
+        content_ref = ContentRef.from_dict(data["content_ref"]) if data.get("content_ref") else None
+        content = data.get("content")
+        if content is None and content_ref is None:
+            content = ""
+        return cls(
+            file_path=data["file_path"],
+            content=content,
+            doc_type=DocumentType(data.get("doc_type", DocumentType.OTHER.value)),
+            metadata=data.get("metadata") or {},
+            date=datetime.fromisoformat(data["date"]) if data.get("date") else None,
+            participants=data.get("participants") or [],
+            subject=data.get("subject"),
+            external_id=data.get("external_id"),
+            external_url=data.get("external_url"),
+            integration_id=data.get("integration_id"),
+            summary=data.get("summary"),
+            source=data.get("source", "local"),
+            convex_document_id=data.get("convex_document_id"),
+            content_ref=content_ref,
+        )
+
 
+# The body is stored privately so lazy documents can load and drop it
+Document.content = property(Document._get_content, Document._set_content)
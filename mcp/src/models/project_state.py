@@ -1,5 +1,6 @@
 """Project state management."""
 
+import os
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -8,11 +9,52 @@ from .document import Document
 from .analysis import AnalysisResult
 
 
+class _DocumentIndex:
+    """Positions of a project's documents by file path and by content hash."""
+    
+    def __init__(self, documents: List[Document]):
+        self.documents = documents
+        self.by_path: Dict[str, Document] = {}
+        self.by_hash: Dict[str, Document] = {}
+        self.positions: Dict[int, int] = {}
+        for position, document in enumerate(documents):
+            self._put(document, document.hash_content(), position)
+    
+    @property
+    def size(self) -> int:
+        return len(self.positions)
+    
+    def _put(self, document: Document, content_hash: str, position: int):
+        self.by_path.setdefault(document.file_path, document)
+        self.by_hash.setdefault(content_hash, document)
+        self.positions[id(document)] = position
+    
+    def holds(self, document: Document) -> bool:
+        """Check that an indexed document is still at its position."""
+        position = self.positions.get(id(document))
+        return position is not None and position < len(self.documents) and self.documents[position] is document
+    
+    def append(self, document: Document, content_hash: str):
+        self.documents.append(document)
+        self._put(document, content_hash, len(self.documents) - 1)
+    
+    def replace(self, previous: Document, previous_hash: str, document: Document, content_hash: str):
+        position = self.positions.pop(id(previous))
+        self.documents[position] = document
+        if self.by_path.get(previous.file_path) is previous:
+            del self.by_path[previous.file_path]
+        self.by_path[document.file_path] = document
+        if self.by_hash.get(previous_hash) is previous:
+            del self.by_hash[previous_hash]
+        self._put(document, content_hash, position)
+
+
 @dataclass
 class ProjectConfig:
     """Project configuration and settings."""
     
     confidence_threshold: float = 80.0
+    # Extra gap checks, see DiscoveryAnalyzer.validate_custom_gap_patterns
     custom_gap_patterns: List[Dict] = field(default_factory=list)
     priority_weights: Dict[str, float] = field(default_factory=lambda: {
         "business_rules": 1.0,
@@ -76,10 +118,76 @@ class ProjectState:
     created_at: datetime = field(default_factory=datetime.now)
     last_updated: datetime = field(default_factory=datetime.now)
     
-    def add_document(self, document: Document):
-        """Add a document to the project."""
-        self.documents.append(document)
+    # Documents by file path and by content hash, see _document_index
+    _index: Optional["_DocumentIndex"] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _document_index(self) -> "_DocumentIndex":
+        """Get the document index, rebuilding it if `documents` was replaced or resized."""
+        index = self._index
+        if index is None or index.documents is not self.documents or index.size != len(self.documents):
+            index = self._index = _DocumentIndex(self.documents)
+        return index
+    
+    def _lookup(self, table: str, key: str) -> Optional[Document]:
+        """Find a document in one index table, rebuilding the index if the entry is stale."""
+        index = self._document_index()
+        document = getattr(index, table).get(key)
+        if document is not None and not index.holds(document):
+            # `documents` was edited in place
+            index = self._index = _DocumentIndex(self.documents)
+            document = getattr(index, table).get(key)
+        return document
+    
+    def add_document(self, document: Document) -> str:
+        """
+        Add a document, replacing the earlier version of the same file.
+        
+        Documents are indexed by file path and content hash: a changed file
+        replaces its previous version in place, and a copy of content already
+        loaded from another file is not added again. Content whose earlier
+        local file is gone was moved, so that document is re-pointed to the
+        new path.
+        
+        Returns:
+            "added", "updated" (replaced the version with the same path, or
+            one whose file moved here) or "unchanged" (identical content
+            already loaded)
+        """
+        content_hash = document.hash_content()
+        previous = self._lookup("by_path", document.file_path)
+        duplicate = self._lookup("by_hash", content_hash) if previous is None else None
+        
+        if previous is not None:
+            previous_hash = previous.hash_content()
+            if previous_hash == content_hash:
+                return "unchanged"
+            self._index.replace(previous, previous_hash, document, content_hash)
+            status = "updated"
+        elif duplicate is not None:
+            ref = duplicate.content_ref
+            if ref is None or not ref.path or os.path.exists(ref.path):
+                return "unchanged"
+            self._index.replace(duplicate, content_hash, document, content_hash)
+            status = "updated"
+        else:
+            self._index.append(document, content_hash)
+            status = "added"
+        
+        self.last_updated = datetime.now()
+        return status
+    
+    def get_document(self, file_path: str) -> Optional[Document]:
+        """Get the document loaded from a file path."""
+        return self._lookup("by_path", file_path)
+    
+    def remove_document(self, file_path: str) -> bool:
+        """Remove the document loaded from a file path. Returns True if there was one."""
+        document = self.get_document(file_path)
+        if document is None:
+            return False
+        self.documents = [doc for doc in self.documents if doc is not document]
         self.last_updated = datetime.now()
+        return True
     
     def update_analysis(self, analysis: AnalysisResult):
         """Update analysis and track confidence history."""
@@ -111,9 +219,14 @@ class ProjectState:
         last = self.confidence_history[-1]["overall_confidence"]
         return last - first
     
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization."""
-        return {
+    def to_dict(self, include_documents: bool = False) -> dict:
+        """
+        Convert to dictionary for serialization.
+        
+        Args:
+            include_documents: Include full documents (for persistence) instead of only their count
+        """
+        data = {
             "project_id": self.project_id,
             "project_name": self.project_name,
             "project_description": self.project_description,
@@ -126,4 +239,24 @@ class ProjectState:
             "created_at": self.created_at.isoformat(),
             "last_updated": self.last_updated.isoformat(),
         }
+        if include_documents:
+            data["documents"] = [doc.to_dict() for doc in self.documents]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ProjectState':
+        """Create from dictionary (as produced by to_dict(include_documents=True))."""
+        return cls(
+            project_id=data["project_id"],
+            project_name=data.get("project_name", ""),
+            project_description=data.get("project_description", ""),
+            config=ProjectConfig.from_dict(data.get("config") or {}),
+            documents=[Document.from_dict(d) for d in data.get("documents", [])],
+            analysis=AnalysisResult.from_dict(data["analysis"]) if data.get("analysis") else None,
+            additional_context=data.get("additional_context", []),
+            updates_log=data.get("updates_log", []),
+            confidence_history=data.get("confidence_history", []),
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else datetime.now(),
+            last_updated=datetime.fromisoformat(data["last_updated"]) if data.get("last_updated") else datetime.now(),
+        )
 
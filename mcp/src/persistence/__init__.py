@@ -1,7 +1,8 @@
 """Persistence layer for Convex integration."""
 
-from .convex_client import ConvexClient
+from .convex_client import AsyncConvexClient, ConvexClient
 from .convex_sync import ConvexSync
+from .sync_ledger import SyncLedger
 
-__all__ = ["ConvexClient", "ConvexSync"]
+__all__ = ["AsyncConvexClient", "ConvexClient", "ConvexSync", "SyncLedger"]
 
@@ -1,10 +1,107 @@
 """Convex HTTP API client wrapper."""
 
+import asyncio
 import httpx
+import json
 import os
 import time
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional, List
 from config import config
+from core.tool_metrics import http_call
+from integration.http_client import backoff_delay, create_async_client
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one item in a bulk mutation."""
+
+    index: int
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was written."""
+        return self.id is not None
+
+
+def _convex_headers() -> Dict[str, str]:
+    """Get headers for Convex API requests."""
+    headers = {
+        "Content-Type": "application/json",
+    }
+    
+    # Optional auth header (if portal requires it). Use CONVEX_ADMIN_KEY if provided.
+    admin_key = os.getenv("CONVEX_ADMIN_KEY")
+    if admin_key:
+        headers["Authorization"] = f"Bearer {admin_key}"
+    
+    return headers
+
+
+def _function_value(result: Dict[str, Any], kind: str) -> Any:
+    """Extract a Convex function's return value from a response body."""
+    if "error" in result:
+        raise Exception(f"Convex {kind} error: {result['error']}")
+    return result.get("value")
+
+
+def _chunk_indices(items: List[Dict[str, Any]], max_bytes: int, max_items: int) -> Iterator[List[int]]:
+    """Group item indices into chunks within the request bounds."""
+    chunk: List[int] = []
+    chunk_bytes = 0
+    for i, item in enumerate(items):
+        size = len(json.dumps(item, default=str))
+        if chunk and (chunk_bytes + size > max_bytes or len(chunk) >= max_items):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        # An item larger than the byte bound is sent in a chunk of its own
+        chunk.append(i)
+        chunk_bytes += size
+    if chunk:
+        yield chunk
+
+
+def _record_chunk(function_name: str, chunk: List[int], value: Any, results: List[BulkItemResult]):
+    """Map the IDs returned by a bulk mutation back to its items."""
+    ids = value.get("ids") if isinstance(value, dict) else value
+    if not isinstance(ids, list) or len(ids) != len(chunk):
+        # The chunk was written, so retrying items would duplicate them
+        for i in chunk:
+            results[i].error = f"Unexpected result from {function_name}: {value!r}"
+        return
+    for i, item_id in zip(chunk, ids):
+        results[i].id = item_id
+
+
+def _record_single(function_name: str, value: Any, result: BulkItemResult):
+    """Record the ID returned by a single-item mutation."""
+    # Some portals return {_id: ...}, others return the id directly
+    if isinstance(value, dict):
+        value = value.get("_id")
+    if value:
+        result.id = value
+    else:
+        result.error = f"No id returned by {function_name}"
+
+
+def _is_rejection(error: Exception) -> bool:
+    """Whether Convex refused a request (as opposed to being unreachable)."""
+    if isinstance(error, httpx.RequestError):
+        return False
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code < 500
+    return True
+
+
+def _should_retry(error: Exception, attempt: int, retries: int) -> bool:
+    """Whether a failed request is retried (server errors and network failures)."""
+    if attempt >= retries - 1:
+        return False
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.RequestError)
 
 
 class ConvexClient:
@@ -24,19 +121,14 @@ class ConvexClient:
         
         # HTTP client with timeout
         self.client = httpx.Client(timeout=30.0)
+        
+        # Bounds for one bulk mutation request
+        self.batch_max_bytes = config.CONVEX_BATCH_MAX_BYTES
+        self.batch_max_items = config.CONVEX_BATCH_MAX_ITEMS
 
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for Convex API requests."""
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        # Optional auth header (if portal requires it). Use CONVEX_ADMIN_KEY if provided.
-        admin_key = os.getenv("CONVEX_ADMIN_KEY")
-        if admin_key:
-            headers["Authorization"] = f"Bearer {admin_key}"
-        
-        return headers
+        return _convex_headers()
 
     def _make_request(
         self,
@@ -66,28 +158,21 @@ class ConvexClient:
         last_error = None
         for attempt in range(retries):
             try:
-                if method == "POST":
-                    response = self.client.post(url, json=data, headers=headers)
-                elif method == "GET":
-                    response = self.client.get(url, headers=headers)
-                else:
+                if method not in ("POST", "GET"):
                     raise ValueError(f"Unsupported method: {method}")
-                
-                response.raise_for_status()
+                with http_call("convex"):
+                    if method == "POST":
+                        response = self.client.post(url, json=data, headers=headers)
+                    else:
+                        response = self.client.get(url, headers=headers)
+                    response.raise_for_status()
                 return response.json()
             
-            except httpx.HTTPStatusError as e:
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
                 last_error = e
-                if e.response.status_code >= 500 and attempt < retries - 1:
-                    # Retry on server errors
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    continue
-                raise
-            
-            except httpx.RequestError as e:
-                last_error = e
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
+                if _should_retry(e, attempt, retries):
+                    # Retry on server errors and network failures
+                    time.sleep(backoff_delay(attempt))  # Exponential backoff
                     continue
                 raise
         
@@ -110,11 +195,7 @@ class ConvexClient:
         }
         
         result = self._make_request("POST", "/api/mutation", data)
-        
-        if "error" in result:
-            raise Exception(f"Convex mutation error: {result['error']}")
-        
-        return result.get("value")
+        return _function_value(result, "mutation")
 
     def query(self, function_name: str, args: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -133,11 +214,7 @@ class ConvexClient:
         }
         
         result = self._make_request("POST", "/api/query", data)
-        
-        if "error" in result:
-            raise Exception(f"Convex query error: {result['error']}")
-        
-        return result.get("value")
+        return _function_value(result, "query")
 
     def batch_mutations(self, mutations: List[Dict[str, Any]]) -> List[Any]:
         """
@@ -158,6 +235,63 @@ class ConvexClient:
             results.append(result)
         return results
 
+    def bulk_mutation(
+        self,
+        function_name: str,
+        items: List[Dict[str, Any]],
+        shared_args: Optional[Dict[str, Any]] = None,
+        item_function_name: Optional[str] = None
+    ) -> List[BulkItemResult]:
+        """
+        Create many records in few requests.
+        
+        Items are split into chunks bounded by serialized size and count.
+        Each chunk is one call to `function_name` with
+        `{**shared_args, "items": chunk}`, which must return `{"ids": [...]}`
+        in input order. If Convex rejects a chunk (e.g. one invalid item, or
+        a deployment without the bulk mutation), its items are retried one at
+        a time with `item_function_name` and `{**shared_args, **item}`, so
+        only the bad items fail.
+        
+        Args:
+            function_name: Bulk mutation name (e.g., "mutations/gaps:createMany")
+            items: Per-item arguments
+            shared_args: Arguments common to all items (e.g., projectId)
+            item_function_name: Optional single-item mutation used as fallback
+            
+        Returns:
+            One BulkItemResult per item, in input order
+        """
+        shared_args = shared_args or {}
+        results = [BulkItemResult(index=i) for i in range(len(items))]
+        
+        for chunk in _chunk_indices(items, self.batch_max_bytes, self.batch_max_items):
+            try:
+                value = self.mutation(
+                    function_name,
+                    {**shared_args, "items": [items[i] for i in chunk]}
+                )
+            except Exception as e:
+                if item_function_name and _is_rejection(e):
+                    for i in chunk:
+                        self._single_mutation(item_function_name, {**shared_args, **items[i]}, results[i])
+                else:
+                    for i in chunk:
+                        results[i].error = str(e)
+                continue
+            _record_chunk(function_name, chunk, value, results)
+        
+        return results
+
+    def _single_mutation(self, function_name: str, args: Dict[str, Any], result: BulkItemResult):
+        """Write one item and record its outcome."""
+        try:
+            value = self.mutation(function_name, args)
+        except Exception as e:
+            result.error = str(e)
+            return
+        _record_single(function_name, value, result)
+
     def close(self):
         """Close the HTTP client."""
         self.client.close()
@@ -169,3 +303,175 @@ class ConvexClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
+
+
+class AsyncConvexClient:
+    """
+    Async wrapper around Convex HTTP API, for use from async tool handlers.
+    
+    Requests go through a pooled keep-alive client (optionally HTTP/2) and
+    retries back off with `asyncio.sleep`, so a slow or retried call only
+    suspends its own coroutine instead of the worker serving other requests.
+    Same API and semantics as ConvexClient, as coroutines.
+    """
+
+    def __init__(
+        self,
+        deployment_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Initialize async Convex client.
+        
+        Args:
+            deployment_url: Convex deployment URL (defaults to CONVEX_DEPLOYMENT_URL)
+            client: Optional shared httpx.AsyncClient (a pooled one is created if not provided)
+        """
+        self.deployment_url = deployment_url or config.CONVEX_DEPLOYMENT_URL
+        
+        if not self.deployment_url:
+            raise ValueError("CONVEX_DEPLOYMENT_URL not configured")
+        
+        self.client = client or create_async_client(timeout=30.0)
+        self._owns_client = client is None
+        
+        # Bounds for one bulk mutation request
+        self.batch_max_bytes = config.CONVEX_BATCH_MAX_BYTES
+        self.batch_max_items = config.CONVEX_BATCH_MAX_ITEMS
+
+    async def _make_request(
+        self,
+        path: str,
+        data: Dict[str, Any],
+        retries: int = 3
+    ) -> Dict[str, Any]:
+        """
+        POST to Convex API with non-blocking retry logic.
+        
+        Args:
+            path: API path (e.g., "/api/mutation")
+            data: Request body data
+            retries: Number of retry attempts
+            
+        Returns:
+            Response data as dictionary
+            
+        Raises:
+            Exception on failure after all retries
+        """
+        url = f"{self.deployment_url}{path}"
+        headers = _convex_headers()
+        
+        last_error = None
+        for attempt in range(retries):
+            try:
+                with http_call("convex"):
+                    response = await self.client.post(url, json=data, headers=headers)
+                    response.raise_for_status()
+                return response.json()
+            
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                last_error = e
+                if _should_retry(e, attempt, retries):
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+                raise
+        
+        raise last_error or Exception("Request failed after all retries")
+
+    async def mutation(self, function_name: str, args: Dict[str, Any]) -> Any:
+        """
+        Call a Convex mutation (write operation).
+        
+        Args:
+            function_name: Mutation name (e.g., "mutations/projects:upsertProject")
+            args: Mutation arguments
+            
+        Returns:
+            Mutation result
+        """
+        result = await self._make_request("/api/mutation", {"path": function_name, "args": args})
+        return _function_value(result, "mutation")
+
+    async def query(self, function_name: str, args: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a Convex query (read operation).
+        
+        Args:
+            function_name: Query name (e.g., "queries/projects:listProjects")
+            args: Query arguments
+            
+        Returns:
+            Query result
+        """
+        result = await self._make_request("/api/query", {"path": function_name, "args": args or {}})
+        return _function_value(result, "query")
+
+    async def bulk_mutation(
+        self,
+        function_name: str,
+        items: List[Dict[str, Any]],
+        shared_args: Optional[Dict[str, Any]] = None,
+        item_function_name: Optional[str] = None
+    ) -> List[BulkItemResult]:
+        """
+        Create many records in few requests (see ConvexClient.bulk_mutation).
+        
+        Chunks are sent concurrently over the connection pool.
+        
+        Args:
+            function_name: Bulk mutation name (e.g., "mutations/gaps:createMany")
+            items: Per-item arguments
+            shared_args: Arguments common to all items (e.g., projectId)
+            item_function_name: Optional single-item mutation used as fallback
+            
+        Returns:
+            One BulkItemResult per item, in input order
+        """
+        shared_args = shared_args or {}
+        results = [BulkItemResult(index=i) for i in range(len(items))]
+        
+        async def send(chunk: List[int]):
+            try:
+                value = await self.mutation(
+                    function_name,
+                    {**shared_args, "items": [items[i] for i in chunk]}
+                )
+            except Exception as e:
+                if item_function_name and _is_rejection(e):
+                    await asyncio.gather(*(
+                        self._single_mutation(item_function_name, {**shared_args, **items[i]}, results[i])
+                        for i in chunk
+                    ))
+                else:
+                    for i in chunk:
+                        results[i].error = str(e)
+                return
+            _record_chunk(function_name, chunk, value, results)
+        
+        await asyncio.gather(*(
+            send(chunk) for chunk in _chunk_indices(items, self.batch_max_bytes, self.batch_max_items)
+        ))
+        return results
+
+    async def _single_mutation(self, function_name: str, args: Dict[str, Any], result: BulkItemResult):
+        """Write one item and record its outcome."""
+        try:
+            value = await self.mutation(function_name, args)
+        except Exception as e:
+            result.error = str(e)
+            return
+        _record_single(function_name, value, result)
+
+    async def aclose(self):
+        """Close the HTTP client if owned by this instance."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
@@ -1,26 +1,64 @@
 """High-level data sync operations for Convex."""
 
+import hashlib
+import json
 import os
-from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 from .convex_client import ConvexClient
+from .sync_ledger import SyncLedger
 from models.project_state import ProjectState
 from models.analysis import Gap, Ambiguity, Conflict
 from config import config
+from core.tracing import span, traced
+
+
+@dataclass
+class SyncedItem:
+    """Outcome of pushing one finding, question or document to Convex."""
+
+    item: Any
+    convex_id: Optional[str] = None
+    error: Optional[str] = None
+    action: str = "unchanged"  # inserted, updated or unchanged
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was written."""
+        return self.convex_id is not None
+
+
+# Fields only sent when a record is created (they are not part of its digest)
+INSERT_ONLY_FIELDS = ("identifiedDate", "askedDate", "uploadDate")
+
+# Status given to findings that are no longer detected
+RETIRED_STATUS = {"gaps": "resolved", "conflicts": "resolved", "ambiguities": "resolved"}
 
 
 class ConvexSync:
-    """High-level sync operations for pushing MCP data to Convex."""
+    """
+    High-level sync operations for pushing MCP data to Convex.
+    
+    Syncs are differential: every finding, question and document has a
+    stable key derived from its identifying fields, and the ledger records
+    the Convex ID and a digest of what was last pushed for each key. Only
+    new records are inserted, only changed ones are patched, and findings
+    that are no longer detected are moved to a resolved status. Re-syncing
+    an unchanged project costs the single project lookup.
+    """
 
-    def __init__(self, client: Optional[ConvexClient] = None):
+    def __init__(self, client: Optional[ConvexClient] = None, ledger: Optional[SyncLedger] = None):
         """
         Initialize sync manager.
         
         Args:
             client: Optional ConvexClient instance (creates new one if not provided)
+            ledger: Optional record of pushed data (kept in memory if not provided)
         """
         self.client = client or ConvexClient()
         self._owns_client = client is None
+        self.ledger = ledger or SyncLedger()
 
     def _map_priority(self, priority_value: str) -> str:
         """Map MCP priority to frontend priority format."""
@@ -109,11 +147,15 @@ class ConvexSync:
         project_id = self._ensure_project(project.project_id, project.project_name)
 
         confidence = round(project.analysis.overall_confidence, 1) if project.analysis else 0.0
+        pushed = self.ledger.entries(project_id, "projects").get("metadata")
+        if pushed and pushed[1] == str(confidence):
+            return project_id
         try:
             self.client.mutation(
                 "mutations/projects:update",
                 {"id": project_id, "confidence": confidence, **self._tenant_context()}
             )
+            self.ledger.record(project_id, "projects", [("metadata", project_id, str(confidence))])
             # Log confidence update for timeline visibility
             try:
                 self.log_event(
@@ -131,13 +173,108 @@ class ConvexSync:
                     "mutations/projects:recalculateConfidence",
                     {"id": project_id, "confidence": confidence, **self._tenant_context()}
                 )
+                self.ledger.record(project_id, "projects", [("metadata", project_id, str(confidence))])
             except Exception:
                 # Best effort; continue
                 pass
 
         return project_id
 
-    def sync_gaps(self, project_convex_id: str, gaps: List[Gap], identified_date: Optional[datetime] = None) -> List[str]:
+    @staticmethod
+    def _digest(data: Any) -> str:
+        """Stable digest of JSON-compatible data."""
+        return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _push(self, kind: str, project_convex_id: str, items: List[Any], item_args: List[Dict[str, Any]],
+              identities: List[Any], item_function_name: str) -> List[SyncedItem]:
+        """
+        Push the changes between items and what was last synced.
+        
+        Findings pushed before but missing from items are resolved, so an
+        empty items list retires everything still open for the kind.
+        
+        Args:
+            kind: Mutation module and ledger kind (e.g., "gaps")
+            project_convex_id: Convex project ID
+            items: Originating objects, one per record
+            item_args: Record arguments, one per item
+            identities: Identifying fields per item, from which its stable key is derived
+            item_function_name: Single-item create mutation used if a chunk is rejected
+            
+        Returns:
+            SyncedItem per item, in input order
+        """
+        pushed = self.ledger.entries(project_convex_id, kind)
+        results = [SyncedItem(item=item) for item in items]
+        keys: List[str] = []
+        digests: List[str] = []
+        inserts: List[int] = []
+        updates: List[int] = []
+        occurrences: Dict[str, int] = {}
+        
+        for i, (args, identity) in enumerate(zip(item_args, identities)):
+            # Identical findings are told apart by their order of appearance
+            base_key = self._digest([kind, identity])
+            occurrences[base_key] = occurrences.get(base_key, 0) + 1
+            key = self._digest([base_key, occurrences[base_key]]) if occurrences[base_key] > 1 else base_key
+            digest = self._digest({k: v for k, v in args.items() if k not in INSERT_ONLY_FIELDS})
+            keys.append(key)
+            digests.append(digest)
+            
+            if key not in pushed:
+                inserts.append(i)
+            elif pushed[key][1] != digest:
+                updates.append(i)
+            else:
+                results[i].convex_id = pushed[key][0]
+        
+        recorded: List[tuple] = []
+        
+        if inserts:
+            outcomes = self.client.bulk_mutation(
+                f"mutations/{kind}:createMany",
+                [item_args[i] for i in inserts],
+                shared_args={"projectId": project_convex_id, **self._tenant_context()},
+                item_function_name=item_function_name,
+            )
+            for i, outcome in zip(inserts, outcomes):
+                results[i].convex_id, results[i].error = outcome.id, outcome.error
+                results[i].action = "inserted"
+                if outcome.ok:
+                    recorded.append((keys[i], outcome.id, digests[i]))
+        
+        patches: List[Dict[str, Any]] = []
+        patch_records: List[tuple] = []
+        for i in updates:
+            convex_id = pushed[keys[i]][0]
+            fields = {k: v for k, v in item_args[i].items() if k not in INSERT_ONLY_FIELDS}
+            patches.append({"id": convex_id, **fields})
+            patch_records.append((i, keys[i], convex_id, digests[i]))
+        
+        # Findings no longer detected are resolved rather than deleted
+        retired_status = RETIRED_STATUS.get(kind)
+        if retired_status:
+            current = set(keys)
+            for key, (convex_id, digest) in pushed.items():
+                if key not in current and digest != retired_status:
+                    patches.append({"id": convex_id, "status": retired_status})
+                    patch_records.append((None, key, convex_id, retired_status))
+        
+        if patches:
+            outcomes = self.client.bulk_mutation(f"mutations/{kind}:updateMany", patches)
+            for (i, key, convex_id, digest), outcome in zip(patch_records, outcomes):
+                if i is not None:
+                    results[i].action = "updated"
+                    results[i].convex_id = convex_id if outcome.ok else None
+                    results[i].error = outcome.error
+                if outcome.ok:
+                    recorded.append((key, convex_id, digest))
+        
+        if recorded:
+            self.ledger.record(project_convex_id, kind, recorded)
+        return results
+
+    def sync_gaps(self, project_convex_id: str, gaps: List[Gap], identified_date: Optional[datetime] = None) -> List[SyncedItem]:
         """
         Sync gaps to Convex.
         
@@ -147,33 +284,27 @@ class ConvexSync:
             identified_date: When gaps were identified
             
         Returns:
-            List of gap IDs
+            SyncedItem per gap (Convex ID or error), in input order
         """
-        if not gaps:
-            return []
-        
         timestamp = int((identified_date or datetime.now()).timestamp() * 1000)
         
-        created_ids: List[str] = []
+        item_args: List[Dict[str, Any]] = []
         for gap in gaps:
             args = {
-                "projectId": project_convex_id,
                 "category": gap.category.value,
                 "description": gap.description,
                 "impact": self._map_impact(gap.priority.value),
                 "priority": self._map_priority(gap.priority.value),
                 "status": "resolved" if gap.answered else "open",
                 "identifiedDate": timestamp,
-                **self._tenant_context(),
             }
             if gap.suggested_question:
                 args["suggestedQuestion"] = gap.suggested_question
-            gap_id = self.client.mutation("mutations/gaps:create", args)
-            if gap_id:
-                created_ids.append(gap_id if isinstance(gap_id, str) else gap_id.get("_id", gap_id))
-        return created_ids
+            item_args.append(args)
+        identities = [(gap.category.value, gap.description) for gap in gaps]
+        return self._push("gaps", project_convex_id, gaps, item_args, identities, "mutations/gaps:create")
 
-    def sync_conflicts(self, project_convex_id: str, conflicts: List[Conflict], identified_date: Optional[datetime] = None) -> List[str]:
+    def sync_conflicts(self, project_convex_id: str, conflicts: List[Conflict], identified_date: Optional[datetime] = None) -> List[SyncedItem]:
         """
         Sync conflicts to Convex.
         
@@ -183,20 +314,16 @@ class ConvexSync:
             identified_date: When conflicts were identified
             
         Returns:
-            List of conflict IDs
+            SyncedItem per conflict (Convex ID or error), in input order
         """
-        if not conflicts:
-            return []
-        
         timestamp = int((identified_date or datetime.now()).timestamp() * 1000)
         
-        created_ids: List[str] = []
+        item_args: List[Dict[str, Any]] = []
         for conflict in conflicts:
             # Determine status based on whether resolution exists
             status = "resolved" if conflict.resolution else "open"
             
             args = {
-                "projectId": project_convex_id,
                 "category": conflict.topic,
                 "description": conflict.resolution_needed,
                 "impact": self._map_impact(conflict.priority.value),
@@ -205,19 +332,16 @@ class ConvexSync:
                 "identifiedDate": timestamp,
                 "conflictingStatements": conflict.conflicting_statements,
                 "sources": conflict.sources,
-                **self._tenant_context(),
             }
             
             # Include resolution if present
             if conflict.resolution:
                 args["resolution"] = conflict.resolution
-            
-            conflict_id = self.client.mutation("mutations/conflicts:create", args)
-            if conflict_id:
-                created_ids.append(conflict_id if isinstance(conflict_id, str) else conflict_id.get("_id", conflict_id))
-        return created_ids
+            item_args.append(args)
+        identities = [conflict.topic for conflict in conflicts]
+        return self._push("conflicts", project_convex_id, conflicts, item_args, identities, "mutations/conflicts:create")
 
-    def sync_ambiguities(self, project_convex_id: str, ambiguities: List[Ambiguity], identified_date: Optional[datetime] = None) -> List[str]:
+    def sync_ambiguities(self, project_convex_id: str, ambiguities: List[Ambiguity], identified_date: Optional[datetime] = None) -> List[SyncedItem]:
         """
         Sync ambiguities to Convex.
         
@@ -227,20 +351,16 @@ class ConvexSync:
             identified_date: When ambiguities were identified
             
         Returns:
-            List of ambiguity IDs
+            SyncedItem per ambiguity (Convex ID or error), in input order
         """
-        if not ambiguities:
-            return []
-        
         timestamp = int((identified_date or datetime.now()).timestamp() * 1000)
         
-        created_ids: List[str] = []
+        item_args: List[Dict[str, Any]] = []
         for ambiguity in ambiguities:
             # Determine status based on whether clarification exists
             status = "clarified" if ambiguity.clarification else "open"
             
             args = {
-                "projectId": project_convex_id,
                 "category": "clarity",
                 "description": ambiguity.term,
                 "impact": self._map_impact(ambiguity.priority.value),
@@ -248,19 +368,16 @@ class ConvexSync:
                 "status": status,
                 "identifiedDate": timestamp,
                 "context": ambiguity.context,
-                **self._tenant_context(),
             }
             
             # Include clarification if present
             if ambiguity.clarification:
                 args["clarification"] = ambiguity.clarification
-            
-            amb_id = self.client.mutation("mutations/ambiguities:create", args)
-            if amb_id:
-                created_ids.append(amb_id if isinstance(amb_id, str) else amb_id.get("_id", amb_id))
-        return created_ids
+            item_args.append(args)
+        identities = [ambiguity.term for ambiguity in ambiguities]
+        return self._push("ambiguities", project_convex_id, ambiguities, item_args, identities, "mutations/ambiguities:create")
 
-    def sync_questions(self, project_convex_id: str, questions: List[Dict[str, Any]]) -> List[str]:
+    def sync_questions(self, project_convex_id: str, questions: List[Dict[str, Any]]) -> List[SyncedItem]:
         """
         Sync extracted questions to Convex.
         
@@ -269,44 +386,46 @@ class ConvexSync:
             questions: List of question dicts from _extract_questions_from_analysis
             
         Returns:
-            List of question IDs
+            SyncedItem per question (Convex ID or error), in input order
         """
         if not questions:
             return []
         
-        created_ids: List[str] = []
+        asked_date = int(datetime.now().timestamp() * 1000)
+        
+        item_args: List[Dict[str, Any]] = []
         for q in questions:
             args = {
-                "projectId": project_convex_id,
                 "question": q["question"],
                 "category": q.get("category", "general"),
                 "priority": q.get("priority", "medium").lower(),
                 "status": "open",
-                "askedDate": int(datetime.now().timestamp() * 1000),
-                **self._tenant_context(),
+                "askedDate": asked_date,
             }
             if "why_it_matters" in q:
                 args["whyItMatters"] = q["why_it_matters"]
-            q_id = self.client.mutation("mutations/questions:add", args)
-            if q_id:
-                created_ids.append(q_id if isinstance(q_id, str) else q_id.get("_id", q_id))
-        return created_ids
+            item_args.append(args)
+        identities = [(q.get("category", "general"), q["question"]) for q in questions]
+        return self._push("questions", project_convex_id, questions, item_args, identities, "mutations/questions:add")
 
-    def sync_documents(self, project_convex_id: str, project: ProjectState) -> List[str]:
+    def sync_documents(self, project_convex_id: str, project: ProjectState) -> List[SyncedItem]:
         """
         Sync document metadata to Convex.
         
+        Created Convex IDs are recorded on each document's
+        `convex_document_id`, so later summary updates can target them.
+        
         Args:
             project_convex_id: Convex project ID
             project: ProjectState instance
             
         Returns:
-            List of document IDs
+            SyncedItem per document (Convex ID or error), in input order
         """
         if not project.documents:
             return []
         
-        created_ids: List[str] = []
+        item_args: List[Dict[str, Any]] = []
         for doc in project.documents:
             upload_ts = int(doc.date.timestamp() * 1000) if getattr(doc, "date", None) else int(datetime.now().timestamp() * 1000)
             size_bytes: Optional[int] = None
@@ -316,7 +435,6 @@ class ConvexSync:
                 size_bytes = None
 
             args = {
-                "projectId": project_convex_id,
                 "name": os.path.basename(doc.file_path),
                 "type": doc.doc_type.value,
                 "uploadDate": upload_ts,
@@ -324,7 +442,6 @@ class ConvexSync:
                 "status": "processed",
                 "source": getattr(doc, 'source', 'local'),
                 "metadata": doc.metadata,
-                **self._tenant_context(),
             }
             
             # Add integration-specific fields if available
@@ -336,10 +453,14 @@ class ConvexSync:
                 args["integrationId"] = doc.integration_id
             if hasattr(doc, 'summary') and doc.summary:
                 args["summary"] = doc.summary
-            doc_id = self.client.mutation("mutations/documents:create", args)
-            if doc_id:
-                created_ids.append(doc_id if isinstance(doc_id, str) else doc_id.get("_id", doc_id))
-        return created_ids
+            item_args.append(args)
+        
+        identities = [doc.external_id or doc.file_path for doc in project.documents]
+        synced = self._push("documents", project_convex_id, project.documents, item_args, identities, "mutations/documents:create")
+        for result in synced:
+            if result.ok:
+                result.item.convex_document_id = result.convex_id
+        return synced
 
     def update_conflict_resolution(self, conflict_id: str, resolution: str, project_id: str) -> str:
         """
@@ -439,9 +560,10 @@ class ConvexSync:
         
         return event_id
 
+    @traced("convex.sync_full_project")
     def sync_full_project(self, project: ProjectState) -> Dict[str, Any]:
         """
-        Sync all project data to Convex.
+        Sync all project data to Convex, pushing only what changed.
         
         Args:
             project: ProjectState instance
@@ -450,31 +572,50 @@ class ConvexSync:
             Dictionary with sync results
         """
         # 1. Sync project metadata (returns Convex ID)
-        project_id = self.sync_project_metadata(project)
+        with span("convex.metadata"):
+            project_id = self.sync_project_metadata(project)
         
         results = {
             "project_id": project_id,
             "project_name": project.project_name,
         }
         
+        synced: Dict[str, List[SyncedItem]] = {}
+        
         # 2. Sync analysis results if available
         if project.analysis:
-            results["gaps"] = self.sync_gaps(project_id, project.analysis.gaps)
-            results["conflicts"] = self.sync_conflicts(project_id, project.analysis.conflicts)
-            results["ambiguities"] = self.sync_ambiguities(project_id, project.analysis.ambiguities)
+            with span("convex.gaps", items=len(project.analysis.gaps)):
+                synced["gaps"] = self.sync_gaps(project_id, project.analysis.gaps)
+            with span("convex.conflicts", items=len(project.analysis.conflicts)):
+                synced["conflicts"] = self.sync_conflicts(project_id, project.analysis.conflicts)
+            with span("convex.ambiguities", items=len(project.analysis.ambiguities)):
+                synced["ambiguities"] = self.sync_ambiguities(project_id, project.analysis.ambiguities)
         
         # 3. Sync documents
-        results["documents"] = self.sync_documents(project_id, project)
+        with span("convex.documents", items=len(project.documents)):
+            synced["documents"] = self.sync_documents(project_id, project)
         
-        # 4. Log sync event
-        # Log analysis completed event
+        errors: List[str] = []
+        changed = 0
+        for component, items in synced.items():
+            results[component] = [item.convex_id for item in items if item.ok]
+            errors.extend(f"{component}: {item.error}" for item in items if item.error)
+            changed += sum(1 for item in items if item.action != "unchanged")
+        results["changed"] = changed
+        if errors:
+            results["errors"] = errors
+        
+        # 4. Log sync event (nothing to report if nothing changed)
+        if not changed:
+            return results
         try:
-            self.log_event(
-                project_id,
-                "analysis_completed",
-                f"Full project sync completed for {project.project_name}",
-                {"confidence": project.analysis.overall_confidence if project.analysis else 0}
-            )
+            with span("convex.event"):
+                self.log_event(
+                    project_id,
+                    "analysis_completed",
+                    f"Full project sync completed for {project.project_name}",
+                    {"confidence": project.analysis.overall_confidence if project.analysis else 0}
+                )
         except Exception:
             pass
         
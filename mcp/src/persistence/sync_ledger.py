@@ -0,0 +1,85 @@
+"""Local record of what was last pushed to Convex."""
+
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Tuple
+
+
+class SyncLedger:
+    """
+    SQLite-backed record of synced records, per Convex project.
+
+    Each entry maps a stable finding key to the Convex ID it was created as
+    and a digest of the fields last pushed, so a sync can tell inserts,
+    updates and unchanged items apart without reading anything back from
+    Convex. Entries are scoped by Convex project ID, so a project that was
+    recreated in the portal starts from an empty record.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (or create) a ledger.
+
+        Args:
+            path: SQLite database file path (":memory:" keeps it for this process only)
+        """
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS synced ("
+                " convex_project_id TEXT NOT NULL,"
+                " kind TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " convex_id TEXT NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " PRIMARY KEY (convex_project_id, kind, key))"
+            )
+
+    def entries(self, convex_project_id: str, kind: str) -> Dict[str, Tuple[str, str]]:
+        """
+        Get the last pushed state of one kind of record.
+
+        Args:
+            convex_project_id: Convex project ID
+            kind: Record kind (e.g., "gaps")
+
+        Returns:
+            Mapping of key to (Convex ID, digest)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, convex_id, digest FROM synced WHERE convex_project_id = ? AND kind = ?",
+                (convex_project_id, kind)
+            ).fetchall()
+        return {key: (convex_id, digest) for key, convex_id, digest in rows}
+
+    def record(self, convex_project_id: str, kind: str, rows: Iterable[Tuple[str, str, str]]):
+        """
+        Record pushed records.
+
+        Args:
+            convex_project_id: Convex project ID
+            kind: Record kind (e.g., "gaps")
+            rows: (key, Convex ID, digest) per pushed record
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO synced (convex_project_id, kind, key, convex_id, digest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(convex_project_id, kind, key, convex_id, digest) for key, convex_id, digest in rows]
+            )
+
+    def forget(self, convex_project_id: str):
+        """Drop everything recorded for a Convex project."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM synced WHERE convex_project_id = ?", (convex_project_id,))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
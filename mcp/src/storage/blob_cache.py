@@ -0,0 +1,181 @@
+"""Content-addressed cache of document bodies."""
+
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional: compression is skipped without it
+    zstandard = None
+
+ZSTD_SUFFIX = ".zst"
+
+
+class BlobCache:
+    """
+    Local cache of file contents keyed by their SHA-256.
+
+    Blobs are stored as `<root>/<first two hex digits>/<digest>` (with a
+    `.zst` suffix when compressed). Identical content is stored once, and a
+    blob never changes once written, so a digest recorded elsewhere (a sync
+    manifest, a ContentRef) stays valid for as long as the blob exists.
+
+    The cache is bounded by its size on disk: once it exceeds `max_bytes`,
+    least recently used blobs are evicted. Use order is kept in the files'
+    modification times, so it survives restarts.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 0, compression: Optional[str] = None):
+        """
+        Initialize blob cache.
+
+        Args:
+            root: Cache directory (created if missing)
+            max_bytes: Size bound on disk (0 = unbounded)
+            compression: "zstd" to compress new blobs (needs the zstandard package)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compress = compression == "zstd"
+        if self.compress and zstandard is None:
+            print("Warning: zstd compression requested but zstandard is not installed; storing blobs uncompressed")
+            self.compress = False
+        self._lock = Lock()
+        self._counters: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+        # digest -> (path, size on disk), least recently used first
+        self._index: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total = 0
+        blobs = []
+        for path in self.root.glob("??/*"):
+            if path.name.endswith(".tmp"):
+                continue
+            stat = path.stat()
+            blobs.append((stat.st_mtime, path.name.split(".")[0], path, stat.st_size))
+        for _, digest, path, size in sorted(blobs):
+            self._index[digest] = (path, size)
+            self._total += size
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """SHA-256 hex digest of content."""
+        return hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes) -> str:
+        """
+        Store content.
+
+        Args:
+            data: Content bytes
+
+        Returns:
+            SHA-256 hex digest to retrieve it by
+        """
+        digest = self.digest(data)
+        with self._lock:
+            if digest in self._index:
+                self._touch(digest)
+                return digest
+
+        path = self.root / digest[:2] / digest
+        payload = data
+        if self.compress:
+            path = path.with_name(digest + ZSTD_SUFFIX)
+            payload = zstandard.ZstdCompressor().compress(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a partial blob
+        tmp_path = path.with_name(f"{digest}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if digest not in self._index:
+                self._index[digest] = (path, len(payload))
+                self._total += len(payload)
+            self._evict(keep=digest)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """
+        Get content by digest.
+
+        Args:
+            digest: SHA-256 hex digest
+
+        Returns:
+            Content bytes, or None if not cached
+        """
+        with self._lock:
+            entry = self._index.get(digest)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._touch(digest)
+        path = entry[0]
+        try:
+            payload = path.read_bytes()
+        except FileNotFoundError:
+            # Removed outside the cache
+            with self._lock:
+                self._forget(digest)
+                self._counters["misses"] += 1
+            return None
+        if path.name.endswith(ZSTD_SUFFIX):
+            if zstandard is None:
+                print(f"Warning: Cannot read compressed blob {digest} without zstandard")
+                return None
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        with self._lock:
+            self._counters["hits"] += 1
+        return payload
+
+    def contains(self, digest: str) -> bool:
+        """Check if content is cached."""
+        with self._lock:
+            return digest in self._index
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "blobs": len(self._index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "compression": "zstd" if self.compress else None,
+                **self._counters,
+            }
+
+    def _touch(self, digest: str):
+        """Mark a blob as most recently used (caller holds the lock)."""
+        self._index.move_to_end(digest)
+        try:
+            os.utime(self._index[digest][0])
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, digest: str):
+        """Drop a blob from the index (caller holds the lock)."""
+        _, size = self._index.pop(digest)
+        self._total -= size
+
+    def _evict(self, keep: str):
+        """Remove least recently used blobs beyond the size bound (caller holds the lock)."""
+        if self.max_bytes <= 0:
+            return
+        for digest in list(self._index):
+            if self._total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            path = self._index[digest][0]
+            self._forget(digest)
+            self._counters["evictions"] += 1
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,327 @@
+"""Cached catalog of local projects and their files, validated by directory mtimes."""
+
+import atexit
+import json
+import os
+import time
+from pathlib import Path
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Tuple
+
+# A directory modified this recently may change again within the same mtime
+# tick, so its listing is not trusted until the window has passed
+RACY_WINDOW_NS = 2_000_000_000
+
+# Minimum seconds between rewrites of the catalog file
+SAVE_INTERVAL_SECONDS = 5.0
+
+CATALOG_VERSION = 1
+
+
+class _Dir:
+    """Cached listing of one directory."""
+
+    __slots__ = ("mtime_ns", "files", "dirs", "checked")
+
+    def __init__(self):
+        self.mtime_ns = -1  # -1: not scanned (or not trusted) yet
+        self.files: Dict[str, Tuple[int, int]] = {}  # name -> (size, mtime_ns)
+        self.dirs: Dict[str, "_Dir"] = {}
+        self.checked = 0.0  # monotonic time of the last mtime check
+
+    def to_dict(self) -> Dict:
+        return {
+            "mtime_ns": self.mtime_ns,
+            "files": {name: list(info) for name, info in self.files.items()},
+            "dirs": {name: child.to_dict() for name, child in self.dirs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "_Dir":
+        node = cls()
+        node.mtime_ns = data.get("mtime_ns", -1)
+        node.files = {name: (info[0], info[1]) for name, info in data.get("files", {}).items()}
+        node.dirs = {name: cls.from_dict(child) for name, child in data.get("dirs", {}).items()}
+        return node
+
+
+class DirectoryCatalog:
+    """
+    In-memory catalog of the projects under a base directory.
+
+    Keeps each directory's entries (files with size and mtime, and
+    subdirectories) plus each project's parsed metadata. A directory's
+    listing is reused as long as its mtime is unchanged, and is re-read
+    with one `os.scandir` when it changes; a project's metadata is re-read
+    only when its folder is. Checking costs one `stat` per directory
+    visited, or nothing within `revalidate_seconds` of the last check.
+
+    Adding, removing or renaming entries changes a directory's mtime, but
+    rewriting a file in place does not, so the size and mtime reported for
+    such a file can lag until its directory changes. Writes made through
+    the storage provider invalidate the catalog explicitly.
+
+    The catalog is saved to `path` (if given) and reloaded on restart; every
+    loaded directory is checked against its mtime before it is trusted.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        metadata_reader: Callable[[Path], Dict],
+        path: Optional[str] = None,
+        revalidate_seconds: float = 0.0
+    ):
+        """
+        Initialize catalog.
+
+        Args:
+            base_path: Directory holding one folder per project
+            metadata_reader: Reads a project's metadata from its folder
+            path: JSON file to persist the catalog to (None = memory only)
+            revalidate_seconds: Trust cached listings for this long without
+                checking mtimes (0 = check on every call)
+        """
+        self.base_path = Path(base_path)
+        self.path = Path(path) if path else None
+        self.revalidate_seconds = revalidate_seconds
+        self._read_metadata = metadata_reader
+        self._base = _Dir()
+        self._metadata: Dict[str, Dict] = {}
+        self._lock = RLock()
+        self._dirty = False
+        self._saved_at = 0.0
+        self.stat_checks = 0
+        self.rescans = 0
+        self._load()
+        if self.path:
+            atexit.register(self.flush)
+
+    # Queries
+
+    def project_ids(self) -> List[str]:
+        """List project folder names (hidden folders excluded)."""
+        with self._lock:
+            if self._check(self._base, self.base_path) is None:
+                self._base = _Dir()
+            ids = [name for name in self._base.dirs if not name.startswith(".")]
+            self._maybe_save()
+            return ids
+
+    def project(self, project_id: str) -> Optional[Dict]:
+        """Get a project's metadata, or None if its folder does not exist."""
+        with self._lock:
+            root = self._project_root(project_id)
+            metadata = None
+            if root is not None:
+                metadata = self._metadata.get(project_id)
+                if metadata is None:
+                    metadata = self._metadata[project_id] = self._read_metadata(self.base_path / project_id)
+                    self._dirty = True
+                metadata = dict(metadata)
+            self._maybe_save()
+            return metadata
+
+    def subdirs(self, project_id: str) -> Optional[List[str]]:
+        """Get the names of a project's top-level folders, or None if it does not exist."""
+        with self._lock:
+            root = self._project_root(project_id)
+            self._maybe_save()
+            return list(root.dirs) if root is not None else None
+
+    def files(self, project_id: str, folder: str = "", suffix: str = "") -> List[Tuple[Path, int, int]]:
+        """
+        List files under a project folder, recursively.
+
+        Args:
+            project_id: Project folder name
+            folder: Folder relative to the project ("" = the project folder)
+            suffix: Only files whose name ends with this (e.g. ".txt")
+
+        Returns:
+            (path, size, mtime_ns) per file
+        """
+        with self._lock:
+            root = self._project_root(project_id)
+            node, path = root, self.base_path / project_id
+            for part in Path(folder).parts if root is not None else ():
+                node = node.dirs.get(part)
+                if node is None:
+                    break
+                path = path / part
+                if self._check(node, path) is None:
+                    node = None
+                    break
+            results: List[Tuple[Path, int, int]] = []
+            if root is not None and node is not None:
+                self._collect(node, path, suffix, results)
+            self._maybe_save()
+            return results
+
+    def _project_root(self, project_id: str) -> Optional[_Dir]:
+        """Get a project's validated root listing; caller holds the lock."""
+        self._check(self._base, self.base_path)
+        root = self._base.dirs.get(project_id)
+        if root is None:
+            return None
+        rescanned = self._check(root, self.base_path / project_id)
+        if rescanned is None:
+            del self._base.dirs[project_id]
+            self._metadata.pop(project_id, None)
+            self._dirty = True
+            return None
+        if rescanned:
+            # Metadata files and the folder structure live in the project folder
+            self._metadata.pop(project_id, None)
+        return root
+
+    def _collect(self, node: _Dir, path: Path, suffix: str, results: List[Tuple[Path, int, int]]):
+        """Gather files of a validated subtree; caller holds the lock."""
+        for name, (size, mtime_ns) in node.files.items():
+            if name.endswith(suffix):
+                results.append((path / name, size, mtime_ns))
+        for name, child in list(node.dirs.items()):
+            child_path = path / name
+            if self._check(child, child_path) is None:
+                del node.dirs[name]
+                self._dirty = True
+                continue
+            self._collect(child, child_path, suffix, results)
+
+    # Validation
+
+    def _check(self, node: _Dir, path: Path) -> Optional[bool]:
+        """
+        Bring one directory's listing up to date; caller holds the lock.
+
+        Returns:
+            None if the directory is gone, True if it was re-read, else False
+        """
+        now = time.monotonic()
+        if node.mtime_ns != -1 and self.revalidate_seconds and now - node.checked < self.revalidate_seconds:
+            return False
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        self.stat_checks += 1
+        node.checked = now
+        if mtime_ns == node.mtime_ns:
+            return False
+        self._rescan(node, path, mtime_ns)
+        return True
+
+    def _rescan(self, node: _Dir, path: Path, mtime_ns: int):
+        """Re-read a directory's entries, keeping listings of subdirectories that remain."""
+        files: Dict[str, Tuple[int, int]] = {}
+        dirs: Dict[str, _Dir] = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    # Like Path.rglob: symlinked files are listed, symlinked folders not followed
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs[entry.name] = node.dirs.get(entry.name) or _Dir()
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        node.files = files
+        node.dirs = dirs
+        racy = time.time_ns() - mtime_ns < RACY_WINDOW_NS
+        node.mtime_ns = -1 if racy else mtime_ns
+        self.rescans += 1
+        self._dirty = True
+
+    # Invalidation (for writes made through the provider)
+
+    def invalidate(self, project_id: str, folder: str = ""):
+        """
+        Force the next call to re-read a project's folder (and the base folder).
+
+        Args:
+            project_id: Project folder name
+            folder: Also re-read this folder, relative to the project
+        """
+        with self._lock:
+            self._base.mtime_ns = -1
+            node = self._base.dirs.get(project_id)
+            self._metadata.pop(project_id, None)
+            if node is not None:
+                node.mtime_ns = -1
+                for part in Path(folder).parts:
+                    node = node.dirs.get(part)
+                    if node is None:
+                        break
+                    node.mtime_ns = -1
+
+    def forget(self, project_id: str):
+        """Drop a project (e.g. deleted)."""
+        with self._lock:
+            self._base.mtime_ns = -1
+            self._base.dirs.pop(project_id, None)
+            self._metadata.pop(project_id, None)
+            self._dirty = True
+
+    # Persistence
+
+    def _load(self):
+        """Load the saved catalog, if any."""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != CATALOG_VERSION or data.get("base_path") != str(self.base_path):
+                return
+            self._base = _Dir.from_dict(data["base"])
+            self._metadata = data.get("metadata", {})
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Losing the catalog only costs one full scan
+            print(f"Warning: Could not read directory catalog {self.path}: {e}")
+            self._base = _Dir()
+            self._metadata = {}
+
+    def _maybe_save(self):
+        """Save if changed and not saved recently; caller holds the lock."""
+        if self._dirty and self.path and time.monotonic() - self._saved_at >= SAVE_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Write the catalog to disk if it changed."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            data = {
+                "version": CATALOG_VERSION,
+                "base_path": str(self.base_path),
+                "base": self._base.to_dict(),
+                "metadata": self._metadata,
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Warning: Could not save directory catalog {self.path}: {e}")
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        """Get catalog size and stat/rescan counters."""
+        with self._lock:
+            directories = files = 0
+            stack = [self._base]
+            while stack:
+                node = stack.pop()
+                directories += 1
+                files += len(node.files)
+                stack.extend(node.dirs.values())
+            return {
+                "projects": sum(1 for name in self._base.dirs if not name.startswith(".")),
+                "directories": directories,
+                "files": files,
+                "stat_checks": self.stat_checks,
+                "rescans": self.rescans,
+                "persistent": self.path is not None,
+            }
@@ -1,14 +1,33 @@
 """Integration-based storage provider using Convex + Merge API."""
 
+import asyncio
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 from .base import StorageProvider, FolderType
-from models.document import Document, DocumentType
-from persistence.convex_client import ConvexClient
-from integration.merge_client import MergeClient
+from .blob_cache import BlobCache
+from .sync_manifest import SyncManifest
+from config import config
+from models.document import ContentRef, Document, DocumentType, register_blob_reader, register_external_loader
+from persistence.convex_client import AsyncConvexClient, ConvexClient
+from integration.merge_client import AsyncMergeClient, MergeClient
+from integration.rate_limiter import AsyncRateLimiter
+from core.tracing import span, traced
+
+
+@dataclass
+class IntegrationSyncResult:
+    """Outcome of syncing a project's integration folder."""
+    
+    # Every file currently in the folder, in listing order
+    documents: List[Document] = field(default_factory=list)
+    # External IDs by what happened to them
+    downloaded: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
 
 
 class IntegrationStorageProvider(StorageProvider):
@@ -16,19 +35,34 @@ class IntegrationStorageProvider(StorageProvider):
     Storage provider that uses Convex + Merge API for Google Drive integration.
     
     Fetches documents from Google Drive via Merge API, stores metadata in Convex,
-    and caches content in memory for analysis.
+    and caches content locally for analysis. Syncs are incremental: a per-project
+    manifest records the version and content hash of every synced file, so only
+    new or modified files are downloaded and unchanged bodies come from the
+    local blob cache.
     """
     
-    def __init__(self, convex_client: ConvexClient, merge_client: MergeClient):
+    def __init__(self, convex_client: ConvexClient, merge_client: MergeClient,
+                 cache_dir: Optional[str] = None):
         """
         Initialize integration storage provider.
         
         Args:
             convex_client: Convex client for database operations
             merge_client: Merge client for Google Drive access
+            cache_dir: Directory for sync manifests and cached file contents
         """
         self.convex_client = convex_client
         self.merge_client = merge_client
+        self.cache_dir = Path(cache_dir or config.INTEGRATION_CACHE_DIR
+                              or Path.home() / ".cache" / "offbench" / "integration")
+        self.blob_cache = BlobCache(
+            str(self.cache_dir / "blobs"),
+            max_bytes=config.BLOB_CACHE_MAX_MB * 1024 * 1024,
+            compression=config.BLOB_CACHE_COMPRESSION
+        )
+        # Documents reference their bodies by digest, so after a restart they
+        # reload from the cache instead of being downloaded again
+        register_blob_reader(self.blob_cache.get)
         
     def list_projects(self) -> List[Dict]:
         """List all available projects from Convex."""
@@ -174,7 +208,7 @@ class IntegrationStorageProvider(StorageProvider):
                 if doc.get("name") == filename:
                     return {
                         "filename": filename,
-                        "content": "",  # Content not stored in Convex
+                        "content": self._cached_content(project_id, project["_id"], doc.get("externalId")),
                         "metadata": {
                             "path": f"convex://{doc.get('_id')}",
                             "size": doc.get("size", 0),
@@ -188,6 +222,33 @@ class IntegrationStorageProvider(StorageProvider):
             print(f"Error getting document {filename} for {project_id}: {e}")
             return None
     
+    def _cached_content(self, project_id: str, convex_project_id: str, external_id: Optional[str]) -> str:
+        """
+        Get an integration file's content, from the blob cache when possible.
+        
+        Files missing from the cache are downloaded once and cached.
+        
+        Returns:
+            File text, or "" if it is not an integration file or cannot be fetched
+        """
+        if not external_id:
+            return ""
+        manifest = self._manifest(project_id)
+        entry = manifest.get(external_id)
+        data = self.blob_cache.get(entry["content_hash"]) if entry else None
+        if data is None:
+            try:
+                _, account_token = self._integration_access(convex_project_id)
+                data = self.merge_client.download_file(external_id, account_token)
+            except Exception as e:
+                print(f"Error downloading {external_id} for {project_id}: {e}")
+                return ""
+            content_hash = self.blob_cache.put(data)
+            if entry:
+                manifest.set(external_id, {**entry, "content_hash": content_hash})
+                manifest.save()
+        return data.decode('utf-8')
+    
     def add_document(self, project_id: str, folder_type: FolderType,
                     filename: str, content: str, metadata: Optional[Dict] = None):
         """Add a document to Convex."""
@@ -271,109 +332,270 @@ class IntegrationStorageProvider(StorageProvider):
             print(f"Error checking project existence {project_id}: {e}")
             return False
     
-    def sync_documents_from_integration(self, project_id: str) -> List[Document]:
+    def _manifest(self, project_id: str) -> SyncManifest:
+        """Load the sync manifest of a project."""
+        return SyncManifest(str(self.cache_dir / "manifests" / f"{project_id}.json"))
+    
+    @staticmethod
+    def _file_version(file_info: Dict) -> Optional[Tuple]:
+        """Version of a listed file, or None if the listing does not identify one."""
+        modified_time = file_info.get("modified_time")
+        if not modified_time:
+            return None
+        return (modified_time, file_info.get("size"))
+    
+    def _integration_access(self, convex_project_id: str) -> Tuple[Dict, str]:
+        """
+        Get a project's integration and its account token.
+        
+        Raises:
+            Exception if the project has no usable integration
+        """
+        # Get integration info (placeholder for now)
+        integration_info = self.convex_client.query(
+            "queries/integrations:getProjectIntegration",
+            {"projectId": convex_project_id}
+        )
+        
+        if not integration_info:
+            raise Exception(f"No integration found for project {convex_project_id}")
+        
+        # Get account token
+        account_token = integration_info.get("accountToken")
+        if not account_token:
+            raise Exception("No account token available for integration")
+        
+        return integration_info, account_token
+    
+    @traced("integration.sync")
+    def sync_documents_from_integration(self, project_id: str) -> IntegrationSyncResult:
         """
         Sync documents from Google Drive integration.
         
         This is the main method for fetching documents from Google Drive
-        and creating Document objects for analysis.
+        and creating Document objects for analysis. Only files that are new
+        or whose listed version changed since the last sync are downloaded;
+        files removed from the folder are reported and their Convex records
+        deleted.
         """
         try:
             # Get project and integration info
-            project = self.convex_client.query(
-                "queries/projects:getProjectByScenarioId",
-                {"scenarioId": project_id}
-            )
-            if not project:
-                raise Exception(f"Project {project_id} not found")
+            with span("integration.resolve"):
+                project = self.convex_client.query(
+                    "queries/projects:getProjectByScenarioId",
+                    {"scenarioId": project_id}
+                )
+                if not project:
+                    raise Exception(f"Project {project_id} not found")
+                
+                integration_info, account_token = self._integration_access(project["_id"])
+                
+                folder_info = self.convex_client.query(
+                    "queries/integrations:getProjectFolder",
+                    {"projectId": project["_id"]}
+                )
             
-            # Get integration info (placeholder for now)
-            integration_info = self.convex_client.query(
-                "queries/integrations:getProjectIntegration",
-                {"projectId": project["_id"]}
-            )
+            if not folder_info:
+                raise Exception(f"No folder found for project {project_id}")
             
-            if not integration_info:
-                raise Exception(f"No integration found for project {project_id}")
+            manifest = self._manifest(project_id)
             
-            folder_info = self.convex_client.query(
-                "queries/integrations:getProjectFolder",
-                {"projectId": project["_id"]}
-            )
+            def load_body(file_id: str) -> str:
+                # Bodies are read from the blob cache first (ContentRef.sha256);
+                # this only runs if the cache lost them
+                data = self.merge_client.download_file(file_id, account_token)
+                self.blob_cache.put(data)
+                return data.decode('utf-8')
             
-            if not folder_info:
-                raise Exception(f"No folder found for project {project_id}")
+            register_external_loader(integration_info["id"], load_body)
             
-            # Get account token
-            account_token = integration_info.get("accountToken")
-            if not account_token:
-                raise Exception("No account token available for integration")
+            # Tool handlers are synchronous (run in worker threads), so the
+            # async pipeline gets its own event loop here
+            try:
+                with span("integration.fetch") as fetch_span:
+                    result = asyncio.run(self._fetch_documents(
+                        folder_info.get("folderId"), account_token, project["_id"],
+                        integration_info["id"], manifest
+                    ))
+                    fetch_span.set_attribute("downloaded", len(result.downloaded))
+                    fetch_span.set_attribute("unchanged", len(result.unchanged))
+                    fetch_span.set_attribute("deleted", len(result.deleted))
+                return result
+            finally:
+                # Also after a failed listing: files already written to Convex
+                # must be remembered, or the next sync would create them again
+                with span("integration.manifest_save"):
+                    manifest.save()
             
-            # List files in folder
-            folder_id = folder_info.get("folderId")
-            files = self.merge_client.list_folder_files(folder_id, account_token)
+        except Exception as e:
+            raise Exception(f"Failed to sync documents from integration: {str(e)}")
+    
+    async def _fetch_documents(
+        self,
+        folder_id: str,
+        account_token: str,
+        convex_project_id: str,
+        integration_id: str,
+        manifest: SyncManifest
+    ) -> IntegrationSyncResult:
+        """
+        List a folder, download changed files and record them in Convex, concurrently.
+        
+        The folder is listed page by page and each file is scheduled as soon
+        as its page arrives, so downloads start while later pages are still
+        being listed. Files whose listed version matches the manifest (and
+        whose content is still cached) are not fetched at all. Up to
+        INTEGRATION_DOWNLOAD_WORKERS other files are fetched at once, all
+        spending from one Merge request budget (MERGE_RATE_LIMIT_PER_SECOND)
+        that every worker backs off on after a 429. Each file's Convex write
+        starts as soon as its download finishes, overlapping with the
+        remaining downloads. Files that fail are reported and skipped. The
+        manifest is updated in place.
+        
+        Args:
+            folder_id: Google Drive folder ID
+            account_token: Account token for the integration
+            convex_project_id: Convex project ID
+            integration_id: Integration ID
+            manifest: Manifest of the previous sync
             
-            documents = []
-            for file_info in files:
-                try:
-                    # Download file content
-                    file_content = self.merge_client.download_file(
-                        file_info["id"], account_token
+        Returns:
+            IntegrationSyncResult with documents in folder listing order
+        """
+        workers = max(1, config.INTEGRATION_DOWNLOAD_WORKERS)
+        rate_limiter = AsyncRateLimiter(config.MERGE_RATE_LIMIT_PER_SECOND, burst=workers)
+        slots = asyncio.Semaphore(workers)
+        result = IntegrationSyncResult()
+        
+        def make_document(file_info: Dict, content: Optional[str], content_hash: str,
+                          convex_document_id: Optional[str]) -> Document:
+            return Document(
+                file_path=file_info.get("name", "unknown"),
+                content=content,
+                doc_type=self._detect_document_type_from_metadata(file_info),
+                metadata={
+                    "mime_type": file_info.get("mime_type"),
+                    "size": file_info.get("size"),
+                    "modified_time": file_info.get("modified_time")
+                },
+                external_id=file_info["id"],
+                external_url=file_info.get("web_view_link"),
+                integration_id=integration_id,
+                source="integration",
+                content_ref=ContentRef(external_id=file_info["id"], source=integration_id, sha256=content_hash),
+                convex_document_id=convex_document_id
+            )
+        
+        async with AsyncMergeClient(self.merge_client.api_key, rate_limiter=rate_limiter) as merge_client, \
+                AsyncConvexClient(self.convex_client.deployment_url) as convex_client:
+            
+            async def fetch(file_info: Dict) -> Optional[Document]:
+                # Each task runs in its own context copy, so file spans are siblings
+                with span("integration.file", file_id=file_info["id"]) as file_span:
+                    doc = await fetch_file(file_info)
+                    file_span.set_attribute(
+                        "outcome", "failed" if doc is None else "downloaded" if doc.content_loaded else "cached"
                     )
+                    return doc
+            
+            async def fetch_file(file_info: Dict) -> Optional[Document]:
+                file_id = file_info["id"]
+                entry = manifest.get(file_id)
+                version = self._file_version(file_info)
+                
+                # Unchanged since the last sync: nothing to download or write
+                if (entry and version is not None and tuple(entry["version"] or ()) == version
+                        and self.blob_cache.contains(entry["content_hash"])):
+                    result.unchanged.append(file_id)
+                    return make_document(file_info, None, entry["content_hash"], entry.get("convex_document_id"))
+                
+                try:
+                    async with slots:
+                        # Download file content
+                        file_content = await merge_client.download_file(file_id, account_token)
                     
                     # Decode content (assuming UTF-8)
                     content = file_content.decode('utf-8')
+                    content_hash = self.blob_cache.put(file_content)
+                    convex_document_id = entry.get("convex_document_id") if entry else None
+                    doc = make_document(file_info, content, content_hash, convex_document_id)
                     
-                    # Detect document type
-                    doc_type = self._detect_document_type_from_metadata(file_info)
-                    
-                    # Create document
-                    doc = Document(
-                        file_path=file_info.get("name", "unknown"),
-                        content=content,
-                        doc_type=doc_type,
-                        metadata={
-                            "mime_type": file_info.get("mime_type"),
-                            "size": file_info.get("size"),
-                            "modified_time": file_info.get("modified_time")
-                        },
-                        external_id=file_info["id"],
-                        external_url=file_info.get("web_view_link"),
-                        integration_id=integration_info["id"],
-                        source="integration"
-                    )
+                    if entry and entry["content_hash"] == content_hash:
+                        # Touched but not modified
+                        result.unchanged.append(file_id)
+                    else:
+                        # Store metadata in Convex (outside the download slot, so
+                        # the next download starts while this write is in flight)
+                        document_data = {
+                            "name": doc.file_path,
+                            "type": doc.doc_type.value,
+                            "size": len(file_content),
+                            "status": "processed",
+                            "externalId": doc.external_id,
+                            "externalUrl": doc.external_url,
+                            "integrationId": doc.integration_id,
+                            "source": "integration",
+                            "metadata": doc.metadata
+                        }
+                        if convex_document_id:
+                            await convex_client.mutation(
+                                "mutations/documents:updateMany",
+                                {"items": [{"id": convex_document_id, **document_data}]}
+                            )
+                        else:
+                            doc.convex_document_id = await convex_client.mutation(
+                                "mutations/documents:createDocument",
+                                {
+                                    "projectId": convex_project_id,
+                                    "uploadDate": int(datetime.now().timestamp() * 1000),
+                                    **document_data
+                                }
+                            )
+                        result.downloaded.append(file_id)
                     
-                    # Store metadata in Convex
-                    document_data = {
-                        "projectId": project["_id"],
+                    manifest.set(file_id, {
                         "name": doc.file_path,
-                        "type": doc.doc_type.value,
-                        "uploadDate": int(datetime.now().timestamp() * 1000),
-                        "size": len(content.encode('utf-8')),
-                        "status": "processed",
-                        "externalId": doc.external_id,
-                        "externalUrl": doc.external_url,
-                        "integrationId": doc.integration_id,
-                        "source": "integration",
-                        "metadata": doc.metadata
-                    }
-                    
-                    convex_doc_id = self.convex_client.mutation(
-                        "mutations/documents:createDocument",
-                        document_data
-                    )
-                    
-                    doc.convex_document_id = convex_doc_id
-                    documents.append(doc)
+                        "version": list(version) if version else None,
+                        "content_hash": content_hash,
+                        "convex_document_id": doc.convex_document_id,
+                    })
+                    return doc
                     
                 except Exception as e:
                     print(f"Error processing file {file_info.get('name', 'unknown')}: {e}")
-                    continue
+                    return None
             
-            return documents
+            tasks = []
+            listed = set()
+            try:
+                async for file_info in merge_client.iter_folder_files(folder_id, account_token):
+                    listed.add(file_info["id"])
+                    tasks.append(asyncio.create_task(fetch(file_info)))
+            except Exception:
+                # Let started files finish (and reach the manifest); with a
+                # partial listing, nothing can be treated as deleted
+                await asyncio.gather(*tasks)
+                raise
             
-        except Exception as e:
-            raise Exception(f"Failed to sync documents from integration: {str(e)}")
+            documents = await asyncio.gather(*tasks)
+            result.documents = [doc for doc in documents if doc is not None]
+            
+            # Files removed from the folder since the last sync
+            for file_id in manifest.external_ids():
+                if file_id in listed:
+                    continue
+                entry = manifest.remove(file_id)
+                result.deleted.append(file_id)
+                if entry.get("convex_document_id"):
+                    try:
+                        await convex_client.mutation(
+                            "mutations/documents:deleteDocument",
+                            {"documentId": entry["convex_document_id"]}
+                        )
+                    except Exception as e:
+                        print(f"Error removing deleted file {entry.get('name', file_id)} from Convex: {e}")
+        
+        return result
     
     def _detect_document_type_from_filename(self, filename: str) -> str:
         """Detect document type from filename."""
@@ -7,7 +7,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 from .base import StorageProvider, FolderType
-from models.document import Document, DocumentType
+from .directory_catalog import DirectoryCatalog
+from models.document import Document, DocumentType, infer_document_type
 
 
 class LocalStorageProvider(StorageProvider):
@@ -16,41 +17,50 @@ class LocalStorageProvider(StorageProvider):
     
     Maintains backward compatibility with existing test-data structure
     while supporting three-folder structure for new projects.
+    
+    Listings are answered from a DirectoryCatalog, so listing projects or
+    documents re-reads only the directories that changed since the last call.
     """
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, catalog_path: Optional[str] = None,
+                 catalog_revalidate_seconds: float = 0.0):
         """
         Initialize local storage provider.
         
         Args:
             base_path: Base directory for all projects (e.g., /path/to/test-data)
+            catalog_path: File to persist the directory catalog to across
+                restarts (None = keep it in memory only)
+            catalog_revalidate_seconds: Answer listings without checking
+                directory mtimes for this long (0 = check on every call)
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.catalog = DirectoryCatalog(
+            self.base_path,
+            metadata_reader=self._get_project_metadata,
+            path=catalog_path,
+            revalidate_seconds=catalog_revalidate_seconds
+        )
     
     def list_projects(self) -> List[Dict]:
         """List all available projects in base directory."""
         projects = []
         
-        if not self.base_path.exists():
-            return projects
-        
-        for folder in self.base_path.iterdir():
-            if folder.is_dir() and not folder.name.startswith('.'):
-                project_info = self._get_project_metadata(folder)
-                if project_info:
-                    projects.append(project_info)
+        for project_id in self.catalog.project_ids():
+            project_info = self.catalog.project(project_id)
+            if project_info:
+                projects.append(project_info)
         
         return projects
     
     def get_project(self, project_id: str) -> Optional[Dict]:
         """Get project metadata."""
-        project_path = self.base_path / project_id
+        if not self._is_catalogued(project_id):
+            project_path = self.base_path / project_id
+            return self._get_project_metadata(project_path) if project_path.exists() else None
         
-        if not project_path.exists():
-            return None
-        
-        return self._get_project_metadata(project_path)
+        return self.catalog.project(project_id)
     
     def create_project(self, project_id: str, project_name: str,
                       config: Optional[Dict] = None) -> Dict:
@@ -86,6 +96,7 @@ class LocalStorageProvider(StorageProvider):
         with open(config_path, 'w') as f:
             json.dump(project_config, f, indent=2)
         
+        self.catalog.invalidate(project_id)
         return self._get_project_metadata(project_path)
     
     def delete_project(self, project_id: str) -> bool:
@@ -98,22 +109,25 @@ class LocalStorageProvider(StorageProvider):
         # Remove directory recursively
         import shutil
         shutil.rmtree(project_path)
+        self.catalog.forget(project_id)
         return True
     
     def list_documents(self, project_id: str, folder_type: FolderType) -> List[Dict]:
         """List documents in a specific folder."""
         folder_path = self._get_folder_path(project_id, folder_type)
         
-        if not folder_path or not folder_path.exists():
+        if not folder_path:
             return []
         
+        folder = folder_path.relative_to(self.base_path / project_id)
         documents = []
-        for file_path in folder_path.rglob("*.txt"):
+        for file_path, size, mtime_ns in self.catalog.files(project_id, str(folder), ".txt"):
             doc_info = {
                 "filename": file_path.name,
                 "path": str(file_path),
-                "size": file_path.stat().st_size,
-                "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                "size": size,
+                "modified": datetime.fromtimestamp(mtime_ns / 1e9).isoformat(),
+                "type": infer_document_type(str(file_path)).value
             }
             documents.append(doc_info)
         
@@ -147,7 +161,7 @@ class LocalStorageProvider(StorageProvider):
     def add_document(self, project_id: str, folder_type: FolderType,
                     filename: str, content: str, metadata: Optional[Dict] = None):
         """Add a document to project folder."""
-        folder_path = self._get_folder_path(project_id, folder_type)
+        folder_path = self._get_folder_path(project_id, folder_type, create=True)
         
         if not folder_path:
             raise ValueError(f"Project {project_id} not found")
@@ -162,6 +176,9 @@ class LocalStorageProvider(StorageProvider):
             meta_path = folder_path / f".{filename}.meta.json"
             with open(meta_path, 'w') as f:
                 json.dump(metadata, f, indent=2)
+        
+        # Overwriting a file leaves the folder's mtime unchanged
+        self.catalog.invalidate(project_id, str(folder_path.relative_to(self.base_path / project_id)))
     
     def save_deliverable(self, project_id: str, filename: str,
                         content: str, metadata: Optional[Dict] = None):
@@ -206,23 +223,43 @@ class LocalStorageProvider(StorageProvider):
         
         with open(config_path, 'w') as f:
             json.dump(data, f, indent=2)
+        
+        self.catalog.invalidate(project_id)
     
     def project_exists(self, project_id: str) -> bool:
         """Check if project exists."""
-        return (self.base_path / project_id).exists()
+        if not self._is_catalogued(project_id):
+            return (self.base_path / project_id).exists()
+        return self.catalog.subdirs(project_id) is not None
     
     # Helper methods
     
-    def _get_folder_path(self, project_id: str, folder_type: FolderType) -> Optional[Path]:
-        """Get path to specific folder, handling legacy structure."""
+    def _is_catalogued(self, project_id: str) -> bool:
+        """Check whether a project ID names a folder the catalog tracks."""
+        return bool(project_id) and not project_id.startswith('.') and Path(project_id).name == project_id
+    
+    def _get_folder_path(self, project_id: str, folder_type: FolderType,
+                         create: bool = False) -> Optional[Path]:
+        """
+        Get path to specific folder, handling legacy structure.
+        
+        Args:
+            project_id: Project identifier
+            folder_type: Folder to locate
+            create: Create a missing implementation/working folder (for writes)
+        """
         project_path = self.base_path / project_id
         
-        if not project_path.exists():
+        if self._is_catalogued(project_id):
+            subdirs = self.catalog.subdirs(project_id)
+        else:
+            subdirs = [p.name for p in project_path.iterdir() if p.is_dir()] if project_path.is_dir() else None
+        if subdirs is None:
             return None
         
         # Check if new structure (has three subfolders)
         new_structure_path = project_path / folder_type.value
-        if new_structure_path.exists():
+        if folder_type.value in subdirs:
             return new_structure_path
         
         # Legacy structure compatibility
@@ -230,16 +267,12 @@ class LocalStorageProvider(StorageProvider):
             # Legacy: emails/, transcripts/, client-docs/ at root
             # Return project root for backward compatibility
             return project_path
-        elif folder_type == FolderType.IMPLEMENTATION:
-            # Legacy: no implementation folder
-            impl_path = project_path / "implementation"
-            impl_path.mkdir(exist_ok=True)
-            return impl_path
-        elif folder_type == FolderType.WORKING:
-            # Legacy: no working folder
-            working_path = project_path / "working"
-            working_path.mkdir(exist_ok=True)
-            return working_path
+        elif folder_type in (FolderType.IMPLEMENTATION, FolderType.WORKING):
+            # Legacy: no implementation/working folder until something is saved there
+            if create:
+                new_structure_path.mkdir(exist_ok=True)
+                self.catalog.invalidate(project_id)
+            return new_structure_path
         
         return project_path
     
@@ -308,6 +341,27 @@ class LocalStorageProvider(StorageProvider):
             "auto_reanalyze": True
         }
     
+    def get_watch_folders(self, project_id: str) -> List[Path]:
+        """
+        Get the folders holding a project's documents (discovery and working).
+        
+        Returns:
+            Existing folders, in the layout get_all_discovery_documents reads
+        """
+        subdirs = self.catalog.subdirs(project_id) if self._is_catalogued(project_id) else None
+        
+        if subdirs is None:
+            return []
+        
+        project_path = self.base_path / project_id
+        if "discovery" in subdirs:
+            folders = ["discovery"]
+        else:
+            folders = [subfolder for subfolder in ["emails", "transcripts", "client-docs"] if subfolder in subdirs]
+        if "working" in subdirs:
+            folders.append("working")
+        return [project_path / folder for folder in folders]
+    
     def get_all_discovery_documents(self, project_id: str) -> List[Path]:
         """
         Get all discovery documents from project (handles legacy structure).
@@ -315,24 +369,22 @@ class LocalStorageProvider(StorageProvider):
         Returns:
             List of file paths for all discovery documents
         """
-        project_path = self.base_path / project_id
+        subdirs = self.catalog.subdirs(project_id) if self._is_catalogued(project_id) else None
         
-        if not project_path.exists():
+        if subdirs is None:
             return []
         
         documents = []
         
         # Check new structure
-        discovery_path = project_path / "discovery"
-        if discovery_path.exists():
-            documents.extend(discovery_path.rglob("*.txt"))
+        if "discovery" in subdirs:
+            folders = ["discovery"]
         else:
             # Legacy structure: scan emails, transcripts, client-docs
-            for subfolder in ["emails", "transcripts", "client-docs"]:
-                subfolder_path = project_path / subfolder
-                if subfolder_path.exists():
-                    # Use rglob for nested files
-                    documents.extend(subfolder_path.rglob("*.txt"))
+            folders = [subfolder for subfolder in ["emails", "transcripts", "client-docs"] if subfolder in subdirs]
+        for folder in folders:
+            # Nested files included
+            documents.extend(path for path, _, _ in self.catalog.files(project_id, folder, ".txt"))
         
         # Sort for consistent ordering
         return sorted(documents)
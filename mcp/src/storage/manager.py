@@ -49,7 +49,11 @@ def get_storage_provider(
         base_path = kwargs.get("base_path")
         if not base_path:
             raise ValueError("LocalStorageProvider requires 'base_path' parameter")
-        return LocalStorageProvider(base_path=base_path)
+        return LocalStorageProvider(
+            base_path=base_path,
+            catalog_path=kwargs.get("catalog_path"),
+            catalog_revalidate_seconds=kwargs.get("catalog_revalidate_seconds", 0.0)
+        )
     
     elif provider_type == "google_drive":
         credentials = kwargs.get("credentials")
@@ -76,7 +80,8 @@ def get_storage_provider(
         from .integration_provider import IntegrationStorageProvider
         return IntegrationStorageProvider(
             convex_client=convex_client,
-            merge_client=merge_client
+            merge_client=merge_client,
+            cache_dir=kwargs.get("cache_dir")
         )
     
     else:
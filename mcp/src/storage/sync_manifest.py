@@ -0,0 +1,56 @@
+"""Record of the integration files last synced for a project."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class SyncManifest:
+    """
+    Per-project manifest of synced integration files.
+
+    Maps each file's external ID to the version it was last synced at
+    (modified time and size as listed by the integration), the SHA-256 of
+    its content in the blob cache, and the Convex document it was recorded
+    as. Stored as a JSON file, rewritten atomically on save.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load a manifest (empty if the file does not exist yet).
+
+        Args:
+            path: Manifest JSON file path
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("files", {})
+            except (OSError, ValueError) as e:
+                # A lost manifest only costs one full re-download
+                print(f"Warning: Could not read sync manifest {self.path}: {e}")
+
+    def get(self, external_id: str) -> Optional[Dict]:
+        """Get the entry for a file, if it was synced before."""
+        return self.entries.get(external_id)
+
+    def set(self, external_id: str, entry: Dict):
+        """Record a synced file."""
+        self.entries[external_id] = entry
+
+    def remove(self, external_id: str) -> Optional[Dict]:
+        """Forget a file (e.g. deleted from the folder). Returns its entry."""
+        return self.entries.pop(external_id, None)
+
+    def external_ids(self) -> List[str]:
+        """External IDs of all recorded files."""
+        return list(self.entries)
+
+    def save(self):
+        """Write the manifest to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"files": self.entries}, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis Tests
+
+Checks the process-pool BatchAnalyzer: project payloads ship lazy local
+bodies as references rather than text, analyses from worker processes
+match analyzing in this process, findings computed by workers are
+memoized here and shipped back so unchanged documents are not rescanned,
+a project that fails in a worker is reported as its own outcome without
+affecting the others, and a batch result for a project that changed
+meanwhile is not applied.
+
+Usage:
+    python test_batch_analyzer.py
+"""
+
+import json
+import pickle
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core.analyzer import DiscoveryAnalyzer
+from core.batch_analyzer import BatchAnalyzer, analyze_payload, deserialize_project, serialize_project
+from core.state_manager import ProjectStateManager
+from models.document import ContentRef, Document, DocumentType
+from models.project_state import ProjectState
+from test_analysis_golden import load_server
+
+
+TEXTS = [
+    "From: ops@brewcrew.com\nWe use NetSuite for inventory and Shopify for orders. "
+    "Refunds are manual today. Orders should sync in real-time.",
+    "Speaker: The warehouse team keeps stock counts in a spreadsheet. "
+    "QuickBooks is the source of truth for accounting. We decided to use NetSuite for inventory.",
+    "Inventory levels are tracked in Shopify. Returns need to be handled somehow, TBD.",
+]
+
+
+def _project(project_id: str, folder: Path, texts) -> ProjectState:
+    project = ProjectState(project_id=project_id, project_name=project_id)
+    for index, text in enumerate(texts):
+        path = folder / f"{project_id}-{index}.txt"
+        path.write_text(text)
+        project.add_document(Document(file_path=str(path), content=None, doc_type=DocumentType.NOTES,
+                                      content_ref=ContentRef.for_file(str(path))))
+    project.additional_context.append("Failed syncs are retried three times.")
+    return project
+
+
+def _dump(analysis) -> str:
+    return json.dumps(analysis.to_dict(), sort_keys=True)
+
+
+def test_payload_ships_refs():
+    """Unloaded local bodies travel as ContentRefs; loaded ones as text."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _project("payload", Path(tmp), TEXTS[:2])
+        project.documents[1].content
+        documents, _, _, _ = pickle.loads(zlib.decompress(serialize_project(project)))
+        assert documents[0][1] is None and documents[0][2]["path"] == project.documents[0].file_path
+        assert documents[1][1] == TEXTS[1] and documents[1][2] is None
+
+        restored, context, _, _ = deserialize_project(serialize_project(project))
+        assert [doc.content for doc in restored] == TEXTS[:2]
+        assert context == project.additional_context
+
+
+def test_pool_matches_serial():
+    """Worker processes produce the same analyses as this process."""
+    with tempfile.TemporaryDirectory() as tmp:
+        projects = [_project(f"project-{n}", Path(tmp), TEXTS[n:] + TEXTS[:n]) for n in range(3)]
+        expected = {
+            project.project_id: _dump(DiscoveryAnalyzer(project.config).analyze(
+                project.documents, project.additional_context))
+            for project in projects
+        }
+        outcomes = list(BatchAnalyzer(max_workers=2, timeout=120).analyze(projects))
+        assert sorted(outcome.project_id for outcome in outcomes) == sorted(expected)
+        for outcome in outcomes:
+            assert outcome.error is None, outcome.error
+            assert _dump(outcome.analysis) == expected[outcome.project_id]
+
+
+def test_findings_are_shipped_both_ways():
+    """Workers' findings are memoized here, and a payload carrying them needs no scan."""
+    with tempfile.TemporaryDirectory() as tmp:
+        projects = [_project(f"warm-{n}", Path(tmp), TEXTS[n:] + TEXTS[:n]) for n in range(2)]
+        DiscoveryAnalyzer._cache.clear()
+        outcomes = list(BatchAnalyzer(max_workers=2, timeout=120).analyze(projects))
+        assert all(outcome.error is None for outcome in outcomes)
+
+        project = projects[0]
+        findings = DiscoveryAnalyzer(project.config).cached_findings(
+            project.documents, project.additional_context)
+        # Every document plus the additional context
+        assert len(findings) == len(project.documents) + 1
+
+        DiscoveryAnalyzer._cache.clear()
+        analysis, computed = pickle.loads(zlib.decompress(
+            analyze_payload(serialize_project(project, findings))))
+        assert computed == {}
+        assert DiscoveryAnalyzer.cache_stats()["misses"] == 0
+        expected = next(outcome for outcome in outcomes if outcome.project_id == project.project_id)
+        assert _dump(analysis) == _dump(expected.analysis)
+    DiscoveryAnalyzer._cache.clear()
+
+
+def test_failures_are_per_project():
+    """A project that cannot be analyzed yields an error outcome; the rest still finish."""
+    with tempfile.TemporaryDirectory() as tmp:
+        good = _project("good", Path(tmp), TEXTS)
+        bad = ProjectState(project_id="bad", project_name="bad")
+        bad.documents.append(Document(file_path="gone.txt", content=None, doc_type=DocumentType.NOTES,
+                                      content_ref=ContentRef(path=str(Path(tmp) / "gone.txt"))))
+        outcomes = {outcome.project_id: outcome
+                    for outcome in BatchAnalyzer(max_workers=2, timeout=120).analyze([good, bad])}
+        assert outcomes["good"].analysis is not None
+        assert outcomes["bad"].analysis is None and "gone.txt" in outcomes["bad"].error
+
+
+def test_changed_project_is_requeued():
+    """A result computed before an ingest is not stored; the project is analyzed again."""
+    main = load_server()
+    state_manager = ProjectStateManager()
+    real_analyze = BatchAnalyzer.analyze
+    calls = []
+
+    def racing(self, projects):
+        calls.append([project.project_id for project in projects])
+        for outcome in real_analyze(self, projects):
+            if len(calls) == 1 and outcome.project_id == "requeue-a":
+                # An ingest lands while the batch is running
+                project = state_manager.get_project("requeue-a")
+                project.add_document(Document(file_path="late.txt", content="We also use Salesforce.",
+                                              doc_type=DocumentType.NOTES))
+            yield outcome
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for project_id in ("requeue-a", "requeue-b"):
+            state_manager.clear_project(project_id)
+            state_manager.update_project(_project(project_id, Path(tmp), TEXTS))
+        BatchAnalyzer.analyze = racing
+        try:
+            result = main._analyze_batch(["requeue-a", "requeue-b"], mode="full")
+        finally:
+            BatchAnalyzer.analyze = real_analyze
+            stored = state_manager.get_project("requeue-a").analysis
+            for project_id in ("requeue-a", "requeue-b"):
+                state_manager.clear_project(project_id)
+
+    assert calls == [["requeue-a", "requeue-b"], ["requeue-a"]]
+    assert [entry["project_id"] for entry in result["results"]] == ["requeue-a", "requeue-b"]
+    assert "Salesforce" in stored.systems_identified
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_payload_ships_refs,
+        test_pool_matches_serial,
+        test_findings_are_shipped_both_ways,
+        test_failures_are_per_project,
+        test_changed_project_is_requeued,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} batch analysis tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Convex Sync Tests
+
+Checks the differential ConvexSync against a recording fake client: new
+findings are inserted once, unchanged ones cost no writes, changed ones
+are patched, and findings that are no longer detected are resolved,
+including when a project's findings drop to none.
+
+Usage:
+    python test_convex_sync.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from models.analysis import Ambiguity, Conflict, Gap, GapCategory, Priority
+from persistence.convex_client import BulkItemResult
+from persistence.convex_sync import ConvexSync
+
+
+class _RecordingClient:
+    """Fake ConvexClient that records bulk mutations and hands out IDs."""
+
+    def __init__(self):
+        self.calls = []
+        self._next_id = 0
+
+    def bulk_mutation(self, function_name, items, shared_args=None, item_function_name=None):
+        self.calls.append((function_name, items))
+        results = []
+        for index, item in enumerate(items):
+            if "id" in item:
+                item_id = item["id"]
+            else:
+                self._next_id += 1
+                item_id = f"id{self._next_id}"
+            results.append(BulkItemResult(index=index, id=item_id))
+        return results
+
+
+def _gap(description: str) -> Gap:
+    return Gap(category=GapCategory.BUSINESS_RULES, description=description,
+               impact="Blocks refunds", priority=Priority.HIGH)
+
+
+def test_unchanged_findings_are_not_rewritten():
+    """A second sync of the same findings makes no calls; a change is one patch."""
+    client = _RecordingClient()
+    sync = ConvexSync(client=client)
+    gaps = [_gap("Refund policy"), _gap("Tax handling")]
+
+    inserted = sync.sync_gaps("project", gaps)
+    assert [item.action for item in inserted] == ["inserted", "inserted"]
+    assert client.calls[0][0] == "mutations/gaps:createMany"
+
+    client.calls.clear()
+    assert [item.action for item in sync.sync_gaps("project", gaps)] == ["unchanged", "unchanged"]
+    assert client.calls == []
+
+    gaps[1].answered = True
+    updated = sync.sync_gaps("project", gaps)
+    assert [item.action for item in updated] == ["unchanged", "updated"]
+    (function_name, patches), = client.calls
+    assert function_name == "mutations/gaps:updateMany"
+    assert [(patch["id"], patch["status"]) for patch in patches] == [("id2", "resolved")]
+    assert "identifiedDate" not in patches[0]
+
+
+def test_dropped_findings_are_resolved():
+    """Findings that disappear are resolved, down to an empty list, and only once."""
+    client = _RecordingClient()
+    sync = ConvexSync(client=client)
+    sync.sync_gaps("project", [_gap("Refund policy"), _gap("Tax handling")])
+    sync.sync_conflicts("project", [Conflict(
+        topic="inventory", conflicting_statements=["NetSuite", "Shopify"], sources=["a.txt", "b.txt"],
+        resolution_needed="Which system holds inventory?", priority=Priority.HIGH)])
+    sync.sync_ambiguities("project", [Ambiguity(
+        term="real-time", context="Orders sync in real-time.", clarification_needed="How fast?",
+        priority=Priority.MEDIUM)])
+
+    client.calls.clear()
+    assert sync.sync_gaps("project", [_gap("Refund policy")])[0].action == "unchanged"
+    assert client.calls == [("mutations/gaps:updateMany", [{"id": "id2", "status": "resolved"}])]
+
+    client.calls.clear()
+    assert sync.sync_gaps("project", []) == []
+    assert sync.sync_conflicts("project", []) == []
+    assert sync.sync_ambiguities("project", []) == []
+    assert client.calls == [
+        ("mutations/gaps:updateMany", [{"id": "id1", "status": "resolved"}]),
+        ("mutations/conflicts:updateMany", [{"id": "id3", "status": "resolved"}]),
+        ("mutations/ambiguities:updateMany", [{"id": "id4", "status": "resolved"}]),
+    ]
+
+    client.calls.clear()
+    sync.sync_gaps("project", [])
+    sync.sync_conflicts("project", [])
+    sync.sync_ambiguities("project", [])
+    assert client.calls == []
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_unchanged_findings_are_not_rewritten,
+        test_dropped_findings_are_resolved,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} Convex sync tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Directory Catalog Tests
+
+Checks the DirectoryCatalog behind local project listings: unchanged
+directories are answered from the cache, changed ones are re-read,
+explicit invalidation catches in-place rewrites the directory mtime does
+not show, and a saved catalog is reused after a restart.
+
+Usage:
+    python test_directory_catalog.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from storage.directory_catalog import DirectoryCatalog
+
+
+def _age(*paths: Path, seconds: float = 60):
+    """Backdate mtimes past the racy window, so listings are trusted."""
+    stamp = time.time() - seconds
+    for path in paths:
+        os.utime(path, (stamp, stamp))
+
+
+def _tree(base: Path) -> Path:
+    """One project with an emails folder holding two files."""
+    emails = base / "acme" / "emails"
+    emails.mkdir(parents=True)
+    (emails / "one.txt").write_text("first")
+    (emails / "two.txt").write_text("second")
+    (emails / "skip.md").write_text("not a document")
+    _age(emails, emails.parent, base)
+    return emails
+
+
+class _MetadataReader:
+    def __init__(self):
+        self.reads = 0
+
+    def __call__(self, path: Path):
+        self.reads += 1
+        return {"name": path.name.title()}
+
+
+def _names(catalog: DirectoryCatalog) -> list:
+    return sorted(path.name for path, _, _ in catalog.files("acme", "emails", ".txt"))
+
+
+def test_unchanged_directories_are_not_rescanned():
+    """Repeated listings cost stats only; a new file shows up after its folder changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        emails = _tree(base)
+        catalog = DirectoryCatalog(base, _MetadataReader())
+
+        assert _names(catalog) == ["one.txt", "two.txt"]
+        rescans = catalog.rescans
+        assert _names(catalog) == ["one.txt", "two.txt"]
+        assert catalog.rescans == rescans
+
+        (emails / "three.txt").write_text("third")
+        _age(emails, seconds=30)
+        assert _names(catalog) == ["one.txt", "three.txt", "two.txt"]
+        assert catalog.rescans == rescans + 1
+
+
+def test_invalidate_picks_up_in_place_rewrites():
+    """A rewrite keeps the folder mtime, so only invalidation refreshes its size and metadata."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        emails = _tree(base)
+        reader = _MetadataReader()
+        catalog = DirectoryCatalog(base, reader)
+        assert catalog.project("acme") == {"name": "Acme"}
+        sizes = {path.name: size for path, size, _ in catalog.files("acme", "emails")}
+        assert sizes["one.txt"] == 5
+
+        folder_mtime = emails.stat().st_mtime
+        (emails / "one.txt").write_text("first, rewritten")
+        os.utime(emails, (folder_mtime, folder_mtime))
+        sizes = {path.name: size for path, size, _ in catalog.files("acme", "emails")}
+        assert sizes["one.txt"] == 5
+
+        catalog.invalidate("acme", "emails")
+        sizes = {path.name: size for path, size, _ in catalog.files("acme", "emails")}
+        assert sizes["one.txt"] == len("first, rewritten")
+        catalog.project("acme")
+        assert reader.reads == 2
+
+
+def test_forget_and_removed_projects():
+    """Deleted project folders disappear from listings."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        _tree(base)
+        catalog = DirectoryCatalog(base, _MetadataReader())
+        assert catalog.project_ids() == ["acme"]
+
+        shutil.rmtree(base / "acme")
+        catalog.forget("acme")
+        assert catalog.project_ids() == []
+        assert catalog.project("acme") is None
+        assert catalog.files("acme", "emails") == []
+
+
+def test_saved_catalog_is_reused():
+    """After a restart, unchanged folders are validated by mtime instead of re-read."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "projects"
+        base.mkdir()
+        emails = _tree(base)
+        catalog_path = str(Path(tmp) / "catalog.json")
+        reader = _MetadataReader()
+        catalog = DirectoryCatalog(base, reader, path=catalog_path)
+        catalog.project("acme")
+        assert _names(catalog) == ["one.txt", "two.txt"]
+        catalog.flush()
+
+        restarted = DirectoryCatalog(base, reader, path=catalog_path)
+        assert restarted.project("acme") == {"name": "Acme"}
+        assert _names(restarted) == ["one.txt", "two.txt"]
+        assert restarted.rescans == 0 and reader.reads == 1
+
+        (emails / "two.txt").unlink()
+        _age(emails, seconds=30)
+        restarted.flush()
+        again = DirectoryCatalog(base, reader, path=catalog_path)
+        assert _names(again) == ["one.txt"]
+        assert again.rescans == 1
+
+
+def test_revalidate_window_skips_stats():
+    """Within revalidate_seconds, listings are answered without touching the disk."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        _tree(base)
+        catalog = DirectoryCatalog(base, _MetadataReader(), revalidate_seconds=60)
+        _names(catalog)
+        checks = catalog.stat_checks
+        _names(catalog)
+        assert catalog.stat_checks == checks
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_unchanged_directories_are_not_rescanned,
+        test_invalidate_picks_up_in_place_rewrites,
+        test_forget_and_removed_projects,
+        test_saved_catalog_is_reused,
+        test_revalidate_window_skips_stats,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} directory catalog tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Document Deduplication Tests
+
+Checks how ProjectState.add_document indexes documents by path and by
+content hash: re-ingesting a file is a no-op, an edited file replaces its
+previous version, a copy of loaded content is not added twice, and a
+renamed file re-points the loaded document instead of leaving the old
+path listed.
+
+Usage:
+    python test_document_dedup.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from models.document import ContentRef, Document, DocumentType
+from models.project_state import ProjectState
+
+
+def _document(path: Path) -> Document:
+    return Document(file_path=str(path), content=None, doc_type=DocumentType.NOTES,
+                    content_ref=ContentRef.for_file(str(path)))
+
+
+def _paths(project: ProjectState) -> list:
+    return sorted(Path(doc.file_path).name for doc in project.documents)
+
+
+def test_same_path():
+    """Re-ingesting a file is unchanged; editing it replaces the document."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        path.write_text("Orders sync hourly.")
+        project = ProjectState(project_id="dedup", project_name="Dedup")
+
+        assert project.add_document(_document(path)) == "added"
+        assert project.add_document(_document(path)) == "unchanged"
+        path.write_text("Orders sync every five minutes.")
+        assert project.add_document(_document(path)) == "updated"
+        assert len(project.documents) == 1
+        assert project.get_document(str(path)).content == "Orders sync every five minutes."
+
+
+def test_copy_is_not_added_twice():
+    """The same content under a second, existing file is not loaded again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        original = Path(tmp) / "notes.txt"
+        original.write_text("Orders sync hourly.")
+        copy = Path(tmp) / "notes-copy.txt"
+        copy.write_text("Orders sync hourly.")
+        project = ProjectState(project_id="dedup", project_name="Dedup")
+
+        assert project.add_document(_document(original)) == "added"
+        assert project.add_document(_document(copy)) == "unchanged"
+        assert _paths(project) == ["notes.txt"]
+
+
+def test_rename_and_back():
+    """A renamed file moves its document, and so does renaming it back."""
+    with tempfile.TemporaryDirectory() as tmp:
+        names = ["a.txt", "b.txt", "c.txt", "d.txt"]
+        for name in names:
+            (Path(tmp) / name).write_text(f"Contents of {name}.")
+        project = ProjectState(project_id="dedup", project_name="Dedup")
+        for name in names:
+            assert project.add_document(_document(Path(tmp) / name)) == "added"
+
+        (Path(tmp) / "a.txt").rename(Path(tmp) / "a-renamed.txt")
+        statuses = [project.add_document(_document(path)) for path in sorted(Path(tmp).iterdir())]
+        assert sorted(statuses) == ["unchanged"] * 3 + ["updated"]
+        assert _paths(project) == ["a-renamed.txt", "b.txt", "c.txt", "d.txt"]
+
+        (Path(tmp) / "a-renamed.txt").rename(Path(tmp) / "a.txt")
+        statuses = [project.add_document(_document(path)) for path in sorted(Path(tmp).iterdir())]
+        assert sorted(statuses) == ["unchanged"] * 3 + ["updated"]
+        assert _paths(project) == names
+
+        renamed = project.get_document(str(Path(tmp) / "a.txt"))
+        assert renamed.content_ref.path == str(Path(tmp) / "a.txt")
+        assert renamed.content == "Contents of a.txt."
+        assert project.get_document(str(Path(tmp) / "a-renamed.txt")) is None
+
+
+def test_remove_document():
+    """Removing a document frees its path and content for re-adding."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        path.write_text("Orders sync hourly.")
+        project = ProjectState(project_id="dedup", project_name="Dedup")
+
+        project.add_document(_document(path))
+        assert project.remove_document(str(path))
+        assert not project.remove_document(str(path))
+        assert project.add_document(_document(path)) == "added"
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_same_path,
+        test_copy_is_not_added_twice,
+        test_rename_and_back,
+        test_remove_document,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} deduplication tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Folder Watch Tests
+
+Checks incremental ingest of watched folders: the polling watcher reports
+a rename as a deletion and a creation, _ingest_file_changes applies that
+batch so exactly one document remains (under the new name, whichever way
+the names sort), a file that cannot be parsed is reported without losing
+the rest of its batch, and changes from the watcher's thread wait for
+the project lock held by a tool call.
+
+Usage:
+    python test_folder_watch.py
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core.folder_watcher import FolderWatcher
+from core.state_manager import ProjectStateManager
+from test_analysis_golden import load_server
+
+
+PROJECT_ID = "watch-test"
+
+
+def _project_with(*paths: Path):
+    """Load a fresh in-memory project holding the given files."""
+    main = load_server()
+    state_manager = ProjectStateManager()
+    state_manager.clear_project(PROJECT_ID)
+    project = state_manager.create_project(PROJECT_ID, "Watch Test")
+    docs, errors = main._parse_document_files(list(paths))
+    assert not errors
+    for doc in docs:
+        project.add_document(doc)
+    return main, project
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_rename_keeps_one_document():
+    """A rename batch leaves its document under the new name, in either sort order."""
+    for old_name, new_name in (("z.txt", "a.txt"), ("a.txt", "z.txt")):
+        with tempfile.TemporaryDirectory() as tmp:
+            old, new = Path(tmp) / old_name, Path(tmp) / new_name
+            old.write_text("Orders sync to NetSuite hourly.")
+            other = Path(tmp) / "m.txt"
+            other.write_text("Refunds are issued as credit memos.")
+            main, project = _project_with(old, other)
+
+            old.rename(new)
+            main._ingest_file_changes(PROJECT_ID, {new: "added", old: "deleted"})
+            paths = sorted(doc.file_path for doc in project.documents)
+            assert paths == sorted([str(new), str(other)]), (old_name, paths)
+            assert project.get_document(str(new)).content == "Orders sync to NetSuite hourly."
+    ProjectStateManager().clear_project(PROJECT_ID)
+
+
+def test_unreadable_file_keeps_batch():
+    """A bad file is an error entry; the batch's other changes are saved and indexed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        emails = Path(tmp) / "emails"
+        emails.mkdir()
+        kept, gone, raced = emails / "kept.txt", emails / "gone.txt", emails / "raced.txt"
+        for path in (kept, gone, raced):
+            path.write_text(f"From: ops@acme.com\nSubject: {path.stem}\n\nOrders sync hourly.\n")
+        main, project = _project_with(kept, gone, raced)
+
+        bad, new = emails / "bad.txt", emails / "new.txt"
+        bad.write_bytes(b"\xff\xfeFrom: ops@acme.com\n")
+        new.write_text("From: ops@acme.com\nSubject: refunds\n\nRefunds are credit memos.\n")
+        gone.unlink()
+        parse_file = main._parse_document_file
+
+        def racing(path, **kwargs):
+            # Deleted between the folder check and the parse
+            if path == raced:
+                raise FileNotFoundError(str(path))
+            return parse_file(path, **kwargs)
+
+        main._parse_document_file = racing
+        try:
+            result = main._ingest_file_changes(
+                PROJECT_ID, {bad: "added", new: "added", gone: "deleted", raced: "modified"})
+        finally:
+            main._parse_document_file = parse_file
+
+        assert [error["file"] for error in result["errors"]] == [str(bad)]
+        assert "UnicodeDecodeError" in result["errors"][0]["error"]
+        assert result["updated"] == ["new.txt"] and result["removed"] == 2
+        assert sorted(doc.file_path for doc in project.documents) == sorted([str(kept), str(new)])
+        saved = ProjectStateManager().get_project(PROJECT_ID)
+        assert sorted(doc.file_path for doc in saved.documents) == sorted([str(kept), str(new)])
+        hits, _ = main.search_indexes.get(PROJECT_ID).search("refunds credit memos")
+        assert [hit.document.file_path for hit in hits] == [str(new)]
+    ProjectStateManager().clear_project(PROJECT_ID)
+
+
+def test_polling_watcher_reports_rename():
+    """The polling backend batches a rename as a deletion and a creation."""
+    with tempfile.TemporaryDirectory() as tmp:
+        old = Path(tmp) / "z.txt"
+        old.write_text("Orders sync hourly.")
+        batches = []
+        watcher = FolderWatcher(
+            lambda: {PROJECT_ID: [Path(tmp)]},
+            lambda project_id, changes: batches.append((project_id, changes)),
+            debounce_ms=50,
+            poll_interval=0.05,
+            force_polling=True
+        )
+        watcher.start()
+        try:
+            time.sleep(0.3)
+            new = Path(tmp) / "a.txt"
+            old.rename(new)
+            assert _wait_for(lambda: batches)
+        finally:
+            watcher.stop()
+        project_id, changes = batches[0]
+        assert project_id == PROJECT_ID
+        assert changes == {old: "deleted", new: "added"}, changes
+
+
+def test_changes_wait_for_project_lock():
+    """Watcher changes are applied only once a tool call releases the project."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        path.write_text("Orders sync hourly.")
+        main, project = _project_with()
+
+        lock = ProjectStateManager.project_lock(PROJECT_ID)
+        results = []
+        with lock:
+            worker = threading.Thread(
+                target=lambda: results.append(main._ingest_file_changes(PROJECT_ID, {path: "added"}))
+            )
+            worker.start()
+            time.sleep(0.2)
+            assert worker.is_alive() and not project.documents
+        worker.join(5)
+        assert results and results[0]["updated"] == ["notes.txt"]
+        assert len(project.documents) == 1
+    ProjectStateManager().clear_project(PROJECT_ID)
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_rename_keeps_one_document,
+        test_unreadable_file_keeps_batch,
+        test_polling_watcher_reports_rename,
+        test_changes_wait_for_project_lock,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} folder watch tests passed")
+
+
+if __name__ == "__main__":
+    main()
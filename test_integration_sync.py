@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Incremental Integration Sync Tests
+
+Checks the pieces that let an integration sync skip unchanged files: the
+sync manifest survives a restart, the blob cache serves bodies by digest
+(and stays within its size bound), integration documents reload from the
+cache before their source, and the ingest result keeps the manifest's
+unchanged count apart from the in-memory one.
+
+Usage:
+    python test_integration_sync.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core.state_manager import ProjectStateManager
+from models.document import (
+    ContentRef, Document, DocumentType, register_blob_reader, register_external_loader
+)
+from storage.blob_cache import BlobCache
+from storage.integration_provider import IntegrationSyncResult
+from storage.sync_manifest import SyncManifest
+from test_analysis_golden import load_server
+
+
+PROJECT_ID = "integration-sync-test"
+
+
+def test_manifest_round_trip():
+    """Entries are saved atomically and reloaded; a corrupt file starts empty."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "manifests" / "project.json"
+        manifest = SyncManifest(str(path))
+        manifest.set("file_1", {"version": ["2024-01-01", 10], "content_hash": "abc"})
+        manifest.set("file_2", {"version": None, "content_hash": "def"})
+        manifest.save()
+
+        reloaded = SyncManifest(str(path))
+        assert reloaded.external_ids() == ["file_1", "file_2"]
+        assert reloaded.get("file_1")["content_hash"] == "abc"
+        assert reloaded.remove("file_2")["content_hash"] == "def"
+        assert reloaded.get("file_2") is None
+
+        path.write_text("{not json")
+        assert SyncManifest(str(path)).entries == {}
+
+
+def test_blob_cache_reuse_and_eviction():
+    """Identical bodies are stored once; the least recently used go first."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = BlobCache(tmp, max_bytes=250)
+        first = cache.put(b"a" * 100)
+        assert cache.put(b"a" * 100) == first
+        assert cache.stats()["blobs"] == 1
+
+        second = cache.put(b"b" * 100)
+        assert cache.get(first) == b"a" * 100
+        third = cache.put(b"c" * 100)
+        assert cache.contains(first) and cache.contains(third)
+        assert not cache.contains(second)
+        assert cache.get(second) is None
+        assert cache.stats()["evictions"] == 1
+
+        reopened = BlobCache(tmp, max_bytes=250)
+        assert reopened.stats()["blobs"] == 2
+        assert reopened.get(third) == b"c" * 100
+
+
+def test_body_reloads_from_blob_cache():
+    """An unloaded integration body is read from the cache, not downloaded again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = BlobCache(tmp)
+        digest = cache.put(b"Inventory lives in NetSuite.")
+        downloads = []
+        register_external_loader("int_test", lambda file_id: downloads.append(file_id) or "downloaded")
+        register_blob_reader(cache.get)
+        try:
+            ref = ContentRef(external_id="file_1", source="int_test", sha256=digest)
+            doc = Document(file_path="notes.txt", content=None, doc_type=DocumentType.NOTES,
+                           source="integration", content_ref=ref)
+            assert doc.content == "Inventory lives in NetSuite."
+            assert not downloads
+
+            missing = ContentRef(external_id="file_2", source="int_test", sha256="0" * 64)
+            assert missing.read() == "downloaded"
+            assert downloads == ["file_2"]
+        finally:
+            register_blob_reader(None)
+
+
+class _IntegrationStorage:
+    """Stands in for IntegrationStorageProvider with a fixed sync result."""
+
+    def __init__(self):
+        self.result = IntegrationSyncResult()
+
+    def project_exists(self, project_id):
+        return True
+
+    def get_project(self, project_id):
+        return {"name": "Integration Sync Test"}
+
+    def sync_documents_from_integration(self, project_id):
+        return self.result
+
+
+def _integration_doc(file_id: str, content: str) -> Document:
+    return Document(file_path=f"{file_id}.txt", content=content, doc_type=DocumentType.NOTES,
+                    external_id=file_id, integration_id="int_test", source="integration")
+
+
+def test_ingest_counts_keep_manifest_unchanged_apart():
+    """Files unchanged in the manifest do not overwrite the in-memory unchanged count."""
+    main = load_server()
+    fake = _IntegrationStorage()
+    saved = main.storage
+    main.storage = fake
+    ProjectStateManager().clear_project(PROJECT_ID)
+    try:
+        # After a restart, files the manifest knows are new to memory
+        fake.result = IntegrationSyncResult(
+            documents=[_integration_doc("file_1", "Orders sync hourly."),
+                       _integration_doc("file_2", "Refunds are credit memos.")],
+            downloaded=["file_1"],
+            unchanged=["file_2"],
+        )
+        first = main._ingest_documents(PROJECT_ID, source="integration")
+        assert (first["added"], first["updated"], first["unchanged"]) == (2, 0, 0), first
+        assert first["manifest_unchanged"] == 1
+
+        fake.result = IntegrationSyncResult(
+            documents=[_integration_doc("file_1", "Orders sync hourly."),
+                       _integration_doc("file_2", "Refunds are credit memos.")],
+            unchanged=["file_1", "file_2"],
+        )
+        second = main._ingest_documents(PROJECT_ID, source="integration")
+        assert (second["added"], second["unchanged"], second["manifest_unchanged"]) == (0, 2, 2), second
+        assert second["total_documents"] == 2
+    finally:
+        main.storage = saved
+        ProjectStateManager().clear_project(PROJECT_ID)
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_manifest_round_trip,
+        test_blob_cache_reuse_and_eviction,
+        test_body_reloads_from_blob_cache,
+        test_ingest_counts_keep_manifest_unchanged_apart,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} integration sync tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Lazy Document Body Tests
+
+Checks that a local document body loaded through its ContentRef is the
+body that was ingested: the size and digest recorded at ingest are
+verified on read, a changed or missing file falls back to the blob cache,
+integration bodies are fingerprinted without a blob read, and analysis
+skips a document whose body is gone rather than reading text its
+fingerprint does not describe.
+
+Usage:
+    python test_lazy_content.py
+"""
+
+import hashlib
+import sys
+import tempfile
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from models.document import (
+    ContentRef, Document, DocumentType, StaleContentError, register_blob_reader
+)
+from models.project_state import ProjectState
+from core.analyzer import DiscoveryAnalyzer
+from core.mapped_text import map_document
+
+
+BODY = "We use NetSuite for inventory.\r\nShopify handles orders.\n"
+
+
+def _document(path: Path) -> Document:
+    return Document(file_path=str(path), content=None, doc_type=DocumentType.NOTES,
+                    content_ref=ContentRef.for_file(str(path)))
+
+
+def test_ref_records_ingested_body():
+    """The digest and size are recorded at ingest and survive serialization."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        path.write_bytes(BODY.encode("utf-8"))
+        doc = _document(path)
+
+        expected = hashlib.sha256(BODY.replace("\r\n", "\n").encode("utf-8")).hexdigest()
+        assert doc.content_ref.sha256 == expected
+        assert doc.content_ref.size == len(BODY.encode("utf-8"))
+        # Hashed at ingest, so the fingerprint does not load the body
+        assert doc.fingerprint == expected
+        assert not doc.content_loaded
+        assert doc.content == BODY.replace("\r\n", "\n")
+
+        restored = ContentRef.from_dict(doc.content_ref.to_dict())
+        assert restored == doc.content_ref
+        assert restored.is_current()
+
+
+def test_changed_file_is_not_read():
+    """A file edited in place after ingest is stale, even at the same size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        path.write_text("Inventory lives in NetSuite.")
+        doc = _document(path)
+        path.write_text("Inventory lives in Odoo now.")
+
+        assert not doc.content_ref.is_current()
+        try:
+            doc.content
+        except StaleContentError:
+            pass
+        else:
+            raise AssertionError("changed file was read")
+
+        path.unlink()
+        assert not doc.content_ref.is_current()
+        try:
+            doc.content_ref.read()
+        except StaleContentError:
+            pass
+        else:
+            raise AssertionError("missing file was read")
+
+
+def test_missing_file_falls_back_to_blob_cache():
+    """The blob cache serves a body whose file is gone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        path.write_text("Shopify handles orders.")
+        doc = _document(path)
+        blobs = {doc.content_ref.sha256: b"Shopify handles orders."}
+        path.unlink()
+
+        register_blob_reader(blobs.get)
+        try:
+            assert doc.content == "Shopify handles orders."
+        finally:
+            register_blob_reader(None)
+
+
+def test_integration_ref_fingerprint_is_not_loaded():
+    """Integration bodies are fingerprinted by their recorded digest, without a blob read."""
+    body = b"Refunds are issued as credit memos."
+    sha = hashlib.sha256(body).hexdigest()
+    reads = []
+    register_blob_reader(lambda digest: reads.append(digest) or body)
+    try:
+        doc = Document(file_path="refunds.docx", content=None, doc_type=DocumentType.SOW,
+                       content_ref=ContentRef(external_id="file-1", source="gdrive", sha256=sha),
+                       source="integration")
+        project = ProjectState(project_id="lazy", project_name="Lazy")
+        assert project.add_document(doc) == "added"
+        assert doc.fingerprint == sha
+        assert not reads and not doc.content_loaded
+        assert doc.content == body.decode("utf-8") and reads == [sha]
+    finally:
+        register_blob_reader(None)
+
+
+def test_analysis_skips_stale_documents():
+    """A stale document is left out of analysis instead of failing it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        kept = Path(tmp) / "kept.txt"
+        kept.write_text("We currently use QuickBooks for accounting.")
+        changed = Path(tmp) / "changed.txt"
+        changed.write_text("Inventory is tracked in NetSuite.")
+        docs = [_document(kept), _document(changed)]
+        changed.write_text("Inventory is tracked in Odoo today.")
+
+        result = DiscoveryAnalyzer().analyze(docs)
+        assert "QuickBooks" in result.systems_identified
+        assert "NetSuite" not in result.systems_identified
+
+
+def test_changed_file_is_not_mapped():
+    """Large changed files are not scanned through a memory map either."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large.txt"
+        path.write_text("Orders sync hourly. " * 100)
+        doc = _document(path)
+        mapped = map_document(doc, min_bytes=1)
+        assert mapped is not None
+        mapped.close()
+
+        path.write_text("Orders sync daily!! " * 100)
+        assert map_document(doc, min_bytes=1) is None
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_ref_records_ingested_body,
+        test_changed_file_is_not_read,
+        test_missing_file_falls_back_to_blob_cache,
+        test_integration_ref_fingerprint_is_not_loaded,
+        test_analysis_skips_stale_documents,
+        test_changed_file_is_not_mapped,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} lazy content tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Mapped Scan Tests
+
+Checks that scanning large local documents through a memory map
+(DiscoveryAnalyzer.mapped_scan_min_bytes) gives exactly the analysis of
+scanning their loaded text, with chunks shrunk so that keywords, CRLF
+pairs, multi-byte characters and sentences straddle chunk boundaries,
+and that mapped scans leave the bodies unloaded.
+
+Usage:
+    python test_mapped_scan.py
+"""
+
+import dataclasses
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core import mapped_text
+from core.analyzer import DiscoveryAnalyzer
+from core.mapped_text import MappedText, SentenceCursor
+from core.sentence_index import prepared_texts
+from models.document import ContentRef, Document, infer_document_type
+from benchmark_suite import write_corpus
+
+
+EDGE_CASES = {
+    "crlf.txt": "We use NetSuite for inventory.\r\nShopify is the source of truth for orders.\r\n" * 20,
+    "multibyte.txt": "Le café utilise QuickBooks — réel-time sync is TBD. Naïve refunds happen manually. " * 30,
+    "no-periods.txt": "we decided to use netsuite as the system of record for inventory going forward " * 40,
+    "resolution.txt": (
+        "Inventory levels are tracked in Shopify. The warehouse keeps counts in NetSuite. "
+        "After review, we agreed NetSuite will be the system of record for inventory. " * 10
+    ),
+}
+
+
+def _documents(folder: Path) -> list:
+    write_corpus(folder, "mapped", count=6, size=6_000, no_periods=False, seed=7)
+    write_corpus(folder, "mapped-nopunct", count=2, size=4_000, no_periods=True, seed=7)
+    for name, text in EDGE_CASES.items():
+        (folder / name).write_bytes(text.encode("utf-8"))
+    paths = sorted(folder.rglob("*.txt"))
+    return [
+        Document(file_path=str(path), content=None, doc_type=infer_document_type(str(path)),
+                 content_ref=ContentRef.for_file(str(path)))
+        for path in paths
+    ]
+
+
+def _analyze(templates: list, min_bytes: int):
+    """Analyze fresh copies of documents with cold caches."""
+    DiscoveryAnalyzer._cache.clear()
+    prepared_texts.clear()
+    saved = DiscoveryAnalyzer.mapped_scan_min_bytes
+    DiscoveryAnalyzer.mapped_scan_min_bytes = min_bytes
+    try:
+        documents = [Document(file_path=doc.file_path, content=None, doc_type=doc.doc_type,
+                              content_ref=doc.content_ref) for doc in templates]
+        analyzer = DiscoveryAnalyzer()
+        result = analyzer.analyze(documents, ["Real-time means within 5 seconds."])
+        findings = [dataclasses.asdict(analyzer._document_findings(doc)) for doc in documents]
+        return json.dumps(result.to_dict(), sort_keys=True), findings, documents
+    finally:
+        DiscoveryAnalyzer.mapped_scan_min_bytes = saved
+
+
+def test_mapped_matches_loaded_text():
+    """Mapped and in-memory scans agree on findings and results, at several chunk sizes."""
+    saved = (mapped_text.CHUNK_BYTES, mapped_text.SEARCH_MARGIN_BYTES, mapped_text.MAX_WINDOW_BYTES)
+    with tempfile.TemporaryDirectory() as tmp:
+        templates = _documents(Path(tmp))
+        try:
+            expected, expected_findings, _ = _analyze(templates, min_bytes=0)
+            for chunk in (4096, 257, 64):
+                mapped_text.CHUNK_BYTES = chunk
+                mapped_text.SEARCH_MARGIN_BYTES = max(16, chunk // 4)
+                mapped_text.MAX_WINDOW_BYTES = 16 * chunk
+                result, findings, documents = _analyze(templates, min_bytes=1)
+                assert not any(doc.content_loaded for doc in documents), chunk
+                for path_findings, path_expected, doc in zip(findings, expected_findings, documents):
+                    assert path_findings == path_expected, (chunk, doc.file_path)
+                assert result == expected, chunk
+        finally:
+            mapped_text.CHUNK_BYTES, mapped_text.SEARCH_MARGIN_BYTES, mapped_text.MAX_WINDOW_BYTES = saved
+            DiscoveryAnalyzer._cache.clear()
+
+
+def test_mapped_text_decoding():
+    """Windows decode like the loaded body across CRLF pairs and multi-byte characters."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "body.txt"
+        body = "Café ok.\r\nNext line é.\r\nLast"
+        path.write_bytes(body.encode("utf-8"))
+        normalized = body.replace("\r\n", "\n")
+        prefix = "[DOCUMENT: body.txt]\n"
+        with MappedText(str(path), prefix=prefix) as mapped:
+            assert len(mapped) == len((prefix + body).encode("utf-8"))
+            assert mapped.text(0, len(mapped)) == prefix + normalized
+            start = mapped.body_start
+            # Splits inside "é" move to its start; a CRLF split stays one newline
+            for cut in range(start, len(mapped)):
+                text, index = mapped.window(cut, len(mapped), len(mapped), floor=start)
+                assert text == normalized, cut
+            pos = mapped.find("Next".encode("utf-8"))
+            text, index = mapped.window(pos, 12, 8)
+            assert text[index:].startswith("Next lin")
+            assert mapped.advance(start, normalized[:10]) == start + len(body[:11].encode("utf-8"))
+
+            cursor = SentenceCursor(mapped, floor=start)
+            first = cursor.locate(mapped.find(b"ok"))
+            assert mapped.text(*first) == "Café ok"
+            assert cursor.is_terminated()
+            last = cursor.locate(mapped.find(b"Last"))
+            assert mapped.text(*last).endswith("Last") and not cursor.is_terminated()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_mapped_matches_loaded_text,
+        test_mapped_text_decoding,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} mapped scan tests passed")
+
+
+if __name__ == "__main__":
+    main()
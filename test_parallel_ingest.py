@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Parallel Ingest Tests
+
+Checks _parse_document_files, which parses local files on a bounded
+thread pool: results keep the order of the input, a file that cannot be
+read is reported without failing the others, every document is hashed by
+its worker, and the pool gives the same documents as parsing serially.
+
+Usage:
+    python test_parallel_ingest.py
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from config import config
+from test_analysis_golden import load_server
+
+
+def _corpus(folder: Path) -> list:
+    """Emails, transcripts and notes, plus one file that is not UTF-8."""
+    paths = []
+    for index in range(12):
+        emails = folder / "emails"
+        emails.mkdir(exist_ok=True)
+        path = emails / f"email_{index:02d}.txt"
+        path.write_text(f"From: Ops <ops{index}@acme.com>\nSubject: Sync {index}\n\nOrders sync hourly.\n")
+        paths.append(path)
+    transcripts = folder / "transcripts"
+    transcripts.mkdir()
+    for index in range(6):
+        path = transcripts / f"call_{index}.txt"
+        path.write_text(f"Dana Lee: We use NetSuite.\nSam: Shopify handles order {index}.\n")
+        paths.append(path)
+    bad = folder / "client-docs" / "broken_notes.txt"
+    bad.parent.mkdir()
+    bad.write_bytes(b"caf\xe9 au lait")
+    paths.insert(7, bad)
+    return paths
+
+
+def _parse(main, paths: list, workers: int):
+    saved = config.INGEST_WORKERS
+    type(config).INGEST_WORKERS = workers
+    try:
+        return main._parse_document_files(paths)
+    finally:
+        type(config).INGEST_WORKERS = saved
+
+
+def test_order_and_errors():
+    """Documents line up with their paths; the unreadable file is an error entry."""
+    main = load_server()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _corpus(Path(tmp))
+        docs, errors = _parse(main, paths, workers=4)
+
+        assert len(docs) == len(paths)
+        assert docs[7] is None
+        assert [error["file"] for error in errors] == [str(paths[7])]
+        assert "UnicodeDecodeError" in errors[0]["error"]
+        for path, doc in zip(paths, docs):
+            if doc is not None:
+                assert doc.file_path == str(path)
+                # Hashed by the worker, without leaving the body loaded
+                assert doc._fingerprint is not None and not doc.content_loaded
+        assert docs[0].participants == ["Ops <ops0@acme.com>"]
+        assert docs[-1].participants == ["Dana Lee", "Sam"]
+
+
+def test_pool_matches_serial():
+    """The pool parses on worker threads and gives the same documents as one thread."""
+    main = load_server()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _corpus(Path(tmp))
+        threads = set()
+        parse_file = main._parse_document_file
+
+        def recording(*args, **kwargs):
+            threads.add(threading.current_thread().name)
+            return parse_file(*args, **kwargs)
+
+        main._parse_document_file = recording
+        try:
+            serial, _ = _parse(main, paths, workers=1)
+            assert threads == {threading.current_thread().name}
+            threads.clear()
+            pooled, _ = _parse(main, paths, workers=4)
+            assert threads and all(name.startswith("ingest") for name in threads)
+        finally:
+            main._parse_document_file = parse_file
+
+        def summary(doc):
+            if doc is None:
+                return None
+            return (doc.file_path, doc.doc_type, doc.participants, doc.subject, doc.fingerprint)
+
+        assert [summary(doc) for doc in pooled] == [summary(doc) for doc in serial]
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_order_and_errors,
+        test_pool_matches_serial,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} parallel ingest tests passed")
+
+
+if __name__ == "__main__":
+    main()
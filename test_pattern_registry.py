@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pattern Registry Tests
+
+Checks how project custom gap patterns are compiled: projects that reuse
+a description with different regexes each keep their own pattern,
+projects with the same regex share one compiled pattern, and the
+project-supplied patterns are bounded by an LRU.
+
+Usage:
+    python test_pattern_registry.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core.analyzer import DiscoveryAnalyzer
+from core.pattern_registry import PatternRegistry
+
+
+def _checks(pattern: str) -> list:
+    return DiscoveryAnalyzer.validate_custom_gap_patterns([
+        {"description": "Gift cards not discussed", "pattern": pattern}
+    ])
+
+
+def test_same_description_does_not_collide():
+    """Two projects with one description keep separate, stable compiled patterns."""
+    first = _checks(r"gift\s+cards?")[0]["pattern"]
+    second = _checks(r"store\s+credit")[0]["pattern"]
+    assert first is not second
+    # Validating again (a project reloading) recompiles neither
+    assert _checks(r"gift\s+cards?")[0]["pattern"] is first
+    assert _checks(r"store\s+credit")[0]["pattern"] is second
+    assert first.search("We sell Gift Cards online") and not second.search("We sell Gift Cards online")
+
+
+def test_invalid_pattern_names_entry():
+    """A pattern that does not compile is reported against its entry."""
+    try:
+        _checks(r"gift(")
+    except ValueError as e:
+        assert str(e).startswith("custom_gap_patterns[0]:"), e
+    else:
+        raise AssertionError("invalid pattern accepted")
+
+
+def test_custom_patterns_are_bounded():
+    """Least recently used project patterns are evicted; built-in ones are kept."""
+    registry = PatternRegistry(max_custom=2)
+    builtin = registry.register("client_name", r"client")
+    a = registry.register_custom("alpha", re.IGNORECASE)
+    b = registry.register_custom("beta", re.IGNORECASE)
+    assert registry.register_custom("alpha", re.IGNORECASE) is a
+    registry.register_custom("gamma", re.IGNORECASE)
+
+    assert registry.register_custom("alpha", re.IGNORECASE) is a
+    assert registry.register_custom("beta", re.IGNORECASE) is not b
+    assert registry.register_custom("alpha", 0) is not a
+    assert registry.register("client_name", r"client") is builtin
+    names = {stat["name"] for stat in registry.stats()}
+    assert len(names) == 3 and "client_name" in names
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_same_description_does_not_collide,
+        test_invalid_pattern_names_entry,
+        test_custom_patterns_are_bounded,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} pattern registry tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Project State Store Tests
+
+Checks the SQLite ProjectStateStore and the bounded ProjectStateManager in
+front of it: a project round-trips with its context, config and documents
+(lazy bodies as references), saving rewrites only changed document rows,
+and projects evicted from memory are reloaded from the store on access.
+
+Usage:
+    python test_state_store.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add MCP src to path
+sys.path.insert(0, str(Path(__file__).parent / "mcp" / "src"))
+
+from core.state_manager import ProjectStateManager
+from core.state_store import ProjectStateStore
+from models.document import ContentRef, Document, DocumentType
+from models.project_state import ProjectState
+
+
+def _project(project_id: str, folder: Path) -> ProjectState:
+    path = folder / f"{project_id}.txt"
+    path.write_text("Inventory lives in NetSuite. Orders come from Shopify.")
+    project = ProjectState(project_id=project_id, project_name=project_id.title())
+    project.add_document(Document(file_path=str(path), content=None, doc_type=DocumentType.EMAIL,
+                                  content_ref=ContentRef.for_file(str(path)), participants=["ops@example.com"]))
+    project.add_document(Document(file_path="note.txt", content="Refunds are credit memos.",
+                                  doc_type=DocumentType.NOTES))
+    project.add_context("Failed syncs are retried three times.")
+    project.config.custom_gap_patterns = [{"id": "tax", "keywords": ["tax"], "question": "How is tax handled?"}]
+    return project
+
+
+def test_round_trip():
+    """A saved project loads with the same state; lazy bodies stay lazy."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProjectStateStore(str(Path(tmp) / "state.db"))
+        project = _project("alpha", Path(tmp))
+        store.save(project)
+        store.close()
+
+        store = ProjectStateStore(str(Path(tmp) / "state.db"))
+        loaded = store.load("alpha")
+        assert store.list_project_ids() == ["alpha"]
+        assert loaded.additional_context == project.additional_context
+        assert loaded.config.custom_gap_patterns == project.config.custom_gap_patterns
+        assert [doc.file_path for doc in loaded.documents] == [doc.file_path for doc in project.documents]
+
+        lazy, note = loaded.documents
+        assert not lazy.content_loaded and lazy.content_ref == project.documents[0].content_ref
+        assert lazy.participants == ["ops@example.com"]
+        assert lazy.content == "Inventory lives in NetSuite. Orders come from Shopify."
+        assert note.content == "Refunds are credit memos."
+
+        assert store.delete("alpha") and not store.delete("alpha")
+        assert store.load("alpha") is None
+        store.close()
+
+
+def test_save_rewrites_changed_documents_only():
+    """Unchanged document rows are left alone on save."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProjectStateStore(str(Path(tmp) / "state.db"))
+        project = _project("alpha", Path(tmp))
+        store.save(project)
+
+        before = store._conn.total_changes
+        store.save(project)
+        # Only the project row
+        assert store._conn.total_changes - before == 1
+
+        project.documents[1].content = "Refunds are issued as store credit."
+        before = store._conn.total_changes
+        store.save(project)
+        assert store._conn.total_changes - before == 2
+        assert store.load("alpha").documents[1].content == "Refunds are issued as store credit."
+        store.close()
+
+
+def test_lru_reloads_evicted_projects():
+    """Only max_projects stay in memory; the rest reload from the store."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProjectStateStore(str(Path(tmp) / "state.db"))
+        manager = ProjectStateManager()
+        ProjectStateManager.configure(store=store, max_projects=2)
+        ids = ["lru-a", "lru-b", "lru-c"]
+        try:
+            for project_id in ids:
+                manager.update_project(_project(project_id, Path(tmp)))
+            assert "lru-a" not in ProjectStateManager._projects
+            assert set(ids) <= set(manager.list_projects())
+
+            loads = manager.stats()["loads"]
+            reloaded = manager.get_project("lru-a")
+            assert manager.stats()["loads"] == loads + 1
+            assert reloaded.additional_context == ["Failed syncs are retried three times."]
+            assert reloaded.documents[1].content == "Refunds are credit memos."
+            # Reloading made it most recent, so "lru-b" went instead
+            assert "lru-b" not in ProjectStateManager._projects
+        finally:
+            for project_id in ids:
+                manager.clear_project(project_id)
+            ProjectStateManager.configure(store=None, max_projects=0)
+            store.close()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_round_trip,
+        test_save_rewrites_changed_documents_only,
+        test_lru_reloads_evicted_projects,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n{len(tests)} state store tests passed")
+
+
+if __name__ == "__main__":
+    main()